@@ -1,12 +1,33 @@
 """SQLite-based cache manager for incremental builds."""
 
+import os
+import queue
 import sqlite3
+import threading
+import time
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from datetime import datetime
 from pathlib import Path
 from typing import Any
 
 from ipodrb.models.plan import TrackJob, TrackResult
 
+# Stay well below SQLite's default SQLITE_MAX_VARIABLE_NUMBER (999)
+MAX_SQL_VARIABLES = 900
+
+# Threads used to check output existence when pruning
+PRUNE_STAT_THREADS = 32
+
+# Background writer batching: rows per transaction, max seconds between commits
+WRITE_BATCH_SIZE = 128
+WRITE_INTERVAL = 1.0
+
+# Writer queue control markers
+_FLUSH = object()
+_STOP = object()
+
 
 class CacheManager:
     """
@@ -21,6 +42,11 @@ class CacheManager:
     - Source file changed (mtime/size)
     - Settings changed
     - Output file missing or unreadable
+
+    All rows are loaded into an in-memory index on open, so lookups never
+    touch SQLite. Stores update the index immediately and are persisted
+    by a background writer thread in batched transactions; call flush()
+    or close() to make sure pending writes have reached the database.
     """
 
     SCHEMA = """
@@ -42,6 +68,32 @@ class CacheManager:
     CREATE INDEX IF NOT EXISTS idx_output_path ON cache(output_path);
     """
 
+    # All columns, in the order rows are held in the index
+    COLUMNS = """
+        source_path, output_path, source_mtime, source_size, settings_hash,
+        output_codec, output_sample_rate, output_bit_depth,
+        output_size_bytes, duration_seconds, built_at
+    """
+
+    # Reused for every write so sqlite3's statement cache always hits
+    STORE_SQL = f"""
+    INSERT OR REPLACE INTO cache ({COLUMNS})
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    """
+
+    # Database-wide settings (persisted in the file once set)
+    DB_PRAGMAS = """
+    PRAGMA journal_mode=WAL;
+    PRAGMA mmap_size=268435456;
+    """
+
+    # Per-connection settings (must be applied on every open)
+    CONN_PRAGMAS = """
+    PRAGMA synchronous=NORMAL;
+    PRAGMA temp_store=MEMORY;
+    PRAGMA cache_size=-65536;
+    """
+
     def __init__(self, db_path: Path):
         """
         Initialize cache manager.
@@ -51,17 +103,133 @@ class CacheManager:
         """
         self.db_path = Path(db_path)
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn: sqlite3.Connection | None = None
         self._init_db()
 
+        # In-memory index: source_path -> full row tuple
+        with self._get_conn() as conn:
+            cursor = conn.execute(f"SELECT {self.COLUMNS} FROM cache")
+            self._index: dict[str, tuple] = {row[0]: row for row in cursor}
+
+        self._write_queue: queue.Queue = queue.Queue()
+        self._writer: threading.Thread | None = None
+        self._write_error: Exception | None = None
+
     def _init_db(self) -> None:
-        """Initialize database schema."""
-        with sqlite3.connect(self.db_path) as conn:
-            conn.executescript(self.SCHEMA)
-            conn.commit()
+        """
+        Open the shared connection and initialize database schema.
+
+        Also used to reopen the connection lazily after close().
 
-    def _get_conn(self) -> sqlite3.Connection:
-        """Get database connection."""
-        return sqlite3.connect(self.db_path)
+        WAL mode lets lookups from the main process proceed while a
+        store() is being committed, and synchronous=NORMAL is safe
+        under WAL (at worst the last transaction is lost on power loss,
+        which only costs a re-encode).
+        """
+        self._conn = sqlite3.connect(
+            self.db_path,
+            check_same_thread=False,
+            isolation_level=None,  # Autocommit; transactions are explicit
+            cached_statements=256,
+        )
+        self._conn.executescript(self.DB_PRAGMAS)
+        self._conn.executescript(self.CONN_PRAGMAS)
+        self._conn.executescript(self.SCHEMA)
+
+    @contextmanager
+    def _get_conn(self) -> Iterator[sqlite3.Connection]:
+        """Yield the shared database connection under the cache lock."""
+        with self._lock:
+            if self._conn is None:
+                self._init_db()
+            yield self._conn
+
+    def close(self) -> None:
+        """Flush pending writes and close the underlying database connection."""
+        if self._writer is not None:
+            self._write_queue.put(_STOP)
+            self._writer.join()
+            self._writer = None
+
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+        self._raise_write_error()
+
+    def flush(self) -> None:
+        """Block until all pending stores have been written to the database."""
+        if self._writer is not None:
+            self._write_queue.put(_FLUSH)
+            self._write_queue.join()
+        self._raise_write_error()
+
+    def _raise_write_error(self) -> None:
+        """Re-raise an error hit by the background writer, if any."""
+        if self._write_error is not None:
+            error, self._write_error = self._write_error, None
+            raise error
+
+    def _ensure_writer(self) -> None:
+        """Start the background writer thread if it is not running."""
+        if self._writer is None:
+            self._writer = threading.Thread(
+                target=self._writer_loop,
+                name="ipodrb-cache-writer",
+                daemon=True,
+            )
+            self._writer.start()
+
+    def _writer_loop(self) -> None:
+        """Persist queued rows in batches until stopped."""
+        stop = False
+        while not stop:
+            batch = []
+            taken = 0
+            deadline = None
+
+            # Collect up to WRITE_BATCH_SIZE rows, or whatever arrives within
+            # WRITE_INTERVAL of the first one, or until a flush/stop marker
+            while len(batch) < WRITE_BATCH_SIZE:
+                try:
+                    if deadline is None:
+                        item = self._write_queue.get()
+                        deadline = time.monotonic() + WRITE_INTERVAL
+                    else:
+                        item = self._write_queue.get(
+                            timeout=max(0.0, deadline - time.monotonic())
+                        )
+                except queue.Empty:
+                    break
+                taken += 1
+                if item is _STOP:
+                    stop = True
+                    break
+                if item is _FLUSH:
+                    break
+                batch.append(item)
+
+            try:
+                if batch:
+                    self._write_rows(batch)
+            except Exception as e:
+                self._write_error = e
+            finally:
+                for _ in range(taken):
+                    self._write_queue.task_done()
+
+    def _write_rows(self, rows: list[tuple]) -> None:
+        """Write full cache rows to the database in one transaction."""
+        with self._get_conn() as conn:
+            conn.execute("BEGIN")
+            try:
+                conn.executemany(self.STORE_SQL, rows)
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
 
     def lookup(self, job: TrackJob) -> dict[str, Any] | None:
         """
@@ -78,58 +246,58 @@ class CacheManager:
         Returns:
             Dict with cached data or None if not cached/invalid
         """
-        with self._get_conn() as conn:
-            cursor = conn.execute(
-                """
-                SELECT output_path, source_mtime, source_size, settings_hash,
-                       output_codec, output_sample_rate, output_bit_depth,
-                       output_size_bytes, duration_seconds, built_at
-                FROM cache
-                WHERE source_path = ?
-                """,
-                (str(job.source_path),),
-            )
-            row = cursor.fetchone()
-
+        row = self._index.get(job.source_path_str)
         if not row:
             return None
 
-        (
-            output_path,
-            source_mtime,
-            source_size,
-            settings_hash,
-            output_codec,
-            output_sample_rate,
-            output_bit_depth,
-            output_size_bytes,
-            duration_seconds,
-            built_at,
-        ) = row
-
-        # Validate cache entry
+        return self._validate_row(row, job)
+
+    def lookup_many(self, jobs: list[TrackJob]) -> dict[str, dict[str, Any]]:
+        """
+        Look up cache entries for many jobs at once.
+
+        Args:
+            jobs: Track jobs to look up
+
+        Returns:
+            Dict mapping source path string to cached data, containing
+            only entries that are valid for their job
+        """
+        entries = {}
+        for job in jobs:
+            cached = self.lookup(job)
+            if cached:
+                entries[job.source_path_str] = cached
+
+        return entries
+
+    @staticmethod
+    def _validate_row(row: tuple, job: TrackJob) -> dict[str, Any] | None:
+        """Validate a full index row against a job, returning cached data or None."""
+        # Validate cache entry; cheap equality checks first, and nothing is
+        # unpacked or allocated until the row is known to be a hit
         # Check source hasn't changed
-        if abs(source_mtime - job.source_mtime) > 0.001:  # Allow small float diff
+        if row[3] != job.source_size:
             return None
-        if source_size != job.source_size:
+        if abs(row[2] - job.source_mtime) > 0.001:  # Allow small float diff
             return None
 
         # Check settings match
-        if settings_hash != job.settings_hash:
+        if row[4] != job.settings_hash:
             return None
 
         # Check output path matches
-        if output_path != str(job.output_path):
+        if row[1] != job.output_path_str:
             return None
 
         return {
-            "output_path": output_path,
-            "output_codec": output_codec,
-            "output_sample_rate": output_sample_rate,
-            "output_bit_depth": output_bit_depth,
-            "output_size_bytes": output_size_bytes,
-            "duration_seconds": duration_seconds,
-            "built_at": built_at,
+            "output_path": row[1],
+            "output_codec": row[5],
+            "output_sample_rate": row[6],
+            "output_bit_depth": row[7],
+            "output_size_bytes": row[8],
+            "duration_seconds": row[9],
+            "built_at": row[10],
         }
 
     def store(self, job: TrackJob, result: TrackResult) -> None:
@@ -140,33 +308,45 @@ class CacheManager:
             job: Track job that was processed
             result: Conversion result
         """
-        if not result.success:
-            return
+        self.store_many([(job, result)])
 
-        with self._get_conn() as conn:
-            conn.execute(
-                """
-                INSERT OR REPLACE INTO cache
-                (source_path, output_path, source_mtime, source_size, settings_hash,
-                 output_codec, output_sample_rate, output_bit_depth,
-                 output_size_bytes, duration_seconds, built_at)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """,
-                (
-                    str(job.source_path),
-                    str(job.output_path),
-                    job.source_mtime,
-                    job.source_size,
-                    job.settings_hash,
-                    result.output_codec,
-                    result.output_sample_rate,
-                    result.output_bit_depth,
-                    result.output_size_bytes,
-                    result.duration_seconds,
-                    datetime.now().isoformat(),
-                ),
+    def store_many(self, pairs: list[tuple[TrackJob, TrackResult]]) -> None:
+        """
+        Store multiple conversion results.
+
+        The index is updated immediately; database writes are queued for
+        the background writer. Failed results are ignored.
+
+        Args:
+            pairs: List of (job, result) tuples
+        """
+        built_at = datetime.now().isoformat()
+        rows = [
+            (
+                job.source_path_str,
+                job.output_path_str,
+                job.source_mtime,
+                job.source_size,
+                job.settings_hash,
+                result.output_codec,
+                result.output_sample_rate,
+                result.output_bit_depth,
+                result.output_size_bytes,
+                result.duration_seconds,
+                built_at,
             )
-            conn.commit()
+            for job, result in pairs
+            if result.success
+        ]
+        if not rows:
+            return
+
+        for row in rows:
+            self._index[row[0]] = row
+
+        self._ensure_writer()
+        for row in rows:
+            self._write_queue.put(row)
 
     def invalidate(self, source_path: Path) -> None:
         """
@@ -175,12 +355,14 @@ class CacheManager:
         Args:
             source_path: Source file path to invalidate
         """
+        self.flush()
+        self._index.pop(str(source_path), None)
+
         with self._get_conn() as conn:
             conn.execute(
                 "DELETE FROM cache WHERE source_path = ?",
                 (str(source_path),),
             )
-            conn.commit()
 
     def invalidate_output(self, output_path: Path) -> None:
         """
@@ -189,18 +371,24 @@ class CacheManager:
         Args:
             output_path: Output file path to invalidate
         """
+        self.flush()
+        output_str = str(output_path)
+        for source_path in [k for k, row in self._index.items() if row[1] == output_str]:
+            del self._index[source_path]
+
         with self._get_conn() as conn:
             conn.execute(
                 "DELETE FROM cache WHERE output_path = ?",
-                (str(output_path),),
+                (output_str,),
             )
-            conn.commit()
 
     def clear(self) -> None:
         """Clear all cache entries."""
+        self.flush()
+        self._index.clear()
+
         with self._get_conn() as conn:
             conn.execute("DELETE FROM cache")
-            conn.commit()
 
     def get_stats(self) -> dict[str, int]:
         """
@@ -209,41 +397,47 @@ class CacheManager:
         Returns:
             Dict with entry_count, total_size_bytes
         """
-        with self._get_conn() as conn:
-            cursor = conn.execute(
-                """
-                SELECT COUNT(*), COALESCE(SUM(output_size_bytes), 0)
-                FROM cache
-                """
-            )
-            count, total_size = cursor.fetchone()
-
         return {
-            "entry_count": count,
-            "total_size_bytes": total_size,
+            "entry_count": len(self._index),
+            "total_size_bytes": sum(row[8] or 0 for row in self._index.values()),
         }
 
     def prune_missing(self) -> int:
         """
         Remove cache entries where output file no longer exists.
 
+        Existence checks run on a thread pool (they are independent stat
+        calls, often on slow mounts); deletions are issued in chunks.
+
         Returns:
             Number of entries removed
         """
-        removed = 0
+        self.flush()
+        rows = [(row[0], row[1]) for row in self._index.values()]
 
-        with self._get_conn() as conn:
-            cursor = conn.execute("SELECT source_path, output_path FROM cache")
-            rows = cursor.fetchall()
+        with ThreadPoolExecutor(max_workers=PRUNE_STAT_THREADS) as executor:
+            exists = list(executor.map(os.path.exists, (row[1] for row in rows)))
+
+        missing = [source_path for (source_path, _), ok in zip(rows, exists, strict=True) if not ok]
+        if not missing:
+            return 0
 
-            for source_path, output_path in rows:
-                if not Path(output_path).exists():
+        for source_path in missing:
+            del self._index[source_path]
+
+        with self._get_conn() as conn:
+            conn.execute("BEGIN")
+            try:
+                for i in range(0, len(missing), MAX_SQL_VARIABLES):
+                    chunk = missing[i : i + MAX_SQL_VARIABLES]
+                    placeholders = ", ".join("?" * len(chunk))
                     conn.execute(
-                        "DELETE FROM cache WHERE source_path = ?",
-                        (source_path,),
+                        f"DELETE FROM cache WHERE source_path IN ({placeholders})",
+                        chunk,
                     )
-                    removed += 1
-
-            conn.commit()
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
 
-        return removed
+        return len(missing)
@@ -244,6 +244,18 @@ def scan(
     is_flag=True,
     help="Rebuild all tracks (ignore cache)",
 )
+@click.option(
+    "--no-tempfile",
+    is_flag=True,
+    help="Write new outputs in place instead of via temp file + rename "
+    "(fewer file operations on network mounts)",
+)
+@click.option(
+    "--hardlink-mp3",
+    is_flag=True,
+    help="Hardlink untagged MP3 passthrough outputs to their sources instead of copying "
+    "(outputs then share the source files: editing one edits the other)",
+)
 @click.option(
     "--threads",
     "-t",
@@ -273,6 +285,8 @@ def apply(
     dry_run: bool,
     fail_fast: bool,
     force: bool,
+    no_tempfile: bool,
+    hardlink_mp3: bool,
     threads: int | None,
     no_tui: bool,
     compact: bool,
@@ -307,6 +321,8 @@ def apply(
         dry_run=dry_run,
         fail_fast=fail_fast,
         force=force,
+        use_tempfile=not no_tempfile,
+        hardlink_passthrough=hardlink_mp3,
         threads=threads,
         show_tui=not no_tui,
         target_sample_rate=int(target_sample_rate),
@@ -343,18 +359,9 @@ def apply(
         decisions_list = get_csv_decisions(plan_path)
         library_root = get_csv_library_root(plan_path)
     else:
-        from ipodrb.xlsx.reader import get_album_decisions
+        from ipodrb.xlsx.reader import get_album_decisions, get_xlsx_library_root
         decisions_list = get_album_decisions(plan_path)
-        # Get library root from XLSX
-        from openpyxl import load_workbook
-        wb = load_workbook(plan_path, read_only=True)
-        library_root = None
-        if "Summary" in wb.sheetnames:
-            for row in wb["Summary"].iter_rows(min_row=1, max_row=10, max_col=2, values_only=True):
-                if row[0] == "library_root":
-                    library_root = Path(row[1])
-                    break
-        wb.close()
+        library_root = get_xlsx_library_root(plan_path)
 
     decisions = {d["album_id"]: d for d in decisions_list}
 
@@ -1,9 +1,39 @@
 """FFmpeg command builders for audio conversion."""
 
+from collections.abc import Callable
+from functools import lru_cache
 from pathlib import Path
+from typing import NamedTuple
 
 from ipodrb.models.plan import Action, TrackJob
 
+# Placeholders for the input/output paths in cached command templates.
+# NUL can never appear in a real argument, so these cannot collide.
+_INPUT_PLACEHOLDER = "\0input\0"
+_OUTPUT_PLACEHOLDER = "\0output\0"
+
+# Non-interactive, quiet FFmpeg: no banner or progress lines to write and
+# drain per process, no stdin polling; warnings and errors still go to stderr
+_QUIET_FLAGS = ["-hide_banner", "-nostats", "-nostdin"]
+
+# MP4 muxer flags: put the moov atom first so the iPod can start playback
+# without seeking to the end of the file
+_MP4_FLAGS = ["-movflags", "+faststart"]
+
+
+class _CommandKey(NamedTuple):
+    """The TrackJob fields that determine an FFmpeg command (minus paths)."""
+
+    action: Action
+    source_channels: int
+    source_sample_rate: int
+    source_bit_depth: int | None
+    source_codec: str | None
+    target_sample_rate: int
+    target_bit_depth: int | None
+    aac_bitrate_kbps: int | None
+    source_path: str = _INPUT_PLACEHOLDER
+
 
 def build_ffmpeg_command(
     job: TrackJob,
@@ -13,6 +43,9 @@ def build_ffmpeg_command(
     """
     Build FFmpeg command for track conversion.
 
+    A plan only has a handful of distinct parameter combinations, so the
+    command is built once per combination and the paths filled in per job.
+
     Args:
         job: Track job with conversion parameters
         temp_output: Temporary output path
@@ -21,14 +54,82 @@ def build_ffmpeg_command(
     Returns:
         Command as list of strings
     """
-    if job.action == Action.PASS_MP3:
-        return build_passthrough_command(job, temp_output, ffmpeg_path)
-    elif job.action in (Action.ALAC_PRESERVE, Action.ALAC_16_44):
-        return build_alac_command(job, temp_output, ffmpeg_path)
-    elif job.action == Action.AAC:
-        return build_aac_command(job, temp_output, ffmpeg_path)
-    else:
-        raise ValueError(f"Unsupported action: {job.action}")
+    key = _CommandKey(
+        action=job.action,
+        source_channels=job.source_channels,
+        source_sample_rate=job.source_sample_rate,
+        source_bit_depth=job.source_bit_depth,
+        source_codec=job.source_codec,
+        target_sample_rate=job.target_sample_rate,
+        target_bit_depth=job.target_bit_depth,
+        aac_bitrate_kbps=job.aac_bitrate_kbps,
+    )
+    template = _command_template(key, ffmpeg_path)
+
+    source = job.source_path_str
+    output = str(temp_output)
+    return [
+        source if arg == _INPUT_PLACEHOLDER else output if arg == _OUTPUT_PLACEHOLDER else arg
+        for arg in template
+    ]
+
+
+def build_batch_command(
+    jobs: list[TrackJob],
+    temp_outputs: list[Path],
+    ffmpeg_path: str = "ffmpeg",
+) -> list[str]:
+    """
+    Build one FFmpeg command that converts several tracks.
+
+    Every track becomes its own input, mapped to its own output with the
+    same output options build_ffmpeg_command would give it alone, so a
+    whole album shares one process startup and codec initialization.
+
+    Args:
+        jobs: Track jobs to convert
+        temp_outputs: Temporary output path for each job
+        ffmpeg_path: Path to FFmpeg executable
+
+    Returns:
+        Command as list of strings
+
+    Raises:
+        ValueError: If the jobs' commands differ in their global options
+    """
+    singles = [
+        build_ffmpeg_command(job, temp_output, ffmpeg_path)
+        for job, temp_output in zip(jobs, temp_outputs, strict=True)
+    ]
+
+    # Every builder emits: <global options> -i <source> -vn <output options> <output>
+    prefix = singles[0][: singles[0].index("-i")]
+    cmd = list(prefix)
+    for job in jobs:
+        cmd.extend(["-i", job.source_path_str])
+    for i, single in enumerate(singles):
+        split = single.index("-vn")
+        if single[: single.index("-i")] != prefix:
+            raise ValueError("Batched jobs need the same global FFmpeg options")
+        # Tags and chapters default to the first input for every output;
+        # take each track's own, as its single-track command would
+        cmd.extend(["-map_metadata", str(i), "-map_chapters", str(i)])
+        cmd.extend(["-map", f"{i}:a:0"])  # Audio only, so no -vn needed
+        cmd.extend(single[split + 1 :])
+
+    return cmd
+
+
+@lru_cache(maxsize=64)
+def _command_template(key: _CommandKey, ffmpeg_path: str) -> tuple[str, ...]:
+    """Build a command with placeholder paths for a parameter combination."""
+    try:
+        builder = _BUILDERS[key.action]
+    except KeyError:
+        raise ValueError(f"Unsupported action: {key.action}") from None
+
+    # The builders only read attributes shared with TrackJob
+    return tuple(builder(key, Path(_OUTPUT_PLACEHOLDER), ffmpeg_path))
 
 
 def build_alac_command(
@@ -44,15 +145,25 @@ def build_alac_command(
     - Applies triangular high-pass dither when reducing bit depth
     - Applies headroom reduction for multichannel->stereo downmix to prevent clipping
     - Never upscales (sample rate or bit depth)
+    - Stream-copies ALAC sources that already match the target format
     """
+    if _is_alac_remux(job):
+        # Same codec, rate, depth and layout: re-encoding would be bit-identical
+        cmd = build_passthrough_command(job, temp_output, ffmpeg_path)
+        cmd[-1:-1] = _MP4_FLAGS
+        return cmd
+
     cmd = [
         ffmpeg_path,
         "-y",  # Overwrite output
+        *_QUIET_FLAGS,
+        "-filter_threads", "1",  # Parallelism comes from the worker pool
         "-i", str(job.source_path),
         "-vn",  # No video
     ]
 
-    # Build audio filter chain
+    # Build audio filter chain (a single -af graph; the resampler sets the
+    # output rate, so no separate -ar stage is needed when it is present)
     filters = []
 
     # 1. Multichannel to stereo downmix with headroom protection
@@ -90,10 +201,9 @@ def build_alac_command(
     cmd.extend(["-ac", "2"])
 
     # Output settings
-    cmd.extend([
-        "-c:a", "alac",
-        "-ar", str(job.target_sample_rate),
-    ])
+    cmd.extend(["-c:a", "alac"])
+    if not (needs_resample or needs_dither):
+        cmd.extend(["-ar", str(job.target_sample_rate)])
 
     # Set bit depth via sample format
     if job.target_bit_depth:
@@ -102,11 +212,23 @@ def build_alac_command(
         elif job.target_bit_depth <= 24:
             cmd.extend(["-sample_fmt", "s32p"])  # ALAC uses s32p for 24-bit
 
+    cmd.extend(["-threads", "1"])
+    cmd.extend(_MP4_FLAGS)
     cmd.append(str(temp_output))
 
     return cmd
 
 
+def _is_alac_remux(job: TrackJob) -> bool:
+    """Check if an ALAC job's source can be copied without re-encoding."""
+    return (
+        job.source_codec == "alac"
+        and job.source_sample_rate == job.target_sample_rate
+        and (job.source_bit_depth or 16) == (job.target_bit_depth or 16)
+        and job.source_channels == 2
+    )
+
+
 def build_aac_command(
     job: TrackJob,
     temp_output: Path,
@@ -121,6 +243,8 @@ def build_aac_command(
     cmd = [
         ffmpeg_path,
         "-y",
+        *_QUIET_FLAGS,
+        "-filter_threads", "1",
         "-i", str(job.source_path),
         "-vn",
     ]
@@ -133,10 +257,12 @@ def build_aac_command(
         filters.append("volume=-3dB")
 
     # 2. Resample if needed (use soxr for high quality)
+    # precision=20 is already transparent ahead of a lossy encoder and
+    # roughly twice as fast as the precision=28 used for ALAC
     needs_resample = job.source_sample_rate != job.target_sample_rate
     if needs_resample:
         filters.append(
-            f"aresample={job.target_sample_rate}:resampler=soxr:precision=28"
+            f"aresample={job.target_sample_rate}:resampler=soxr:precision=20"
         )
 
     if filters:
@@ -153,9 +279,12 @@ def build_aac_command(
         "-c:a", "aac",
         "-profile:a", "aac_low",  # AAC-LC for compatibility
         "-b:a", f"{bitrate}k",
-        "-ar", str(job.target_sample_rate),
     ])
+    if not needs_resample:
+        cmd.extend(["-ar", str(job.target_sample_rate)])
 
+    cmd.extend(["-threads", "1"])
+    cmd.extend(_MP4_FLAGS)
     cmd.append(str(temp_output))
 
     return cmd
@@ -174,13 +303,25 @@ def build_passthrough_command(
     return [
         ffmpeg_path,
         "-y",
+        *_QUIET_FLAGS,
+        "-filter_threads", "1",
         "-i", str(job.source_path),
         "-vn",
         "-c:a", "copy",
+        "-threads", "1",
         str(temp_output),
     ]
 
 
+# Command builder for each action that produces an output file
+_BUILDERS: dict[Action, Callable[[TrackJob, Path, str], list[str]]] = {
+    Action.PASS_MP3: build_passthrough_command,
+    Action.ALAC_PRESERVE: build_alac_command,
+    Action.ALAC_16_44: build_alac_command,
+    Action.AAC: build_aac_command,
+}
+
+
 def build_probe_command(
     path: Path,
     ffprobe_path: str = "ffprobe",
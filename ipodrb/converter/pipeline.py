@@ -1,13 +1,16 @@
 """Parallel conversion pipeline."""
 
-from concurrent.futures import ProcessPoolExecutor, as_completed
+import os
+import queue
+import threading
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
 from dataclasses import dataclass, field
 from datetime import datetime
 from pathlib import Path
 from typing import Callable
 
 from ipodrb.cache.manager import CacheManager
-from ipodrb.converter.transcoder import convert_track
+from ipodrb.converter.transcoder import convert_album_batch
 from ipodrb.models.config import ApplyConfig, Config
 from ipodrb.models.plan import BuildPlan, TrackJob, TrackResult
 from ipodrb.utils.conversion_log import ConversionLog
@@ -59,6 +62,19 @@ class PipelineStats:
         return self.total_jobs - self.completed_jobs - self.failed_jobs - self.cached_jobs
 
 
+# Number of completed jobs to accumulate before writing them to the cache
+CACHE_FLUSH_SIZE = 128
+
+# Futures kept in flight per worker process
+INFLIGHT_PER_WORKER = 4
+
+# Most tracks converted by one FFmpeg process (see convert_album_batch)
+MAX_BATCH_TRACKS = 16
+
+# Emitter queue marker: stop the emitter thread
+_STOP_EVENTS = object()
+
+
 class ConversionPipeline:
     """
     Parallel conversion pipeline using ProcessPoolExecutor.
@@ -68,6 +84,11 @@ class ConversionPipeline:
     - Parallel execution across CPU cores
     - Progress events for TUI updates
     - Error collection and reporting
+
+    Events are delivered to the callback from a dedicated emitter thread
+    while execute() runs, so a slow callback (e.g. a TUI redraw) never
+    delays result collection. All events are delivered before execute()
+    returns.
     """
 
     def __init__(
@@ -82,11 +103,56 @@ class ConversionPipeline:
         self.cache = CacheManager(config.output_root / config.cache_db_name)
         self.stats = PipelineStats()
         self.conversion_log = ConversionLog(config.output_root)
+        self._events: queue.SimpleQueue = queue.SimpleQueue()
+        self._emitter: threading.Thread | None = None
+        self._emit_error: Exception | None = None
 
     def emit(self, event: PipelineEvent) -> None:
         """Emit event to callback if registered."""
-        if self.event_callback:
+        if not self.event_callback:
+            return
+        if self._emitter is None:
             self.event_callback(event)
+        else:
+            self._events.put(event)
+
+    def _start_emitter(self) -> None:
+        """Start the thread that delivers queued events to the callback."""
+        if self.event_callback and self._emitter is None:
+            self._emitter = threading.Thread(
+                target=self._emitter_loop,
+                name="ipodrb-pipeline-events",
+                daemon=True,
+            )
+            self._emitter.start()
+
+    def _stop_emitter(self) -> None:
+        """
+        Deliver any remaining events and stop the emitter thread.
+
+        Re-raises the first exception raised by the callback, if any.
+        """
+        if self._emitter is not None:
+            self._events.put(_STOP_EVENTS)
+            self._emitter.join()
+            self._emitter = None
+
+        if self._emit_error is not None:
+            error, self._emit_error = self._emit_error, None
+            raise error
+
+    def _emitter_loop(self) -> None:
+        """Pass queued events to the callback until stopped."""
+        while True:
+            event = self._events.get()
+            if event is _STOP_EVENTS:
+                return
+            if self._emit_error is not None:
+                continue  # Drop events after a callback failure
+            try:
+                self.event_callback(event)
+            except Exception as e:
+                self._emit_error = e
 
     def execute(
         self,
@@ -108,23 +174,36 @@ class ConversionPipeline:
             started_at=datetime.now(),
         )
 
-        # Initialize conversion log
-        self.conversion_log = ConversionLog(self.config.output_root)
+        # Reset the conversion log for this run
         self.conversion_log.start(
             total_tracks=len(plan.jobs),
             albums_processed=len(set(j.album_id for j in plan.jobs)),
             albums_skipped=len(plan.skipped_albums),
         )
 
-        if dry_run:
-            return self._dry_run(plan)
-
+        # Closing the cache and log flushes their queued writes, so it must
+        # run even if the build fails or is interrupted
+        try:
+            if dry_run:
+                return self._dry_run(plan)
+            return self._build(plan)
+        finally:
+            self.cache.close()
+            self.conversion_log.close()
+
+    def _build(self, plan: BuildPlan) -> list[TrackResult]:
+        """Run the plan's uncached jobs and write the conversion logs."""
         # Filter out cached jobs
         jobs_to_run = []
         cached_results = []
+        if self.config.force:
+            cached_entries, output_sizes = {}, {}
+        else:
+            cached_entries = self.cache.lookup_many(plan.jobs)
+            output_sizes = _scan_output_sizes(plan.jobs)
 
         for job in plan.jobs:
-            if not self.config.force and self._is_cached(job):
+            if not self.config.force and self._is_cached(job, cached_entries, output_sizes):
                 self.stats.cached_jobs += 1
                 self.conversion_log.log_cached(job)
                 cached_results.append(TrackResult(
@@ -139,98 +218,182 @@ class ConversionPipeline:
         results = cached_results.copy()
 
         if jobs_to_run:
-            results.extend(self._run_parallel(jobs_to_run))
+            self._start_emitter()
+            try:
+                results.extend(self._run_parallel(jobs_to_run))
+            finally:
+                self._stop_emitter()
 
         self.stats.completed_at = datetime.now()
 
         # Complete and write conversion logs
         self.conversion_log.complete()
-        log_paths = self.conversion_log.write_logs()
+        self.conversion_log.write_logs()
 
         return results
 
-    def _is_cached(self, job: TrackJob) -> bool:
-        """Check if job output is cached and valid."""
-        if not job.output_path.exists():
-            return False
+    def _is_cached(
+        self,
+        job: TrackJob,
+        cached_entries: dict[str, dict] | None = None,
+        output_sizes: dict[Path, dict[str, int]] | None = None,
+    ) -> bool:
+        """
+        Check if job output is cached and valid.
 
-        cached = self.cache.lookup(job)
-        if not cached:
+        Args:
+            job: Track job to check
+            cached_entries: Optional preloaded result of CacheManager.lookup_many;
+                if omitted, the cache is queried for this job alone
+            output_sizes: Optional preloaded result of _scan_output_sizes;
+                if omitted, the output file is stat'ed directly
+        """
+        # Verify output exists and is non-empty
+        if output_sizes is None:
+            try:
+                size = job.output_path.stat().st_size
+            except OSError:
+                return False
+        else:
+            size = output_sizes.get(job.output_dir, {}).get(job.output_path.name)
+        if not size:
             return False
 
-        # Verify output still exists and is readable
-        try:
-            if job.output_path.stat().st_size == 0:
-                return False
-        except OSError:
+        if cached_entries is None:
+            cached = self.cache.lookup(job)
+        else:
+            cached = cached_entries.get(job.source_path_str)
+        if not cached:
             return False
 
         return True
 
     def _run_parallel(self, jobs: list[TrackJob]) -> list[TrackResult]:
-        """Run jobs in parallel using process pool."""
+        """
+        Run jobs in parallel in a single process pool.
+
+        FFmpeg is asked to run single-threaded, so the pool size is the
+        main source of parallelism and every action gets the full thread
+        count. The tracks of an album are converted in batches by one
+        FFmpeg run, unless there are too few batches to keep every worker
+        busy; albums are then split into smaller batches.
+        """
+        workers = max(1, self.config.threads)
+        batches = _batch_by_album(jobs)
+        if len(batches) < workers:
+            batches = _split_batches(batches, workers)
+        return self._run_pool(batches, workers)
+
+    def _run_pool(
+        self,
+        batches: list[list[TrackJob]],
+        workers: int,
+    ) -> list[TrackResult]:
+        """
+        Run batches of jobs in a process pool of the given size.
+
+        Batches are submitted through a sliding window of at most
+        INFLIGHT_PER_WORKER * workers futures, so memory held by the
+        executor stays bounded regardless of plan size.
+        """
         results = []
+        pending_cache: list[tuple[TrackJob, TrackResult]] = []
+        batch_iter = iter(batches)
+        max_inflight = INFLIGHT_PER_WORKER * workers
+        stop = False
 
         # We use ProcessPoolExecutor for CPU-bound encoding
-        # But convert_track needs to be picklable, so we pass simple args
-        with ProcessPoolExecutor(max_workers=self.config.threads) as executor:
-            # Submit all jobs
-            future_to_job = {}
-            for job in jobs:
-                self.emit(JobStartedEvent(job=job))
-                future = executor.submit(
-                    _convert_track_worker,
-                    job,
-                    self.global_config,
-                )
-                future_to_job[future] = job
-
-            # Collect results
-            for future in as_completed(future_to_job):
-                job = future_to_job[future]
-
-                try:
-                    result = future.result()
-
-                    if result.success:
-                        self.stats.completed_jobs += 1
-                        # Update cache
-                        self.cache.store(job, result)
-                        self.emit(JobCompletedEvent(job=job, result=result))
-                    else:
-                        self.stats.failed_jobs += 1
-                        self.emit(JobErrorEvent(
-                            job=job,
-                            error=result.error_message or "Unknown error",
-                        ))
-
-                    # Log the track conversion
-                    self.conversion_log.log_track(job, result)
-                    results.append(result)
-
-                except Exception as e:
-                    self.stats.failed_jobs += 1
-                    error_result = TrackResult(
-                        source_path=job.source_path,
-                        success=False,
-                        error_message=str(e),
-                    )
-                    # Log the error
-                    self.conversion_log.log_track(job, error_result)
-                    results.append(error_result)
-                    self.emit(JobErrorEvent(job=job, error=str(e)))
-
-                    if self.config.fail_fast:
+        # But the worker function needs to be picklable, so we pass simple args;
+        # per-run settings are sent once per worker via the initializer
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_worker,
+            initargs=(
+                self.global_config,
+                self.config.use_tempfile,
+                self.config.hardlink_passthrough,
+            ),
+        ) as executor:
+            inflight: dict[Future, list[TrackJob]] = {}
+
+            def submit_next() -> None:
+                batch = next(batch_iter, None)
+                if batch is None:
+                    return
+                for job in batch:
+                    self.emit(JobStartedEvent(job=job))
+                future = executor.submit(_convert_batch_worker, batch)
+                inflight[future] = batch
+
+            # Prime the window
+            for _ in range(min(len(batches), max_inflight)):
+                submit_next()
+
+            # Collect results, refilling the window as jobs finish
+            while inflight and not stop:
+                done, _ = wait(inflight, return_when=FIRST_COMPLETED)
+
+                for future in done:
+                    batch = inflight.pop(future)
+
+                    raised = False
+                    try:
+                        batch_results = future.result()
+                        if len(batch_results) != len(batch):
+                            raise RuntimeError(
+                                f"Worker returned {len(batch_results)} results "
+                                f"for {len(batch)} tracks"
+                            )
+                    except Exception as e:
+                        raised = True
+                        batch_results = [
+                            TrackResult(
+                                source_path=job.source_path,
+                                success=False,
+                                error_message=str(e),
+                            )
+                            for job in batch
+                        ]
+
+                    for job, result in zip(batch, batch_results, strict=True):
+                        if result.success:
+                            self.stats.completed_jobs += 1
+                            # Queue cache update (flushed in batches)
+                            pending_cache.append((job, result))
+                            if len(pending_cache) >= CACHE_FLUSH_SIZE:
+                                self.cache.store_many(pending_cache)
+                                pending_cache.clear()
+                            self.emit(JobCompletedEvent(job=job, result=result))
+                        else:
+                            self.stats.failed_jobs += 1
+                            self.emit(JobErrorEvent(
+                                job=job,
+                                error=result.error_message or "Unknown error",
+                            ))
+
+                        # Log the track conversion
+                        self.conversion_log.log_track(job, result)
+                        results.append(result)
+
+                    if raised and self.config.fail_fast:
                         executor.shutdown(wait=False, cancel_futures=True)
+                        stop = True
                         break
 
+                    submit_next()
+
+        # Flush remaining cache updates
+        self.cache.store_many(pending_cache)
+
         return results
 
     def _dry_run(self, plan: BuildPlan) -> list[TrackResult]:
         """Report what would be done without actually doing it."""
         results = []
+        cached_entries = self.cache.lookup_many(plan.jobs)
+        output_sizes = _scan_output_sizes(plan.jobs)
         for job in plan.jobs:
-            cached = self._is_cached(job)
+            cached = self._is_cached(job, cached_entries, output_sizes)
             results.append(TrackResult(
                 source_path=job.source_path,
                 output_path=job.output_path,
@@ -243,10 +406,92 @@ class ConversionPipeline:
         return results
 
 
-def _convert_track_worker(job: TrackJob, config: Config) -> TrackResult:
+def _batch_by_album(jobs: list[TrackJob]) -> list[list[TrackJob]]:
+    """
+    Group consecutive jobs of the same album and action into conversion batches.
+
+    Jobs are planned album by album, so consecutive grouping keeps each
+    album together; a batch shares one action so its tracks encode alike
+    in one FFmpeg run, and batches are capped at MAX_BATCH_TRACKS so one long
+    album cannot tie up a worker for the whole run.
+    """
+    batches: list[list[TrackJob]] = []
+    for job in jobs:
+        if (
+            batches
+            and batches[-1][0].album_id == job.album_id
+            and batches[-1][0].action == job.action
+            and len(batches[-1]) < MAX_BATCH_TRACKS
+        ):
+            batches[-1].append(job)
+        else:
+            batches.append([job])
+    return batches
+
+
+def _split_batches(batches: list[list[TrackJob]], workers: int) -> list[list[TrackJob]]:
+    """
+    Split each batch into chunks of ceil(len / workers) jobs.
+
+    Used when there are fewer batches than workers, so a small build
+    (or a single album) still spreads across the whole pool.
+    """
+    chunks: list[list[TrackJob]] = []
+    for batch in batches:
+        size = -(-len(batch) // workers)
+        chunks.extend(batch[i : i + size] for i in range(0, len(batch), size))
+    return chunks
+
+
+def _scan_output_sizes(jobs: list[TrackJob]) -> dict[Path, dict[str, int]]:
+    """
+    Collect sizes of existing output files with one scandir per directory.
+
+    Returns:
+        Dict mapping output directory to {filename: size_bytes} for the
+        regular files in it that belong to a job
+    """
+    wanted: dict[Path, set[str]] = {}
+    for job in jobs:
+        wanted.setdefault(job.output_dir, set()).add(job.output_path.name)
+
+    sizes: dict[Path, dict[str, int]] = {}
+    for directory, names in wanted.items():
+        dir_sizes: dict[str, int] = {}
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    if entry.name in names and entry.is_file():
+                        dir_sizes[entry.name] = entry.stat().st_size
+        except OSError:
+            pass  # Missing or unreadable directory: nothing cached there
+        sizes[directory] = dir_sizes
+
+    return sizes
+
+
+# Settings for the current worker process, set by _init_worker
+_WORKER_CONFIG: Config | None = None
+_WORKER_USE_TEMPFILE = True
+_WORKER_HARDLINK = False
+
+
+def _init_worker(
+    config: Config,
+    use_tempfile: bool = True,
+    hardlink_passthrough: bool = False,
+) -> None:
+    """Process pool initializer: stash per-run settings in this worker."""
+    global _WORKER_CONFIG, _WORKER_USE_TEMPFILE, _WORKER_HARDLINK
+    _WORKER_CONFIG = config
+    _WORKER_USE_TEMPFILE = use_tempfile
+    _WORKER_HARDLINK = hardlink_passthrough
+
+
+def _convert_batch_worker(jobs: list[TrackJob]) -> list[TrackResult]:
     """
     Worker function for process pool.
 
     This runs in a separate process, so it must be a module-level function.
     """
-    return convert_track(job, config)
+    return convert_album_batch(jobs, _WORKER_CONFIG, _WORKER_USE_TEMPFILE, _WORKER_HARDLINK)
@@ -2,6 +2,7 @@
 
 from pathlib import Path
 
+from mutagen import FileType
 from mutagen.id3 import APIC, ID3, TALB, TCON, TDRC, TIT2, TPE1, TPE2, TRCK, TPOS
 from mutagen.mp3 import MP3
 from mutagen.mp4 import MP4, MP4Cover
@@ -12,6 +13,7 @@ from ipodrb.models.plan import TrackJob
 def write_tags_and_artwork(
     output_path: Path,
     job: TrackJob,
+    audio: FileType | None = None,
 ) -> None:
     """
     Write metadata tags and artwork to output file.
@@ -21,18 +23,21 @@ def write_tags_and_artwork(
     Args:
         output_path: Path to output file
         job: Track job with tags and artwork info
+        audio: Optional mutagen file already loaded from output_path; used
+            instead of parsing the file again when it has the right type
     """
     ext = output_path.suffix.lower()
 
     if ext == ".m4a":
-        _write_mp4_tags(output_path, job)
+        _write_mp4_tags(output_path, job, audio if isinstance(audio, MP4) else None)
     elif ext == ".mp3":
-        _write_mp3_tags(output_path, job)
+        _write_mp3_tags(output_path, job, audio if isinstance(audio, MP3) else None)
 
 
-def _write_mp4_tags(output_path: Path, job: TrackJob) -> None:
+def _write_mp4_tags(output_path: Path, job: TrackJob, audio: MP4 | None = None) -> None:
     """Write tags to MP4/M4A file."""
-    audio = MP4(output_path)
+    if audio is None:
+        audio = MP4(output_path)
 
     tags = job.tags
 
@@ -79,13 +84,16 @@ def _write_mp4_tags(output_path: Path, job: TrackJob) -> None:
     audio.save()
 
 
-def _write_mp3_tags(output_path: Path, job: TrackJob) -> None:
+def _write_mp3_tags(output_path: Path, job: TrackJob, audio: MP3 | None = None) -> None:
     """Write tags to MP3 file."""
-    try:
-        audio = MP3(output_path, ID3=ID3)
-    except Exception:
-        # If no ID3 tag exists, create one
-        audio = MP3(output_path)
+    if audio is None:
+        try:
+            audio = MP3(output_path, ID3=ID3)
+        except Exception:
+            # If no ID3 tag exists, create one
+            audio = MP3(output_path)
+            audio.add_tags()
+    if audio.tags is None:
         audio.add_tags()
 
     tags = job.tags
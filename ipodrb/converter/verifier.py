@@ -1,10 +1,15 @@
-"""Output verification using FFprobe."""
+"""Output verification using mutagen or FFprobe."""
 
 import json
 import subprocess
 from dataclasses import dataclass
 from pathlib import Path
 
+import mutagen
+from mutagen import FileType
+from mutagen.mp3 import MPEGInfo
+from mutagen.mp4 import MP4Info
+
 from ipodrb.converter.ffmpeg import build_probe_command
 from ipodrb.models.plan import TrackJob
 
@@ -27,6 +32,8 @@ def verify_output(
     job: TrackJob,
     ffprobe_path: str = "ffprobe",
     duration_tolerance: float = 1.0,
+    in_process: bool = False,
+    audio: FileType | None = None,
 ) -> VerificationResult:
     """
     Verify converted output file.
@@ -42,6 +49,10 @@ def verify_output(
         job: Original track job
         ffprobe_path: Path to FFprobe
         duration_tolerance: Allowed duration difference in seconds
+        in_process: Read stream info with mutagen instead of spawning
+            FFprobe, using FFprobe only for files mutagen cannot parse
+        audio: Already loaded mutagen file for output_path (see open_audio),
+            reused by the in-process probe instead of parsing the file again
 
     Returns:
         VerificationResult
@@ -61,41 +72,136 @@ def verify_output(
             error_message="Output file is empty",
         )
 
-    # Probe the output
+    # Probe the output (in-process header read, falling back to FFprobe)
+    probe = None
+    if in_process:
+        probe = _probe_info(audio if audio is not None else open_audio(output_path))
+    if probe is None:
+        probe, error_message = _probe_with_ffprobe(output_path, ffprobe_path)
+        if probe is None:
+            return VerificationResult(success=False, error_message=error_message)
+
+    codec, sample_rate, bit_depth, duration = probe
+
+    # Validate codec
+    expected_codecs = {
+        "alac": ["alac"],
+        "aac": ["aac"],
+        "copy": ["mp3", "mp3float"],
+    }
+    valid_codecs = expected_codecs.get(job.target_codec, [])
+    if codec not in valid_codecs:
+        return VerificationResult(
+            success=False,
+            codec=codec,
+            sample_rate=sample_rate,
+            bit_depth=bit_depth,
+            duration=duration,
+            size_bytes=size_bytes,
+            error_message=f"Unexpected codec: {codec}, expected one of {valid_codecs}",
+        )
+
+    # Validate sample rate (with some tolerance for AAC)
+    if job.target_codec != "copy":
+        sr_tolerance = 100  # Allow small differences
+        if abs(sample_rate - job.target_sample_rate) > sr_tolerance:
+            return VerificationResult(
+                success=False,
+                codec=codec,
+                sample_rate=sample_rate,
+                bit_depth=bit_depth,
+                duration=duration,
+                size_bytes=size_bytes,
+                error_message=f"Sample rate mismatch: {sample_rate} vs expected {job.target_sample_rate}",
+            )
+
+    # Success
+    return VerificationResult(
+        success=True,
+        codec=codec,
+        sample_rate=sample_rate,
+        bit_depth=bit_depth,
+        duration=duration,
+        size_bytes=size_bytes,
+    )
+
+
+# (codec, sample_rate, bit_depth, duration) as reported by FFprobe
+ProbeInfo = tuple[str, int, int | None, float]
+
+
+def open_audio(path: Path) -> FileType | None:
+    """
+    Load a file's headers and tags with mutagen.
+
+    The result can be shared by verify_output and write_tags_and_artwork
+    so a freshly encoded file is parsed only once.
+
+    Returns:
+        Mutagen file object, or None if mutagen cannot read the file
+    """
+    try:
+        return mutagen.File(path)
+    except Exception:
+        return None
+
+
+def _probe_info(audio: FileType | None) -> ProbeInfo | None:
+    """
+    Read stream info from a mutagen file's container headers.
+
+    Codec names and bit depths are normalized to what FFprobe reports.
+
+    Returns:
+        Probe info, or None if the file is unreadable or not MP4/MP3
+    """
+    if audio is None:
+        return None
+
+    info = audio.info
+    if isinstance(info, MP4Info):
+        if info.codec == "alac":
+            return "alac", info.sample_rate, info.bits_per_sample, info.length
+        if info.codec.startswith("mp4a"):
+            return "aac", info.sample_rate, None, info.length
+    elif isinstance(info, MPEGInfo) and info.layer == 3:
+        return "mp3", info.sample_rate, None, info.length
+
+    return None
+
+
+def _probe_with_ffprobe(
+    output_path: Path,
+    ffprobe_path: str,
+) -> tuple[ProbeInfo | None, str | None]:
+    """
+    Read stream info by running FFprobe.
+
+    Returns:
+        Tuple of (probe info, None) on success or (None, error message)
+    """
     cmd = build_probe_command(output_path, ffprobe_path)
 
     try:
         result = subprocess.run(
             cmd,
             capture_output=True,
-            text=True,
             timeout=30,
         )
     except subprocess.TimeoutExpired:
-        return VerificationResult(
-            success=False,
-            error_message="FFprobe timed out",
-        )
+        return None, "FFprobe timed out"
     except Exception as e:
-        return VerificationResult(
-            success=False,
-            error_message=f"FFprobe failed: {e}",
-        )
+        return None, f"FFprobe failed: {e}"
 
     if result.returncode != 0:
-        return VerificationResult(
-            success=False,
-            error_message=f"FFprobe error: {result.stderr}",
-        )
+        stderr_text = result.stderr[-1024:].decode("utf-8", errors="replace")
+        return None, f"FFprobe error: {stderr_text}"
 
-    # Parse probe output
+    # Parse probe output (json accepts the raw UTF-8 bytes)
     try:
         data = json.loads(result.stdout)
     except json.JSONDecodeError:
-        return VerificationResult(
-            success=False,
-            error_message="Invalid FFprobe JSON output",
-        )
+        return None, "Invalid FFprobe JSON output"
 
     # Find audio stream
     audio_stream = None
@@ -105,10 +211,7 @@ def verify_output(
             break
 
     if not audio_stream:
-        return VerificationResult(
-            success=False,
-            error_message="No audio stream found in output",
-        )
+        return None, "No audio stream found in output"
 
     # Extract values
     codec = audio_stream.get("codec_name", "")
@@ -131,44 +234,4 @@ def verify_output(
     elif "duration" in audio_stream:
         duration = float(audio_stream["duration"])
 
-    # Validate codec
-    expected_codecs = {
-        "alac": ["alac"],
-        "aac": ["aac"],
-        "copy": ["mp3", "mp3float"],
-    }
-    valid_codecs = expected_codecs.get(job.target_codec, [])
-    if codec not in valid_codecs:
-        return VerificationResult(
-            success=False,
-            codec=codec,
-            sample_rate=sample_rate,
-            bit_depth=bit_depth,
-            duration=duration,
-            size_bytes=size_bytes,
-            error_message=f"Unexpected codec: {codec}, expected one of {valid_codecs}",
-        )
-
-    # Validate sample rate (with some tolerance for AAC)
-    if job.target_codec != "copy":
-        sr_tolerance = 100  # Allow small differences
-        if abs(sample_rate - job.target_sample_rate) > sr_tolerance:
-            return VerificationResult(
-                success=False,
-                codec=codec,
-                sample_rate=sample_rate,
-                bit_depth=bit_depth,
-                duration=duration,
-                size_bytes=size_bytes,
-                error_message=f"Sample rate mismatch: {sample_rate} vs expected {job.target_sample_rate}",
-            )
-
-    # Success
-    return VerificationResult(
-        success=True,
-        codec=codec,
-        sample_rate=sample_rate,
-        bit_depth=bit_depth,
-        duration=duration,
-        size_bytes=size_bytes,
-    )
+    return (codec, sample_rate, bit_depth, duration), None
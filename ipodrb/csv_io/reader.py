@@ -1,8 +1,8 @@
 """CSV/TSV plan reader for open-source users."""
 
 import csv
-import io
-import re
+from collections.abc import Callable, Iterable, Iterator
+from functools import lru_cache
 from pathlib import Path
 from typing import Any
 
@@ -14,81 +14,134 @@ def detect_delimiter(csv_path: Path) -> str:
     elif csv_path.suffix.lower() == ".csv":
         return ","
     else:
-        # Try to auto-detect from first data line
-        with open(csv_path, encoding="utf-8") as f:
+        # Try to auto-detect from first data line; binary lines need no
+        # decoding, and reading stops there however long the comments are
+        with open(csv_path, "rb") as f:
             for line in f:
-                if not line.startswith("#"):
-                    if "\t" in line:
+                if not line.startswith(b"#"):
+                    if b"\t" in line:
                         return "\t"
                     return ","
         return "\t"  # Default to TSV
 
 
-def read_csv_plan(csv_path: Path) -> tuple[dict[str, Any], list[dict[str, Any]]]:
+# Parsed plan: (metadata, column name -> index, album rows). Rows are the
+# csv.reader lists, padded to the header width, indexed through the map.
+CsvPlan = tuple[dict[str, Any], dict[str, int], list[list[str]]]
+
+
+def read_csv_plan(csv_path: Path) -> CsvPlan:
     """
     Read CSV/TSV plan file.
 
+    Parsed plans are cached by path, mtime and size, so the get_csv_*
+    helpers can each call this without re-reading an unchanged file.
+    The returned objects are shared between callers and must not be
+    mutated.
+
     Args:
         csv_path: Path to CSV/TSV plan file
 
     Returns:
-        Tuple of (metadata dict, list of album dicts)
+        Tuple of (metadata dict, column index by name, list of album rows)
     """
     csv_path = Path(csv_path)
 
-    if not csv_path.exists():
-        raise FileNotFoundError(f"Plan file not found: {csv_path}")
+    try:
+        st = csv_path.stat()
+    except FileNotFoundError:
+        raise FileNotFoundError(f"Plan file not found: {csv_path}") from None
+
+    return _read_csv_plan_cached(str(csv_path), st.st_mtime_ns, st.st_size)
+
 
+@lru_cache(maxsize=8)
+def _read_csv_plan_cached(path_str: str, mtime_ns: int, size: int) -> CsvPlan:
+    """Parse a plan file; mtime_ns and size only key the cache."""
+    csv_path = Path(path_str)
     delimiter = detect_delimiter(csv_path)
     metadata: dict[str, Any] = {}
-    albums: list[dict[str, Any]] = []
+    albums: list[list[str]] = []
 
     with open(csv_path, newline="", encoding="utf-8") as f:
-        lines = []
-        for line in f:
-            if line.startswith("#"):
-                # Parse metadata from comments
-                parse_metadata_comment(line, metadata)
-            else:
-                lines.append(line)
-
-        if not lines:
-            return metadata, albums
-
-        # Parse CSV from non-comment lines
-        reader = csv.DictReader(io.StringIO("".join(lines)), delimiter=delimiter)
-        for row in reader:
-            if row.get("album_id"):
-                albums.append(dict(row))
+        # Parse CSV straight from the file; comment lines are consumed
+        # as metadata on the way, so the data is never copied into a buffer
+        reader = csv.reader(_data_lines(f, metadata), delimiter=delimiter)
+        header = next(reader, None)
+        if header is None:
+            return metadata, {}, albums
+
+        columns = {name: i for i, name in enumerate(header)}
+        width = len(header)
+        album_id_col = columns.get("album_id")
+        if album_id_col is None:
+            return metadata, columns, albums
 
-    return metadata, albums
+        for row in reader:
+            if len(row) < width:
+                row.extend([""] * (width - len(row)))
+            if row[album_id_col]:
+                albums.append(row)
+
+    return metadata, columns, albums
+
+
+def _column(
+    columns: dict[str, int],
+    name: str,
+    default: str = "",
+) -> Callable[[list[str]], str]:
+    """Build an accessor for a column, returning default if the plan lacks it."""
+    index = columns.get(name)
+    if index is None:
+        return lambda row: default
+    return lambda row: row[index]
+
+
+def _data_lines(lines: Iterable[str], metadata: dict[str, Any]) -> Iterator[str]:
+    """Yield non-comment lines, parsing comment lines into metadata."""
+    for line in lines:
+        if line.startswith("#"):
+            # Parse metadata from comments
+            parse_metadata_comment(line, metadata)
+        else:
+            yield line
+
+
+def _parse_size_mb(value: str) -> float:
+    """Parse a "<number> MB" size value."""
+    if not value.endswith("MB"):
+        raise ValueError(f"Not a size in MB: {value}")
+    return float(value[:-2])
+
+
+# Metadata comment prefix -> (metadata key, value parser)
+_META_FIELDS: dict[str, tuple[str, Callable[[str], Any]]] = {
+    "Library": ("library_root", str),
+    "Albums": ("total_albums", int),
+    "Tracks": ("total_tracks", int),
+    "Size": ("total_size_mb", _parse_size_mb),
+    "Generated": ("created_at", str),
+    "Schema": ("schema_version", str),
+}
 
 
 def parse_metadata_comment(line: str, metadata: dict[str, Any]) -> None:
     """Parse metadata from comment line."""
     line = line.lstrip("#").strip()
 
-    # Match key: value patterns
-    patterns = [
-        (r"Library:\s*(.+)", "library_root"),
-        (r"Albums:\s*(\d+)", "total_albums"),
-        (r"Tracks:\s*(\d+)", "total_tracks"),
-        (r"Size:\s*([\d.]+)\s*MB", "total_size_mb"),
-        (r"Generated:\s*(.+)", "created_at"),
-        (r"Schema:\s*(.+)", "schema_version"),
-    ]
-
-    for pattern, key in patterns:
-        match = re.match(pattern, line)
-        if match:
-            value = match.group(1)
-            if key in ("total_albums", "total_tracks"):
-                metadata[key] = int(value)
-            elif key == "total_size_mb":
-                metadata[key] = float(value)
-            else:
-                metadata[key] = value
-            break
+    # Match "Key: value" headers
+    prefix, sep, value = line.partition(":")
+    field = _META_FIELDS.get(prefix) if sep else None
+    value = value.strip()
+    if field is None or not value:
+        return
+
+    key, parse = field
+    try:
+        metadata[key] = parse(value)
+    except ValueError:
+        pass  # Malformed value: leave the key unset
 
 
 def get_csv_decisions(csv_path: Path) -> list[dict[str, Any]]:
@@ -105,28 +158,28 @@ def get_csv_decisions(csv_path: Path) -> list[dict[str, Any]]:
         - aac_target_kbps
         - skip
     """
-    _, albums = read_csv_plan(csv_path)
+    _, columns, albums = read_csv_plan(csv_path)
+    album_id = _column(columns, "album_id")
+    user_action = _column(columns, "user_action")
+    aac_bitrate_kbps = _column(columns, "aac_bitrate_kbps")
+    skip = _column(columns, "skip")
 
     decisions = []
     for album in albums:
         # Parse aac_bitrate
         aac_bitrate = None
-        if album.get("aac_bitrate_kbps"):
+        if bitrate := aac_bitrate_kbps(album):
             try:
-                aac_bitrate = int(album["aac_bitrate_kbps"])
+                aac_bitrate = int(bitrate)
             except ValueError:
                 pass
 
-        # Parse skip flag
-        skip = album.get("skip", "").lower() in ("true", "yes", "1")
-
-        decision = {
-            "album_id": album.get("album_id", ""),
-            "user_action": album.get("user_action") or None,
+        decisions.append({
+            "album_id": album_id(album),
+            "user_action": user_action(album) or None,
             "aac_target_kbps": aac_bitrate,
-            "skip": skip,
-        }
-        decisions.append(decision)
+            "skip": skip(album).lower() in ("true", "yes", "1"),
+        })
 
     return decisions
 
@@ -141,7 +194,7 @@ def get_csv_library_root(csv_path: Path) -> Path | None:
     Returns:
         Library root path or None if not found
     """
-    metadata, _ = read_csv_plan(csv_path)
+    metadata, _, _ = read_csv_plan(csv_path)
     library_root = metadata.get("library_root")
 
     if library_root:
@@ -160,7 +213,12 @@ def get_csv_summary(csv_path: Path) -> dict[str, Any]:
     Returns:
         Summary dict with album/track counts, statuses, etc.
     """
-    metadata, albums = read_csv_plan(csv_path)
+    metadata, columns, albums = read_csv_plan(csv_path)
+    tag_status = _column(columns, "tag_status", "UNKNOWN")
+    art_status = _column(columns, "art_status", "UNKNOWN")
+    user_action = _column(columns, "user_action")
+    default_action = _column(columns, "default_action", "UNKNOWN")
+    skip = _column(columns, "skip")
 
     # Count by status
     tag_status_counts: dict[str, int] = {}
@@ -168,15 +226,15 @@ def get_csv_summary(csv_path: Path) -> dict[str, Any]:
     action_counts: dict[str, int] = {}
 
     for album in albums:
-        tag_status = album.get("tag_status", "UNKNOWN")
-        tag_status_counts[tag_status] = tag_status_counts.get(tag_status, 0) + 1
+        status = tag_status(album)
+        tag_status_counts[status] = tag_status_counts.get(status, 0) + 1
 
-        art_status = album.get("art_status", "UNKNOWN")
-        art_status_counts[art_status] = art_status_counts.get(art_status, 0) + 1
+        status = art_status(album)
+        art_status_counts[status] = art_status_counts.get(status, 0) + 1
 
         # Use user_action if set, otherwise default_action
-        action = album.get("user_action") or album.get("default_action", "UNKNOWN")
-        if album.get("skip", "").lower() in ("true", "yes", "1"):
+        action = user_action(album) or default_action(album)
+        if skip(album).lower() in ("true", "yes", "1"):
             action = "SKIP"
         action_counts[action] = action_counts.get(action, 0) + 1
 
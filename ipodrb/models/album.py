@@ -29,63 +29,69 @@ class AudioFormat(str, Enum):
     @classmethod
     def from_codec(cls, codec: str) -> "AudioFormat":
         """Map FFmpeg codec name to AudioFormat."""
-        codec_map = {
-            "flac": cls.FLAC,
-            "pcm_s16le": cls.WAV,
-            "pcm_s24le": cls.WAV,
-            "pcm_s32le": cls.WAV,
-            "pcm_f32le": cls.WAV,
-            "pcm_s16be": cls.AIFF,
-            "pcm_s24be": cls.AIFF,
-            "pcm_s32be": cls.AIFF,
-            "alac": cls.ALAC,
-            "aac": cls.AAC,
-            "mp3": cls.MP3,
-            "mp3float": cls.MP3,
-            "vorbis": cls.OGG,
-            "opus": cls.OPUS,
-            "wmav2": cls.WMA,
-            "wmav1": cls.WMA,
-            "wmalossless": cls.WMA,
-            "ape": cls.APE,
-            "wavpack": cls.WV,
-            "shorten": cls.SHN,
-        }
-        return codec_map.get(codec.lower(), cls.UNKNOWN)
+        return _CODEC_MAP.get(codec.lower(), cls.UNKNOWN)
 
     @classmethod
     def from_extension(cls, ext: str) -> "AudioFormat":
         """Map file extension to AudioFormat."""
-        ext = ext.lower().lstrip(".")
-        ext_map = {
-            "flac": cls.FLAC,
-            "wav": cls.WAV,
-            "aiff": cls.AIFF,
-            "aif": cls.AIFF,
-            "m4a": cls.M4A,
-            "mp3": cls.MP3,
-            "ogg": cls.OGG,
-            "oga": cls.OGG,
-            "opus": cls.OPUS,
-            "wma": cls.WMA,
-            "ape": cls.APE,
-            "wv": cls.WV,
-            "shn": cls.SHN,
-        }
-        return ext_map.get(ext, cls.UNKNOWN)
+        return _EXT_MAP.get(ext.lower().lstrip("."), cls.UNKNOWN)
 
     @property
     def is_lossless(self) -> bool:
         """Check if format is lossless."""
-        return self in {
-            AudioFormat.FLAC,
-            AudioFormat.WAV,
-            AudioFormat.AIFF,
-            AudioFormat.ALAC,
-            AudioFormat.APE,
-            AudioFormat.WV,
-            AudioFormat.SHN,
-        }
+        return self in LOSSLESS_FORMATS
+
+
+# FFmpeg codec name -> format, for AudioFormat.from_codec
+_CODEC_MAP: dict[str, AudioFormat] = {
+    "flac": AudioFormat.FLAC,
+    "pcm_s16le": AudioFormat.WAV,
+    "pcm_s24le": AudioFormat.WAV,
+    "pcm_s32le": AudioFormat.WAV,
+    "pcm_f32le": AudioFormat.WAV,
+    "pcm_s16be": AudioFormat.AIFF,
+    "pcm_s24be": AudioFormat.AIFF,
+    "pcm_s32be": AudioFormat.AIFF,
+    "alac": AudioFormat.ALAC,
+    "aac": AudioFormat.AAC,
+    "mp3": AudioFormat.MP3,
+    "mp3float": AudioFormat.MP3,
+    "vorbis": AudioFormat.OGG,
+    "opus": AudioFormat.OPUS,
+    "wmav2": AudioFormat.WMA,
+    "wmav1": AudioFormat.WMA,
+    "wmalossless": AudioFormat.WMA,
+    "ape": AudioFormat.APE,
+    "wavpack": AudioFormat.WV,
+    "shorten": AudioFormat.SHN,
+}
+
+# File extension (without dot) -> format, for AudioFormat.from_extension
+_EXT_MAP: dict[str, AudioFormat] = {
+    "flac": AudioFormat.FLAC,
+    "wav": AudioFormat.WAV,
+    "aiff": AudioFormat.AIFF,
+    "aif": AudioFormat.AIFF,
+    "m4a": AudioFormat.M4A,
+    "mp3": AudioFormat.MP3,
+    "ogg": AudioFormat.OGG,
+    "oga": AudioFormat.OGG,
+    "opus": AudioFormat.OPUS,
+    "wma": AudioFormat.WMA,
+    "ape": AudioFormat.APE,
+    "wv": AudioFormat.WV,
+    "shn": AudioFormat.SHN,
+}
+
+LOSSLESS_FORMATS = frozenset({
+    AudioFormat.FLAC,
+    AudioFormat.WAV,
+    AudioFormat.AIFF,
+    AudioFormat.ALAC,
+    AudioFormat.APE,
+    AudioFormat.WV,
+    AudioFormat.SHN,
+})
 
 
 class Track(BaseModel):
@@ -119,8 +125,6 @@ class Track(BaseModel):
     mtime: float
     size_bytes: int
 
-    model_config = {"arbitrary_types_allowed": True}
-
 
 class AlbumMetadata(BaseModel):
     """Aggregated album-level metadata."""
@@ -135,8 +139,6 @@ class AlbumMetadata(BaseModel):
     folder_art_candidates: list[Path] = Field(default_factory=list)
     folder_art_sizes: list[tuple[int, int]] = Field(default_factory=list)
 
-    model_config = {"arbitrary_types_allowed": True}
-
 
 class Album(BaseModel):
     """Album detection result with all tracks and metadata."""
@@ -156,8 +158,6 @@ class Album(BaseModel):
     art_status: ArtStatus = ArtStatus.RED
     status_notes: list[str] = Field(default_factory=list)
 
-    model_config = {"arbitrary_types_allowed": True}
-
     @property
     def track_count(self) -> int:
         """Number of tracks in album."""
@@ -166,7 +166,7 @@ class Album(BaseModel):
     @property
     def has_lossless(self) -> bool:
         """Check if album contains lossless sources."""
-        return any(fmt.is_lossless for fmt in self.source_formats)
+        return not self.source_formats.isdisjoint(LOSSLESS_FORMATS)
 
     @property
     def is_mp3_only(self) -> bool:
@@ -14,11 +14,15 @@ class ScanConfig(BaseModel):
     recreate: bool = False
     normalize_tags: bool = False
     threads: int = 32  # High for I/O-bound NAS scanning
+    use_processes: bool = True  # Analyze large libraries in processes, not threads
     show_tui: bool = True
 
     # Status thresholds
     art_min_size: int = 300  # Minimum 300x300 for GREEN
 
+    # Per-track scan cache, stored next to the plan file (None disables)
+    cache_db_name: str | None = ".ipodrb_scan_cache.db"
+
     # File patterns
     audio_extensions: set[str] = Field(
         default_factory=lambda: {
@@ -47,8 +51,6 @@ class ScanConfig(BaseModel):
         ]
     )
 
-    model_config = {"arbitrary_types_allowed": True}
-
 
 class ApplyConfig(BaseModel):
     """Configuration for apply command."""
@@ -60,6 +62,8 @@ class ApplyConfig(BaseModel):
     threads: int = Field(default=8)  # CPU-bound encoding
     show_tui: bool = True
     force: bool = False  # Rebuild even if cached
+    use_tempfile: bool = True  # Encode to a temp file and rename; False writes new outputs in place
+    hardlink_passthrough: bool = False  # Hardlink untagged MP3 outputs to their sources
 
     # Audio encoding defaults
     default_aac_bitrate: int = 256  # kbps
@@ -74,8 +78,6 @@ class ApplyConfig(BaseModel):
     # Cache settings
     cache_db_name: str = ".ipodrb_cache.db"
 
-    model_config = {"arbitrary_types_allowed": True}
-
 
 class Config(BaseSettings):
     """Global configuration from environment or defaults."""
@@ -87,6 +89,8 @@ class Config(BaseSettings):
     ffmpeg_path: str = "ffmpeg"
     ffprobe_path: str = "ffprobe"
     ffmpeg_timeout: int = 300  # 5 minutes per track
+    verify_in_process: bool = True  # Verify outputs with mutagen; FFprobe only as fallback
+    probe_in_process: bool = True  # Probe scanned tracks with mutagen; FFprobe only as fallback
 
     # Logging
     log_level: str = "INFO"
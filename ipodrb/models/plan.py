@@ -1,11 +1,24 @@
 """Build plan and action models."""
 
+import time
+from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
 from pathlib import Path
 
 from pydantic import BaseModel, Field
 
+# Offset from the monotonic clock to wall-clock time. CLOCK_MONOTONIC is
+# shared by all processes, so readings taken in workers convert correctly.
+_MONOTONIC_TO_WALL_NS = time.time_ns() - time.monotonic_ns()
+
+
+def _monotonic_to_datetime(ns: int | None) -> datetime | None:
+    """Convert a time.monotonic_ns() reading to a local datetime."""
+    if ns is None:
+        return None
+    return datetime.fromtimestamp((ns + _MONOTONIC_TO_WALL_NS) / 1e9)
+
 
 class Action(str, Enum):
     """Album conversion action types."""
@@ -31,7 +44,11 @@ class ResolvedAction(BaseModel):
     source: str = "default"  # "default" | "user_override"
 
 
-class TrackJob(BaseModel):
+# Per-track models are plain slotted dataclasses rather than pydantic models:
+# one of each is built per track, in the planner and in every worker, and
+# all of their inputs are already typed by the scanner and resolver.
+@dataclass(slots=True, kw_only=True)
+class TrackJob:
     """Individual track work unit for conversion pipeline."""
 
     album_id: str
@@ -42,6 +59,7 @@ class TrackJob(BaseModel):
     source_sample_rate: int
     source_bit_depth: int | None
     source_channels: int = 2
+    source_codec: str | None = None  # Lowercased source format, e.g. "flac", "alac"
 
     # Processing parameters
     action: Action
@@ -52,7 +70,7 @@ class TrackJob(BaseModel):
     apply_dither: bool = False
 
     # Metadata to write
-    tags: dict[str, str | int | None] = Field(default_factory=dict)
+    tags: dict[str, str | int | None] = field(default_factory=dict)
     artwork_source: Path | None = None  # Path to artwork file or None for embedded
 
     # Cache key components
@@ -60,10 +78,20 @@ class TrackJob(BaseModel):
     source_size: int
     settings_hash: str = ""
 
-    model_config = {"arbitrary_types_allowed": True}
+    # Derived path forms used on every cache lookup and conversion,
+    # computed once per job
+    source_path_str: str = field(init=False, repr=False, compare=False)
+    output_path_str: str = field(init=False, repr=False, compare=False)
+    output_dir: Path = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        self.source_path_str = str(self.source_path)
+        self.output_path_str = str(self.output_path)
+        self.output_dir = self.output_path.parent
 
 
-class TrackResult(BaseModel):
+@dataclass(slots=True, kw_only=True)
+class TrackResult:
     """Result of processing a single track."""
 
     source_path: Path
@@ -79,11 +107,19 @@ class TrackResult(BaseModel):
     output_size_bytes: int | None = None
     duration_seconds: float | None = None
 
-    # Timing
-    started_at: datetime | None = None
-    completed_at: datetime | None = None
+    # Timing (time.monotonic_ns() readings; see started_at/completed_at)
+    started_at_ns: int | None = None
+    completed_at_ns: int | None = None
 
-    model_config = {"arbitrary_types_allowed": True}
+    @property
+    def started_at(self) -> datetime | None:
+        """Wall-clock start time."""
+        return _monotonic_to_datetime(self.started_at_ns)
+
+    @property
+    def completed_at(self) -> datetime | None:
+        """Wall-clock completion time."""
+        return _monotonic_to_datetime(self.completed_at_ns)
 
 
 class BuildPlan(BaseModel):
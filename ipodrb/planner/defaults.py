@@ -1,6 +1,6 @@
 """Default action computation for albums."""
 
-from ipodrb.models.album import Album, AudioFormat
+from ipodrb.models.album import LOSSLESS_FORMATS, Album
 from ipodrb.models.plan import Action
 
 
@@ -30,19 +30,7 @@ def compute_default_action(album: Album, max_sample_rate: int = 48000) -> Action
         return Action.PASS_MP3
 
     # Check for lossless formats
-    lossless_formats = {
-        AudioFormat.FLAC,
-        AudioFormat.WAV,
-        AudioFormat.AIFF,
-        AudioFormat.ALAC,
-        AudioFormat.APE,
-        AudioFormat.WV,
-        AudioFormat.SHN,
-    }
-
-    has_lossless = bool(album.source_formats & lossless_formats)
-
-    if has_lossless:
+    if not album.source_formats.isdisjoint(LOSSLESS_FORMATS):
         # Check if hi-res: bit depth > 16 OR sample rate > max ceiling
         is_hi_res = False
         if album.max_bit_depth and album.max_bit_depth > 16:
@@ -1,6 +1,9 @@
 """Build plan resolution from XLSX decisions."""
 
 import hashlib
+import os
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
 from pathlib import Path
 
 from ipodrb.models.album import Album
@@ -9,6 +12,9 @@ from ipodrb.models.plan import Action, BuildPlan, ResolvedAction, TrackJob
 from ipodrb.planner.defaults import compute_default_action, compute_target_parameters
 from ipodrb.planner.validator import ValidationError, validate_action, validate_aac_bitrate
 
+# Below this many albums, planning is faster than starting worker processes
+PARALLEL_MIN_ALBUMS = 256
+
 
 def resolve_album_action(
     album: Album,
@@ -236,7 +242,7 @@ def compute_settings_hash(
         str(target_bd or 0),
         tool_version,
     ]
-    return hashlib.sha256(":".join(components).encode()).hexdigest()[:16]
+    return hashlib.sha256(":".join(components).encode(), usedforsecurity=False).hexdigest()[:16]
 
 
 def resolve_track_jobs(
@@ -330,6 +336,7 @@ def resolve_track_jobs(
             source_sample_rate=track.sample_rate,
             source_bit_depth=track.bit_depth,
             source_channels=track.channels,
+            source_codec=track.format.value.lower(),
             # Processing parameters
             action=action,
             target_codec=target_codec,
@@ -370,31 +377,59 @@ def resolve_build_plan(
     skipped_albums = []
     validation_errors = []
 
-    for album in albums:
-        # Get decision for this album
-        decision = decisions.get(album.album_id, {})
-
-        try:
-            # Resolve album action
-            resolved = resolve_album_action(album, decision, config)
-
-            if resolved.skip:
-                skipped_albums.append(album.album_id)
-                continue
+    album_decisions = [decisions.get(album.album_id, {}) for album in albums]
+    args = (albums, album_decisions, repeat(config), repeat(tool_version))
 
-            # Generate track jobs
-            jobs = resolve_track_jobs(album, resolved, config, tool_version)
+    if len(albums) < PARALLEL_MIN_ALBUMS or config.threads < 2:
+        outcomes = map(_resolve_single_album, *args)
+    else:
+        workers = min(config.threads, os.cpu_count() or 1)
+        chunksize = max(1, len(albums) // (4 * workers))
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            outcomes = list(executor.map(_resolve_single_album, *args, chunksize=chunksize))
+
+    for album, (jobs, skipped, error) in zip(albums, outcomes, strict=True):
+        if error is not None:
+            validation_errors.append(error)
+        elif skipped:
+            skipped_albums.append(album.album_id)
+        else:
             all_jobs.extend(jobs)
 
-        except ValidationError as e:
-            validation_errors.append({
-                "album_id": album.album_id,
-                "error_code": e.error_code,
-                "message": str(e),
-            })
-
     return BuildPlan(
         jobs=all_jobs,
         skipped_albums=skipped_albums,
         validation_errors=validation_errors,
     )
+
+
+def _resolve_single_album(
+    album: Album,
+    decision: dict,
+    config: ApplyConfig,
+    tool_version: str,
+) -> tuple[list[TrackJob], bool, dict | None]:
+    """
+    Resolve one album's decision into track jobs.
+
+    Module-level so it can run in a process pool worker.
+
+    Returns:
+        Tuple of (jobs, skipped, validation error dict or None)
+    """
+    try:
+        # Resolve album action
+        resolved = resolve_album_action(album, decision, config)
+
+        if resolved.skip:
+            return [], True, None
+
+        # Generate track jobs
+        return resolve_track_jobs(album, resolved, config, tool_version), False, None
+
+    except ValidationError as e:
+        return [], False, {
+            "album_id": album.album_id,
+            "error_code": e.error_code,
+            "message": str(e),
+        }
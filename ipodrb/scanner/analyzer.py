@@ -1,16 +1,49 @@
-"""Track and album analysis using FFprobe."""
+"""Track and album analysis using mutagen and FFprobe."""
 
 import hashlib
 import json
+import os
 import subprocess
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
+from mutagen import FileType
+from mutagen.flac import StreamInfo as FLACInfo
+from mutagen.mp3 import MPEGInfo
+from mutagen.mp4 import MP4Info
+from mutagen.oggopus import OggOpusInfo
+from mutagen.oggvorbis import OggVorbisInfo
+
 from ipodrb.models.album import Album, AlbumMetadata, AudioFormat, Track
 from ipodrb.models.config import Config, ScanConfig
 from ipodrb.models.status import ArtStatus, TagStatus
-from ipodrb.scanner.metadata import extract_metadata, get_image_dimensions
+from ipodrb.scanner.cache import ScanCache
+from ipodrb.scanner.metadata import extract_metadata, get_image_dimensions, open_audio
 from ipodrb.scanner.walker import find_artwork_candidates
 
+# FFprobe runs once per track under the album worker pool, so keep each
+# process single-threaded, and stop input analysis once the first 1 MB /
+# 1 s has been read: stream parameters are in the headers
+_PROBE_FLAGS = ["-threads", "1", "-probesize", "1M", "-analyzeduration", "1M"]
+
+# Seconds allowed for each FFprobe run
+PROBE_TIMEOUT = 30
+
+# FFprobe processes started together by _probe_with_ffprobe_batch
+PROBE_BATCH_PROCESSES = 8
+
+# Output sample rate of every Opus decoder, as FFprobe reports it
+OPUS_SAMPLE_RATE = 48000
+
+# Threads reading folder artwork headers; the pool is created lazily and
+# shared by all album workers in a process
+ART_READ_THREADS = 4
+
+_ART_POOL: ThreadPoolExecutor | None = None
+_ART_POOL_LOCK = threading.Lock()
+
 
 class ProbeError(Exception):
     """Error during FFprobe analysis."""
@@ -20,7 +53,11 @@ class ProbeError(Exception):
 
 def probe_track(path: Path, config: Config | None = None) -> dict:
     """
-    Run FFprobe to extract technical audio data.
+    Extract technical audio data.
+
+    Unless disabled in config, the container headers are read in-process
+    with mutagen; FFprobe is spawned only for formats mutagen cannot
+    describe exactly.
 
     Args:
         path: Path to audio file
@@ -32,10 +69,155 @@ def probe_track(path: Path, config: Config | None = None) -> dict:
     Raises:
         ProbeError: If FFprobe fails
     """
-    ffprobe_path = config.ffprobe_path if config else "ffprobe"
+    if config is None or config.probe_in_process:
+        probe_data = _probe_in_process(open_audio(path))
+        if probe_data is not None:
+            return probe_data
+
+    return _probe_with_ffprobe(path, config)
+
+
+def _probe_in_process(audio: FileType | None) -> dict | None:
+    """
+    Read technical audio data from container headers parsed by mutagen.
+
+    Codec names and bit depths match what FFprobe reports.
+
+    Args:
+        audio: File opened with open_audio (None if that failed)
+
+    Returns:
+        Probe dict, or None if mutagen cannot read or identify the file
+    """
+    if audio is None:
+        return None
+
+    info = audio.info
+    bit_depth = None
+    if isinstance(info, FLACInfo):
+        codec = "flac"
+        bit_depth = info.bits_per_sample
+    elif isinstance(info, MPEGInfo) and info.layer == 3:
+        codec = "mp3"
+    elif isinstance(info, MP4Info) and info.codec == "alac":
+        codec = "alac"
+        bit_depth = info.bits_per_sample
+    elif isinstance(info, MP4Info) and info.codec.startswith("mp4a"):
+        codec = "aac"
+    elif isinstance(info, OggVorbisInfo):
+        codec = "vorbis"
+    elif isinstance(info, OggOpusInfo):
+        codec = "opus"
+    else:
+        return None
+
+    try:
+        return {
+            "codec": codec,
+            # Opus always decodes at 48 kHz (mutagen has no sample_rate for it)
+            "sample_rate": OPUS_SAMPLE_RATE if codec == "opus" else info.sample_rate,
+            "bit_depth": bit_depth,
+            "channels": info.channels,
+            "duration": info.length,
+        }
+    except AttributeError:
+        # Incomplete stream info; let FFprobe describe the file
+        return None
+
+
+def probe_tracks(
+    paths: list[Path],
+    config: Config | None = None,
+) -> list[dict | ProbeError]:
+    """
+    Extract technical audio data for several tracks, e.g. an album.
+
+    Files are probed in-process where possible (see probe_track); the
+    rest are probed by _probe_with_ffprobe_batch.
+
+    Args:
+        paths: Paths to audio files
+        config: Optional config for FFprobe path
 
-    cmd = [
+    Returns:
+        Probe dict for each path, or the ProbeError raised for it
+    """
+    results: list[dict | ProbeError | None] = [None] * len(paths)
+    pending = []
+    for i, path in enumerate(paths):
+        if config is None or config.probe_in_process:
+            results[i] = _probe_in_process(open_audio(path))
+        if results[i] is None:
+            pending.append(i)
+
+    probes = _probe_with_ffprobe_batch([paths[i] for i in pending], config)
+    for i, probe_data in zip(pending, probes, strict=True):
+        results[i] = probe_data
+
+    return results
+
+
+def _probe_with_ffprobe_batch(
+    paths: list[Path],
+    config: Config | None = None,
+) -> list[dict | ProbeError]:
+    """
+    Probe several tracks with FFprobe.
+
+    The FFprobe processes are started together, up to
+    PROBE_BATCH_PROCESSES at a time, and then collected, so an album pays
+    for process startup about once instead of once per file. FFprobe
+    takes a single input per run (and the concat demuxer would merge the
+    streams), so the processes cannot be combined into one.
+
+    Args:
+        paths: Paths to audio files
+        config: Optional config for FFprobe path
+
+    Returns:
+        Probe dict for each path, or the ProbeError raised for it
+    """
+    results: list[dict | ProbeError | None] = [None] * len(paths)
+    ffprobe_path = config.ffprobe_path if config else "ffprobe"
+    for batch_start in range(0, len(paths), PROBE_BATCH_PROCESSES):
+        batch = range(batch_start, min(batch_start + PROBE_BATCH_PROCESSES, len(paths)))
+        procs = []
+        for i in batch:
+            try:
+                procs.append((i, subprocess.Popen(
+                    _ffprobe_command(paths[i], ffprobe_path),
+                    stdout=subprocess.PIPE,
+                    stderr=subprocess.PIPE,
+                )))
+            except FileNotFoundError:
+                results[i] = ProbeError(f"FFprobe not found at {ffprobe_path}")
+
+        deadline = time.monotonic() + PROBE_TIMEOUT
+        for i, proc in procs:
+            try:
+                stdout, stderr = proc.communicate(
+                    timeout=max(0.0, deadline - time.monotonic())
+                )
+            except subprocess.TimeoutExpired:
+                proc.kill()
+                proc.communicate()
+                results[i] = ProbeError(f"FFprobe timed out for {paths[i]}")
+                continue
+            try:
+                results[i] = _parse_ffprobe_output(
+                    paths[i], proc.returncode, stdout, stderr
+                )
+            except ProbeError as e:
+                results[i] = e
+
+    return results
+
+
+def _ffprobe_command(path: Path, ffprobe_path: str) -> list[str]:
+    """Build the FFprobe command for a track."""
+    return [
         ffprobe_path,
+        *_PROBE_FLAGS,
         "-v",
         "quiet",
         "-print_format",
@@ -45,23 +227,39 @@ def probe_track(path: Path, config: Config | None = None) -> dict:
         str(path),
     ]
 
+
+def _probe_with_ffprobe(path: Path, config: Config | None = None) -> dict:
+    """Run FFprobe to extract technical audio data (see probe_track)."""
+    ffprobe_path = config.ffprobe_path if config else "ffprobe"
+
     try:
         result = subprocess.run(
-            cmd,
+            _ffprobe_command(path, ffprobe_path),
             capture_output=True,
-            text=True,
-            timeout=30,
+            timeout=PROBE_TIMEOUT,
         )
     except subprocess.TimeoutExpired as e:
         raise ProbeError(f"FFprobe timed out for {path}") from e
     except FileNotFoundError as e:
         raise ProbeError(f"FFprobe not found at {ffprobe_path}") from e
 
-    if result.returncode != 0:
-        raise ProbeError(f"FFprobe failed for {path}: {result.stderr}")
+    return _parse_ffprobe_output(path, result.returncode, result.stdout, result.stderr)
+
+
+def _parse_ffprobe_output(
+    path: Path,
+    returncode: int,
+    stdout: bytes,
+    stderr: bytes,
+) -> dict:
+    """Turn an FFprobe run's JSON output into a probe dict, raising ProbeError."""
+    if returncode != 0:
+        raise ProbeError(
+            f"FFprobe failed for {path}: {stderr.decode('utf-8', errors='replace')}"
+        )
 
     try:
-        data = json.loads(result.stdout)
+        data = json.loads(stdout)
     except json.JSONDecodeError as e:
         raise ProbeError(f"Invalid FFprobe output for {path}") from e
 
@@ -104,6 +302,7 @@ def probe_track(path: Path, config: Config | None = None) -> dict:
 def analyze_track(
     path: Path,
     config: Config | None = None,
+    cache: ScanCache | None = None,
 ) -> Track:
     """
     Fully analyze a single track: probe + metadata extraction.
@@ -111,24 +310,106 @@ def analyze_track(
     Args:
         path: Path to audio file
         config: Optional config
+        cache: Optional scan cache; files unchanged since they were cached
+            are not probed or read again
 
     Returns:
         Track model with all data populated
+
+    Raises:
+        ProbeError: If the file cannot be probed
+    """
+    track = analyze_tracks([path], config, cache)[0]
+    if isinstance(track, ProbeError):
+        raise track
+    return track
+
+
+def analyze_tracks(
+    paths: list[Path],
+    config: Config | None = None,
+    cache: ScanCache | None = None,
+    stats: list[os.stat_result] | None = None,
+) -> list[Track | ProbeError]:
+    """
+    Fully analyze several tracks, probing the uncached ones as a batch.
+
+    Args:
+        paths: Paths to audio files
+        config: Optional config
+        cache: Optional scan cache; files unchanged since they were cached
+            are not probed or read again
+        stats: Stat results for paths, if the caller already has them
+
+    Returns:
+        Track for each path, or the ProbeError raised while probing it
     """
     # Get file stats for caching
-    stat = path.stat()
+    if stats is None:
+        stats = [path.stat() for path in paths]
+    path_strs = [str(path) for path in paths]
+
+    cached: list[dict | None] = [None] * len(paths)
+    if cache is not None:
+        cached = [
+            cache.get(path_str, stat.st_mtime_ns, stat.st_size)
+            for path_str, stat in zip(path_strs, stats, strict=True)
+        ]
+
+    errors: dict[int, ProbeError] = {}
+
+    def finish(i: int, probe_data: dict | ProbeError, metadata: dict | ProbeError) -> None:
+        if isinstance(probe_data, ProbeError):
+            errors[i] = probe_data
+        elif isinstance(metadata, ProbeError):
+            errors[i] = metadata
+        else:
+            cached[i] = {"probe": probe_data, "metadata": metadata}
+            if cache is not None:
+                cache.put(path_strs[i], stats[i].st_mtime_ns, stats[i].st_size, cached[i])
+
+    # Probe and read tags for everything not cached. Each file is opened
+    # with mutagen once, for both, and dropped before the next is opened,
+    # since the parsed file holds any embedded artwork
+    in_process = config is None or config.probe_in_process
+    fallback: dict[int, dict | ProbeError] = {}
+    for i, entry in enumerate(cached):
+        if entry is not None:
+            continue
+        audio = open_audio(paths[i])
+        probe_data = _probe_in_process(audio) if in_process else None
+
+        # Extract metadata with mutagen; a file with unreadable tags is
+        # skipped like an unprobeable one instead of failing the album
+        try:
+            metadata = extract_metadata(paths[i], audio)
+        except Exception as e:
+            metadata = ProbeError(f"Cannot read tags from {paths[i]}: {e}")
+        audio = None
+
+        if probe_data is None:
+            fallback[i] = metadata
+        else:
+            finish(i, probe_data, metadata)
+
+    # Files mutagen cannot describe are probed by FFprobe as one batch
+    probes = _probe_with_ffprobe_batch([paths[i] for i in fallback], config)
+    for (i, metadata), probe_data in zip(fallback.items(), probes, strict=True):
+        finish(i, probe_data, metadata)
+
+    return [
+        errors[i] if entry is None else _build_track(path, stat, entry["probe"], entry["metadata"])
+        for i, (path, stat, entry) in enumerate(zip(paths, stats, cached, strict=True))
+    ]
 
-    # Probe technical data
-    probe_data = probe_track(path, config)
 
+def _build_track(path: Path, stat: os.stat_result, probe_data: dict, metadata: dict) -> Track:
+    """Assemble a Track from its file stat, probe data and tag metadata."""
     # Determine format from codec
     audio_format = AudioFormat.from_codec(probe_data["codec"])
     if audio_format == AudioFormat.UNKNOWN:
         audio_format = AudioFormat.from_extension(path.suffix)
 
-    # Extract metadata with mutagen
-    metadata = extract_metadata(path)
-
     return Track(
         path=path,
         format=audio_format,
@@ -165,8 +446,9 @@ def generate_album_id(library_root: Path, album_path: Path) -> str:
     except ValueError:
         rel_path = album_path
 
+    # Not a security use: lets OpenSSL skip FIPS checks on restricted builds
     hash_input = str(rel_path).encode("utf-8")
-    return hashlib.sha256(hash_input).hexdigest()[:16]
+    return hashlib.sha256(hash_input, usedforsecurity=False).hexdigest()[:16]
 
 
 def compute_tag_status(tracks: list[Track]) -> tuple[TagStatus, list[str]]:
@@ -181,37 +463,48 @@ def compute_tag_status(tracks: list[Track]) -> tuple[TagStatus, list[str]]:
     if not tracks:
         return TagStatus.RED, ["No tracks found"]
 
-    # Check for required tags
-    missing_title = [t for t in tracks if not t.title]
-    missing_album = [t for t in tracks if not t.album]
-    missing_artist = [t for t in tracks if not t.artist]
+    # Collect everything the checks need in one pass
+    missing_title = missing_album = missing_artist = 0
+    albums = set()
+    track_nums = []
+    years = set()
+    for t in tracks:
+        if not t.title:
+            missing_title += 1
+        if t.album:
+            albums.add(t.album)
+        else:
+            missing_album += 1
+        if not t.artist:
+            missing_artist += 1
+        if t.track_number:
+            track_nums.append(t.track_number)
+        if t.year:
+            years.add(t.year)
 
+    # Check for required tags
     if missing_title:
-        notes.append(f"{len(missing_title)} tracks missing title")
+        notes.append(f"{missing_title} tracks missing title")
     if missing_album:
-        notes.append(f"{len(missing_album)} tracks missing album")
+        notes.append(f"{missing_album} tracks missing album")
     if missing_artist:
-        notes.append(f"{len(missing_artist)} tracks missing artist")
+        notes.append(f"{missing_artist} tracks missing artist")
 
     # Critical missing = RED
     if missing_title or missing_album:
         return TagStatus.RED, notes
 
     # Check consistency
-    albums = {t.album for t in tracks if t.album}
     if len(albums) > 1:
         notes.append(f"Inconsistent album names: {albums}")
         return TagStatus.RED, notes
 
     # Check track numbering
-    track_nums = [t.track_number for t in tracks if t.track_number]
-    if track_nums:
-        if len(track_nums) != len(set(track_nums)):
-            notes.append("Duplicate track numbers")
-            return TagStatus.RED, notes
+    if len(track_nums) != len(set(track_nums)):
+        notes.append("Duplicate track numbers")
+        return TagStatus.RED, notes
 
     # Check for year
-    years = {t.year for t in tracks if t.year}
     if not years:
         notes.append("Missing year")
         return TagStatus.YELLOW, notes
@@ -244,14 +537,13 @@ def compute_art_status(
     """
     notes = []
 
-    # Check embedded art
-    tracks_with_art = [t for t in tracks if t.has_embedded_art]
-    has_embedded = len(tracks_with_art) > 0
-
-    # Check embedded art size
+    # Check embedded art and its size, stopping at the first track whose
+    # art is large enough
+    has_embedded = False
     embedded_meets_threshold = False
-    if tracks_with_art:
-        for track in tracks_with_art:
+    for track in tracks:
+        if track.has_embedded_art:
+            has_embedded = True
             if track.embedded_art_width and track.embedded_art_height:
                 if (
                     track.embedded_art_width >= min_size
@@ -289,12 +581,68 @@ def compute_art_status(
     return ArtStatus.YELLOW, notes
 
 
+def _most_common(counts: dict) -> str | int | None:
+    """Return the most counted key (the first seen on ties), or None if empty."""
+    if not counts:
+        return None
+    return max(counts, key=counts.__getitem__)
+
+
+def _get_art_pool() -> ThreadPoolExecutor:
+    """Return this process's artwork reader pool, creating it on first use."""
+    global _ART_POOL
+    with _ART_POOL_LOCK:
+        if _ART_POOL is None:
+            _ART_POOL = ThreadPoolExecutor(
+                max_workers=ART_READ_THREADS, thread_name_prefix="ipodrb-art"
+            )
+        return _ART_POOL
+
+
+def _folder_art_size(path: Path) -> tuple[int, int] | None:
+    """Read a folder artwork file's dimensions, or None if unreadable."""
+    try:
+        return get_image_dimensions(path)
+    except Exception:
+        return None
+
+
+def _album_fingerprint(
+    library_root: Path,
+    album_path: Path,
+    audio_files: list[Path],
+    stats: list[os.stat_result],
+    folder_art: list[Path],
+    scan_config: ScanConfig,
+) -> str | None:
+    """
+    Hash everything an album's analysis depends on.
+
+    Covers the album location, every audio file's path, mtime and size,
+    the folder artwork files, and the scan settings that affect the
+    result. Returns None if an artwork file cannot be stat'ed.
+    """
+    h = hashlib.blake2b(digest_size=16)
+    h.update(f"{library_root}\0{album_path}\0{scan_config.art_min_size}\0".encode())
+    for path, stat in zip(audio_files, stats, strict=True):
+        h.update(f"{path}\0{stat.st_mtime_ns}\0{stat.st_size}\0".encode())
+    for art_path in folder_art:
+        try:
+            stat = art_path.stat()
+        except OSError:
+            return None
+        h.update(f"{art_path}\0{stat.st_mtime_ns}\0{stat.st_size}\0".encode())
+    return h.hexdigest()
+
+
 def analyze_album(
     library_root: Path,
     album_path: Path,
     audio_files: list[Path],
     scan_config: ScanConfig,
     config: Config | None = None,
+    cache: ScanCache | None = None,
+    file_names: list[str] | None = None,
 ) -> Album:
     """
     Fully analyze an album directory.
@@ -305,19 +653,35 @@ def analyze_album(
         audio_files: List of audio files in directory
         scan_config: Scan configuration
         config: Optional global config
+        cache: Optional scan cache; an album whose files, artwork and scan
+            settings are unchanged is returned from it without analysis
+        file_names: Directory listing from walk_library, reused to find
+            folder artwork without listing the directory again
 
     Returns:
         Album model with all data populated
     """
-    # Analyze all tracks
-    tracks = []
-    for audio_file in audio_files:
-        try:
-            track = analyze_track(audio_file, config)
-            tracks.append(track)
-        except ProbeError:
-            # Skip files that can't be probed
-            continue
+    stats = [path.stat() for path in audio_files]
+
+    # Find folder artwork
+    folder_art = find_artwork_candidates(album_path, scan_config.art_patterns, file_names)
+
+    fingerprint = None
+    if cache is not None:
+        fingerprint = _album_fingerprint(
+            library_root, album_path, audio_files, stats, folder_art, scan_config
+        )
+        if fingerprint is not None:
+            album = cache.get_album(str(album_path), fingerprint)
+            if album is not None:
+                return album
+
+    # Analyze all tracks, skipping files that can't be probed
+    tracks = [
+        track
+        for track in analyze_tracks(audio_files, config, cache, stats)
+        if not isinstance(track, ProbeError)
+    ]
 
     if not tracks:
         # Return empty album if no valid tracks
@@ -331,56 +695,57 @@ def analyze_album(
             status_notes=["No valid audio files found"],
         )
 
-    # Aggregate metadata
-    # Pick most common values for artist/album
-    artists = [t.artist for t in tracks if t.artist]
-    albums = [t.album for t in tracks if t.album]
-    album_artists = [t.album_artist for t in tracks if t.album_artist]
-    years = [t.year for t in tracks if t.year]
-    compilations = [t.compilation for t in tracks]
-
-    def most_common(items: list) -> str | int | None:
-        if not items:
-            return None
-        from collections import Counter
-
-        counter = Counter(items)
-        return counter.most_common(1)[0][0]
-
-    # Find folder artwork
-    folder_art = find_artwork_candidates(album_path, scan_config.art_patterns)
-    folder_art_sizes = []
-    for art_path in folder_art:
-        try:
-            size = get_image_dimensions(art_path)
-            if size:
-                folder_art_sizes.append(size)
-        except Exception:
-            pass
+    # Aggregate metadata and the technical rollup in one pass over the tracks
+    artist_counts: dict[str, int] = {}
+    album_counts: dict[str, int] = {}
+    album_artist_counts: dict[str, int] = {}
+    year_counts: dict[int, int] = {}
+    is_compilation = False
+    max_sr = tracks[0].sample_rate
+    max_bd = None
+    formats = set()
+    for t in tracks:
+        if t.artist:
+            artist_counts[t.artist] = artist_counts.get(t.artist, 0) + 1
+        if t.album:
+            album_counts[t.album] = album_counts.get(t.album, 0) + 1
+        if t.album_artist:
+            album_artist_counts[t.album_artist] = album_artist_counts.get(t.album_artist, 0) + 1
+        if t.year:
+            year_counts[t.year] = year_counts.get(t.year, 0) + 1
+        if t.compilation:
+            is_compilation = True
+        if t.sample_rate > max_sr:
+            max_sr = t.sample_rate
+        if t.bit_depth and (max_bd is None or t.bit_depth > max_bd):
+            max_bd = t.bit_depth
+        formats.add(t.format)
+
+    # Read several candidates' headers concurrently
+    if len(folder_art) > 1:
+        sizes = _get_art_pool().map(_folder_art_size, folder_art)
+    else:
+        sizes = map(_folder_art_size, folder_art)
+    folder_art_sizes = [size for size in sizes if size]
 
+    # Pick most common values for artist/album
     metadata = AlbumMetadata(
-        artist=most_common(artists) or "",
-        album=most_common(albums) or "",
-        album_artist=most_common(album_artists),
-        year=most_common(years),
-        is_compilation=any(compilations),
+        artist=_most_common(artist_counts) or "",
+        album=_most_common(album_counts) or "",
+        album_artist=_most_common(album_artist_counts),
+        year=_most_common(year_counts),
+        is_compilation=is_compilation,
         folder_art_candidates=folder_art,
         folder_art_sizes=folder_art_sizes,
     )
 
-    # Compute technical rollup
-    max_sr = max(t.sample_rate for t in tracks)
-    bit_depths = [t.bit_depth for t in tracks if t.bit_depth]
-    max_bd = max(bit_depths) if bit_depths else None
-    formats = {t.format for t in tracks}
-
     # Compute status
     tag_status, tag_notes = compute_tag_status(tracks)
     art_status, art_notes = compute_art_status(
         tracks, folder_art, folder_art_sizes, scan_config.art_min_size
     )
 
-    return Album(
+    album = Album(
         album_id=generate_album_id(library_root, album_path),
         source_path=album_path,
         tracks=tracks,
@@ -392,3 +757,8 @@ def analyze_album(
         art_status=art_status,
         status_notes=tag_notes + art_notes,
     )
+
+    if fingerprint is not None:
+        cache.put_album(str(album_path), fingerprint, album)
+
+    return album
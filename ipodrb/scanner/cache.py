@@ -0,0 +1,220 @@
+"""SQLite-based cache of per-track and per-album scan results."""
+
+import json
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Any
+
+from ipodrb.models.album import Album
+
+# Bump when the shape of the cached probe/metadata dicts or of Album
+# changes; rows written by another version are ignored and overwritten
+SCAN_CACHE_VERSION = 2
+
+
+class ScanCache:
+    """
+    SQLite-based cache of track probe/metadata results and analyzed albums.
+
+    Entries are keyed by source path and are only valid while the file's
+    mtime (in nanoseconds) and size are unchanged, so rescanning an
+    unchanged library costs one stat per track instead of a full probe
+    and tag read.
+
+    Whole albums are keyed by directory path and only valid while the
+    fingerprint of their files' paths, mtimes and sizes (see
+    analyzer._album_fingerprint) is unchanged, so an unchanged album is
+    returned without per-track lookups or artwork reads. Each album keeps
+    a single row, replaced whenever it is re-analyzed.
+
+    Each thread gets its own connection, so scanner worker threads can
+    share one instance. Only the database path is pickled, so instances
+    can also be handed to worker processes.
+    """
+
+    SCHEMA = """
+    CREATE TABLE IF NOT EXISTS tracks (
+        path TEXT PRIMARY KEY,
+        mtime_ns INTEGER NOT NULL,
+        size INTEGER NOT NULL,
+        version INTEGER NOT NULL,
+        data TEXT NOT NULL
+    );
+
+    CREATE TABLE IF NOT EXISTS album_scans (
+        path TEXT PRIMARY KEY,
+        fingerprint TEXT NOT NULL,
+        version INTEGER NOT NULL,
+        data TEXT NOT NULL
+    );
+
+    -- Earlier layout keyed by fingerprint, which kept every old version
+    DROP TABLE IF EXISTS albums;
+    """
+
+    GET_SQL = """
+    SELECT data FROM tracks
+    WHERE path = ? AND mtime_ns = ? AND size = ? AND version = ?
+    """
+
+    PUT_SQL = """
+    INSERT OR REPLACE INTO tracks (path, mtime_ns, size, version, data)
+    VALUES (?, ?, ?, ?, ?)
+    """
+
+    GET_ALBUM_SQL = """
+    SELECT data FROM album_scans
+    WHERE path = ? AND fingerprint = ? AND version = ?
+    """
+
+    PUT_ALBUM_SQL = """
+    INSERT OR REPLACE INTO album_scans (path, fingerprint, version, data)
+    VALUES (?, ?, ?, ?)
+    """
+
+    # Database-wide settings (persisted in the file once set)
+    DB_PRAGMAS = """
+    PRAGMA journal_mode=WAL;
+    """
+
+    # Per-connection settings (must be applied on every open)
+    CONN_PRAGMAS = """
+    PRAGMA synchronous=NORMAL;
+    PRAGMA temp_store=MEMORY;
+    """
+
+    def __init__(self, db_path: Path):
+        """
+        Initialize scan cache.
+
+        Args:
+            db_path: Path to SQLite database file
+        """
+        self.db_path = Path(db_path)
+        self._local = threading.local()
+        self._conns: list[sqlite3.Connection] = []
+        self._lock = threading.Lock()
+
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        conn = self._get_conn()
+        conn.executescript(self.DB_PRAGMAS)
+        conn.executescript(self.SCHEMA)
+
+    def __getstate__(self) -> dict[str, Any]:
+        return {"db_path": self.db_path}
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        self.db_path = state["db_path"]
+        self._local = threading.local()
+        self._conns = []
+        self._lock = threading.Lock()
+
+    def _get_conn(self) -> sqlite3.Connection:
+        """Return this thread's connection, opening it on first use."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(
+                self.db_path,
+                timeout=30.0,  # Other scanner threads may hold the write lock
+                isolation_level=None,  # Autocommit
+                check_same_thread=False,  # Only so close() can close it
+            )
+            conn.executescript(self.CONN_PRAGMAS)
+            self._local.conn = conn
+            with self._lock:
+                self._conns.append(conn)
+        return conn
+
+    def get(self, path: str, mtime_ns: int, size: int) -> dict[str, Any] | None:
+        """
+        Look up cached scan data for a file.
+
+        Args:
+            path: Source file path
+            mtime_ns: Current file mtime in nanoseconds
+            size: Current file size in bytes
+
+        Returns:
+            Cached data dict, or None if missing or stale
+        """
+        try:
+            row = self._get_conn().execute(
+                self.GET_SQL, (path, mtime_ns, size, SCAN_CACHE_VERSION)
+            ).fetchone()
+        except sqlite3.Error:
+            return None
+
+        if row is None:
+            return None
+        return json.loads(row[0])
+
+    def put(self, path: str, mtime_ns: int, size: int, data: dict[str, Any]) -> None:
+        """
+        Store scan data for a file.
+
+        The cache is only an accelerator, so database errors are ignored.
+
+        Args:
+            path: Source file path
+            mtime_ns: File mtime in nanoseconds when data was read
+            size: File size in bytes when data was read
+            data: JSON-serializable scan data
+        """
+        try:
+            self._get_conn().execute(
+                self.PUT_SQL,
+                (path, mtime_ns, size, SCAN_CACHE_VERSION, json.dumps(data)),
+            )
+        except sqlite3.Error:
+            pass
+
+    def get_album(self, path: str, fingerprint: str) -> Album | None:
+        """
+        Look up a cached album.
+
+        Args:
+            path: Album directory path
+            fingerprint: Current album fingerprint
+
+        Returns:
+            Cached Album, or None if missing, stale or unreadable
+        """
+        try:
+            row = self._get_conn().execute(
+                self.GET_ALBUM_SQL, (path, fingerprint, SCAN_CACHE_VERSION)
+            ).fetchone()
+        except sqlite3.Error:
+            return None
+
+        if row is None:
+            return None
+        try:
+            return Album.model_validate_json(row[0])
+        except ValueError:
+            return None
+
+    def put_album(self, path: str, fingerprint: str, album: Album) -> None:
+        """
+        Store an analyzed album, replacing any earlier entry for its path.
+
+        Args:
+            path: Album directory path
+            fingerprint: Album fingerprint when it was analyzed
+            album: Analyzed album
+        """
+        try:
+            self._get_conn().execute(
+                self.PUT_ALBUM_SQL,
+                (path, fingerprint, SCAN_CACHE_VERSION, album.model_dump_json()),
+            )
+        except sqlite3.Error:
+            pass
+
+    def close(self) -> None:
+        """Close every thread's connection; call once all users are done."""
+        with self._lock:
+            conns, self._conns = self._conns, []
+        for conn in conns:
+            conn.close()
+        self._local = threading.local()
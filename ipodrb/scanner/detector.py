@@ -1,14 +1,42 @@
 """Album detection and library scanning orchestration."""
 
-from concurrent.futures import ThreadPoolExecutor, as_completed
+import logging
+import os
+import time
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Executor,
+    Future,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    wait,
+)
+from concurrent.futures.process import BrokenProcessPool
+from functools import partial
+from itertools import chain, islice
 from pathlib import Path
 from typing import Callable
 
 from ipodrb.models.album import Album
 from ipodrb.models.config import Config, ScanConfig
 from ipodrb.scanner.analyzer import analyze_album
+from ipodrb.scanner.cache import ScanCache
 from ipodrb.scanner.walker import walk_library
 
+# Below this many albums, process startup costs more than it saves
+PROCESS_MIN_ALBUMS = 64
+
+# Albums queued per worker before the walker waits for results
+PENDING_ALBUMS_PER_WORKER = 4
+
+# Minimum seconds between progress callbacks (~30 updates per second)
+PROGRESS_INTERVAL = 1 / 30
+
+logger = logging.getLogger(__name__)
+
+# A walked album: (album path, audio files, all file names in the folder)
+_AlbumItem = tuple[Path, list[Path], list[str]]
+
 
 def detect_albums(
     library_root: Path,
@@ -19,7 +47,10 @@ def detect_albums(
     """
     Scan library and detect all albums.
 
-    Uses parallel processing for I/O-bound operations.
+    Albums are analyzed in parallel while the library is still being
+    walked: in worker processes for large libraries (unless
+    scan_config.use_processes is False), otherwise in threads. The
+    progress total is the number of albums found so far.
 
     Args:
         library_root: Root directory of music library
@@ -30,48 +61,126 @@ def detect_albums(
     Returns:
         List of detected albums
     """
-    # First pass: collect all album directories
-    album_dirs = []
-    for album_path, audio_files in walk_library(library_root, scan_config.audio_extensions):
-        album_dirs.append((album_path, audio_files))
+    walker = walk_library(library_root, scan_config.audio_extensions)
+
+    # Walk far enough ahead to tell whether worker processes pay off
+    head = list(islice(walker, PROCESS_MIN_ALBUMS))
 
-    total = len(album_dirs)
     if progress_callback:
-        progress_callback(0, total, "Scanning...")
+        progress_callback(0, len(head), "Scanning...")
 
     albums = []
 
-    # Process albums in parallel
-    with ThreadPoolExecutor(max_workers=scan_config.threads) as executor:
-        # Submit all analysis jobs
-        futures = {
-            executor.submit(
-                analyze_album,
-                library_root,
-                album_path,
-                audio_files,
-                scan_config,
-                config,
-            ): album_path
-            for album_path, audio_files in album_dirs
-        }
-
-        # Collect results
-        completed = 0
-        for future in as_completed(futures):
-            album_path = futures[future]
-            completed += 1
+    # Per-track results from earlier scans, kept next to the plan file
+    cache = None
+    if scan_config.cache_db_name:
+        cache = ScanCache(scan_config.xlsx_path.parent / scan_config.cache_db_name)
+
+    # Probe parsing, tag decoding and image header reads are GIL-bound once
+    # the files are read, so large libraries are analyzed in processes
+    # scan_config.threads is sized for I/O-bound threads; each process also
+    # runs its own FFprobe batches and cache writer, so cap them at the CPUs
+    executor: Executor
+    if scan_config.use_processes and len(head) >= PROCESS_MIN_ALBUMS:
+        workers = min(scan_config.threads, os.cpu_count() or 1)
+        executor = ProcessPoolExecutor(max_workers=workers)
+    else:
+        workers = scan_config.threads
+        executor = ThreadPoolExecutor(max_workers=workers)
+
+    analyze = partial(
+        _analyze_album_safe,
+        library_root,
+        scan_config=scan_config,
+        config=config,
+        cache=cache,
+    )
 
+    # Queued albums beyond this block the walker until some finish
+    max_pending = workers * PENDING_ALBUMS_PER_WORKER
+    # Future -> (pool it runs in, album, whether it is a retry after a crash)
+    pending: dict[Future, tuple[Executor, _AlbumItem, bool]] = {}
+    # Albums whose worker process died twice, retried one by one after the scan
+    crashed: list[_AlbumItem] = []
+    found = 0
+    completed = 0
+    last_progress = 0.0
+
+    def restart(broken: Executor) -> None:
+        nonlocal executor
+        if broken is executor:
+            broken.shutdown(wait=False)
+            executor = ProcessPoolExecutor(max_workers=workers)
+
+    def submit(item: _AlbumItem, retry: bool = False) -> None:
+        try:
+            future = executor.submit(analyze, *item)
+        except BrokenProcessPool:
+            restart(executor)
+            future = executor.submit(analyze, *item)
+        pending[future] = (executor, item, retry)
+
+    def finish(album_path: Path, album: Album | None) -> None:
+        nonlocal completed, last_progress
+        completed += 1
+        if album is not None and album.tracks:  # Only add albums with valid tracks
+            albums.append(album)
+
+        # Coalesce bursts of completions; the last one is always reported
+        if progress_callback:
+            now = time.monotonic()
+            if now - last_progress >= PROGRESS_INTERVAL or completed == found:
+                last_progress = now
+                progress_callback(completed, found, album_path.name)
+
+    def collect(done: set[Future]) -> None:
+        for future in done:
+            pool, item, retry = pending.pop(future)
             try:
                 album = future.result()
-                if album.tracks:  # Only add albums with valid tracks
-                    albums.append(album)
+            except BrokenProcessPool:
+                # A worker died (out of memory, or a crash in a native
+                # decoder), failing every album queued in its pool. Most
+                # of them were innocent, so retry each once in a new pool;
+                # an album that fails again is isolated after the scan.
+                restart(pool)
+                if retry:
+                    crashed.append(item)
+                else:
+                    submit(item, retry=True)
+                continue
             except Exception:
-                # Log error but continue
-                pass
-
-            if progress_callback:
-                progress_callback(completed, total, album_path.name)
+                logger.warning("Failed to analyze %s", item[0], exc_info=True)
+                album = None
+            finish(item[0], album)
+
+    # Process albums in parallel, submitting each as soon as it is walked
+    try:
+        for item in chain(head, walker):
+            found += 1
+            submit(item)
+
+            # Report finished albums as we go; wait only when the queue is full
+            done, _ = wait(
+                pending,
+                timeout=0 if len(pending) < max_pending else None,
+                return_when=FIRST_COMPLETED,
+            )
+            collect(done)
+
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            collect(done)
+
+        # Alone, an album that crashes its worker again cannot take others with it
+        for item in crashed:
+            finish(item[0], _analyze_isolated(analyze, item))
+    finally:
+        # Do not wait for queued albums when the scan is interrupted
+        executor.shutdown(cancel_futures=True)
+        # Release the cache's connections, even when the scan is interrupted
+        if cache is not None:
+            cache.close()
 
     # Sort by path for consistent ordering
     albums.sort(key=lambda a: str(a.source_path).lower())
@@ -79,6 +188,35 @@ def detect_albums(
     return albums
 
 
+def _analyze_isolated(analyze: Callable[..., Album | None], item: _AlbumItem) -> Album | None:
+    """Analyze an album in a worker process of its own, returning None if it dies."""
+    with ProcessPoolExecutor(max_workers=1) as pool:
+        try:
+            return pool.submit(analyze, *item).result()
+        except BrokenProcessPool:
+            logger.warning("Scan worker died analyzing %s; skipping it", item[0])
+            return None
+
+
+def _analyze_album_safe(
+    library_root: Path,
+    album_path: Path,
+    audio_files: list[Path],
+    file_names: list[str],
+    scan_config: ScanConfig,
+    config: Config | None,
+    cache: ScanCache | None,
+) -> Album | None:
+    """Analyze an album in a pool worker, returning None on error."""
+    try:
+        return analyze_album(
+            library_root, album_path, audio_files, scan_config, config, cache, file_names
+        )
+    except Exception:
+        # Log error but continue
+        return None
+
+
 def scan_library(
     scan_config: ScanConfig,
     config: Config | None = None,
@@ -5,15 +5,43 @@ from io import BytesIO
 from pathlib import Path
 
 from mutagen import File as MutagenFile
+from mutagen import FileType
 from mutagen.flac import FLAC, Picture
-from mutagen.id3 import APIC, ID3
+from mutagen.id3 import ID3
 from mutagen.mp3 import MP3
 from mutagen.mp4 import MP4, MP4Cover
 from mutagen.oggopus import OggOpus
 from mutagen.oggvorbis import OggVorbis
 
-
-def extract_metadata(path: Path) -> dict:
+# Image header layouts, compiled once: PNG IHDR width/height, JPEG SOF
+# height/width, JPEG segment length, GIF logical screen size, BMP
+# DIB header width/height (negative height means top-down rows)
+_PNG_SIZE = struct.Struct(">II")
+_JPEG_SOF_SIZE = struct.Struct(">HH")
+_U16BE = struct.Struct(">H")
+_GIF_SIZE = struct.Struct("<HH")
+_BMP_SIZE = struct.Struct("<Ii")
+
+# Bytes read from an image file to find its dimensions; enough for the
+# JPEG segments before the SOF marker in nearly all files
+IMAGE_HEADER_BYTES = 65536
+
+# JPEG start-of-frame markers (0xC0-0xCF except DHT, JPG and DAC)
+_JPEG_SOF_MARKERS = frozenset(range(0xC0, 0xD0)) - {0xC4, 0xC8, 0xCC}
+
+# Mutagen types for common extensions; opening the concrete type parses
+# the file once instead of scoring it against every registered format
+_EXT_TYPES: dict[str, type[FileType]] = {
+    ".mp3": MP3,
+    ".flac": FLAC,
+    ".m4a": MP4,
+    ".mp4": MP4,
+    ".ogg": OggVorbis,
+    ".opus": OggOpus,
+}
+
+
+def extract_metadata(path: Path, audio: FileType | None = None) -> dict:
     """
     Extract metadata from an audio file using mutagen.
 
@@ -24,6 +52,10 @@ def extract_metadata(path: Path) -> dict:
         - compilation (bool)
         - has_embedded_art (bool)
         - art_width, art_height (if embedded art exists)
+
+    Args:
+        path: Path to audio file
+        audio: The file already opened with open_audio, if the caller has it
     """
     result = {
         "title": None,
@@ -41,11 +73,9 @@ def extract_metadata(path: Path) -> dict:
         "art_height": None,
     }
 
-    try:
-        audio = MutagenFile(path, easy=False)
-        if audio is None:
-            return result
-    except Exception:
+    if audio is None:
+        audio = open_audio(path)
+    if audio is None:
         return result
 
     # Handle different formats
@@ -65,6 +95,30 @@ def extract_metadata(path: Path) -> dict:
     return result
 
 
+def open_audio(path: Path) -> FileType | None:
+    """
+    Open an audio file with mutagen.
+
+    Common formats are opened with their concrete type, picked by
+    extension; anything else (or a file whose extension is wrong) goes
+    through mutagen's content sniffing.
+
+    Returns:
+        Mutagen file object, or None if mutagen cannot read the file
+    """
+    file_type = _EXT_TYPES.get(path.suffix.lower())
+    if file_type is not None:
+        try:
+            return file_type(path)
+        except Exception:
+            pass
+
+    try:
+        return MutagenFile(path, easy=False)
+    except Exception:
+        return None
+
+
 def _extract_id3(audio: MP3) -> dict:
     """Extract metadata from ID3 tags."""
     result = {}
@@ -125,15 +179,13 @@ def _extract_id3(audio: MP3) -> dict:
         result["compilation"] = str(tcmp) == "1"
 
     # Check for embedded artwork (APIC)
-    for key in tags.keys():
-        if key.startswith("APIC"):
-            apic = tags[key]
-            if isinstance(apic, APIC) and apic.data:
-                result["has_embedded_art"] = True
-                dims = get_image_dimensions_from_data(apic.data)
-                if dims:
-                    result["art_width"], result["art_height"] = dims
-                break
+    for apic in tags.getall("APIC"):
+        if apic.data:
+            result["has_embedded_art"] = True
+            dims = get_image_dimensions_from_data(apic.data)
+            if dims:
+                result["art_width"], result["art_height"] = dims
+            break
 
     return result
 
@@ -146,24 +198,29 @@ def _extract_vorbis(audio) -> dict:
     if not tags:
         return result
 
-    # Standard vorbis comment mappings (case-insensitive)
-    def get_tag(names: list[str]) -> str | None:
+    # Vorbis comment names are case-insensitive: index the keys by lowercased
+    # name once (first key wins, as in a linear scan)
+    by_name = {}
+    for key in tags.keys():
+        by_name.setdefault(key.lower(), key)
+
+    def get_tag(names: tuple[str, ...]) -> str | None:
         for name in names:
-            for key in tags.keys():
-                if key.upper() == name.upper():
-                    val = tags[key]
-                    if isinstance(val, list):
-                        return str(val[0]) if val else None
-                    return str(val)
+            key = by_name.get(name)
+            if key is not None:
+                val = tags[key]
+                if isinstance(val, list):
+                    return str(val[0]) if val else None
+                return str(val)
         return None
 
-    result["title"] = get_tag(["TITLE"])
-    result["artist"] = get_tag(["ARTIST"])
-    result["album"] = get_tag(["ALBUM"])
-    result["album_artist"] = get_tag(["ALBUMARTIST", "ALBUM ARTIST"])
+    result["title"] = get_tag(("title",))
+    result["artist"] = get_tag(("artist",))
+    result["album"] = get_tag(("album",))
+    result["album_artist"] = get_tag(("albumartist", "album artist"))
 
     # Track number
-    track = get_tag(["TRACKNUMBER", "TRACK"])
+    track = get_tag(("tracknumber", "track"))
     if track:
         parts = track.split("/")
         try:
@@ -173,7 +230,7 @@ def _extract_vorbis(audio) -> dict:
         except ValueError:
             pass
 
-    track_total = get_tag(["TRACKTOTAL", "TOTALTRACKS"])
+    track_total = get_tag(("tracktotal", "totaltracks"))
     if track_total and not result.get("track_total"):
         try:
             result["track_total"] = int(track_total)
@@ -181,7 +238,7 @@ def _extract_vorbis(audio) -> dict:
             pass
 
     # Disc number
-    disc = get_tag(["DISCNUMBER", "DISC"])
+    disc = get_tag(("discnumber", "disc"))
     if disc:
         parts = disc.split("/")
         try:
@@ -191,7 +248,7 @@ def _extract_vorbis(audio) -> dict:
         except ValueError:
             pass
 
-    disc_total = get_tag(["DISCTOTAL", "TOTALDISCS"])
+    disc_total = get_tag(("disctotal", "totaldiscs"))
     if disc_total and not result.get("disc_total"):
         try:
             result["disc_total"] = int(disc_total)
@@ -199,7 +256,7 @@ def _extract_vorbis(audio) -> dict:
             pass
 
     # Year
-    date = get_tag(["DATE", "YEAR"])
+    date = get_tag(("date", "year"))
     if date:
         try:
             result["year"] = int(date[:4])
@@ -207,7 +264,7 @@ def _extract_vorbis(audio) -> dict:
             pass
 
     # Compilation
-    compilation = get_tag(["COMPILATION"])
+    compilation = get_tag(("compilation",))
     if compilation:
         result["compilation"] = compilation.lower() in ("1", "true", "yes")
 
@@ -297,9 +354,10 @@ def _extract_mp4(audio: MP4) -> dict:
         if covers:
             cover = covers[0]
             if isinstance(cover, (bytes, MP4Cover)):
-                data = bytes(cover)
                 result["has_embedded_art"] = True
-                dims = get_image_dimensions_from_data(data)
+                # MP4Cover is a bytes subclass: parse the header in place
+                # rather than copying the whole image
+                dims = get_image_dimensions_from_data(cover)
                 if dims:
                     result["art_width"], result["art_height"] = dims
 
@@ -342,16 +400,26 @@ def get_image_dimensions(path: Path) -> tuple[int, int] | None:
     """
     try:
         with open(path, "rb") as f:
-            data = f.read(32)  # Read header
-            return get_image_dimensions_from_data(data, read_more=lambda n: f.read(n))
-    except Exception:
+            data = f.read(IMAGE_HEADER_BYTES)
+    except OSError:
         return None
 
+    dims = get_image_dimensions_from_data(data)
+    if dims is None and len(data) == IMAGE_HEADER_BYTES:
+        # Header runs past the read (e.g. large EXIF/ICC segments before
+        # the JPEG SOF): let PIL parse the file, which reads lazily
+        try:
+            from PIL import Image
+
+            with Image.open(path) as img:
+                return img.size
+        except Exception:
+            pass
+
+    return dims
+
 
-def get_image_dimensions_from_data(
-    data: bytes,
-    read_more=None,
-) -> tuple[int, int] | None:
+def get_image_dimensions_from_data(data: bytes) -> tuple[int, int] | None:
     """
     Get image dimensions from raw image data.
 
@@ -362,56 +430,22 @@ def get_image_dimensions_from_data(
 
     # PNG
     if data[:8] == b"\x89PNG\r\n\x1a\n":
-        try:
-            width = struct.unpack(">I", data[16:20])[0]
-            height = struct.unpack(">I", data[20:24])[0]
-            return (width, height)
-        except struct.error:
-            pass
+        return _PNG_SIZE.unpack_from(data, 16)
 
     # JPEG
     if data[:2] == b"\xff\xd8":
-        try:
-            # Need to find SOF marker
-            # This is simplified - may need more data
-            if read_more:
-                full_data = data + read_more(65536)
-            else:
-                full_data = data
-
-            i = 2
-            while i < len(full_data) - 9:
-                if full_data[i] != 0xFF:
-                    break
-                marker = full_data[i + 1]
-                # SOF markers (0xC0-0xCF except 0xC4, 0xC8, 0xCC)
-                if marker in (0xC0, 0xC1, 0xC2, 0xC3, 0xC5, 0xC6, 0xC7, 0xC9, 0xCA, 0xCB, 0xCD, 0xCE, 0xCF):
-                    height = struct.unpack(">H", full_data[i + 5 : i + 7])[0]
-                    width = struct.unpack(">H", full_data[i + 7 : i + 9])[0]
-                    return (width, height)
-                # Skip marker
-                length = struct.unpack(">H", full_data[i + 2 : i + 4])[0]
-                i += 2 + length
-        except (struct.error, IndexError):
-            pass
+        dims = _jpeg_dimensions(data)
+        if dims:
+            return dims
 
     # GIF
     if data[:6] in (b"GIF87a", b"GIF89a"):
-        try:
-            width = struct.unpack("<H", data[6:8])[0]
-            height = struct.unpack("<H", data[8:10])[0]
-            return (width, height)
-        except struct.error:
-            pass
+        return _GIF_SIZE.unpack_from(data, 6)
 
     # BMP
-    if data[:2] == b"BM":
-        try:
-            width = struct.unpack("<I", data[18:22])[0]
-            height = abs(struct.unpack("<i", data[22:26])[0])
-            return (width, height)
-        except struct.error:
-            pass
+    if data[:2] == b"BM" and len(data) >= 26:
+        width, height = _BMP_SIZE.unpack_from(data, 18)
+        return (width, abs(height))
 
     # Fall back to PIL if available
     try:
@@ -423,3 +457,27 @@ def get_image_dimensions_from_data(
         pass
 
     return None
+
+
+def _jpeg_dimensions(data: bytes) -> tuple[int, int] | None:
+    """
+    Find a JPEG's dimensions by walking its segment headers to the SOF.
+
+    Only segment headers are touched (typically 5-10 per image). Searching
+    the raw bytes for an SOF marker instead could hit one inside an
+    embedded (EXIF) thumbnail.
+    """
+    i = 2
+    end = len(data) - 9
+    try:
+        while i < end:
+            if data[i] != 0xFF:
+                return None
+            if data[i + 1] in _JPEG_SOF_MARKERS:
+                height, width = _JPEG_SOF_SIZE.unpack_from(data, i + 5)
+                return (width, height)
+            # Skip marker
+            i += 2 + _U16BE.unpack_from(data, i + 2)[0]
+    except struct.error:
+        pass
+    return None
@@ -1,5 +1,6 @@
 """Directory traversal for music library scanning."""
 
+import fnmatch
 import os
 from collections.abc import Iterator
 from pathlib import Path
@@ -8,19 +9,21 @@ from pathlib import Path
 def walk_library(
     library_root: Path,
     audio_extensions: set[str],
-) -> Iterator[tuple[Path, list[Path]]]:
+) -> Iterator[tuple[Path, list[Path], list[str]]]:
     """
     Walk directory tree and yield album directories with their audio files.
 
-    Yields tuples of (directory_path, list_of_audio_files).
+    Yields tuples of (directory_path, list_of_audio_files, file_names).
     Only yields directories that contain at least one audio file.
+    file_names is the directory's full file listing, so callers (e.g. the
+    artwork lookup) do not need to list the directory again.
 
     Args:
         library_root: Root directory of the music library
         audio_extensions: Set of audio file extensions (e.g., {".flac", ".mp3"})
 
     Yields:
-        Tuple of (album_dir, audio_files)
+        Tuple of (album_dir, audio_files, file_names)
     """
     library_root = library_root.resolve()
 
@@ -40,12 +43,13 @@ def walk_library(
         if audio_files:
             # Sort by filename for consistent ordering
             audio_files.sort(key=lambda p: p.name.lower())
-            yield root_path, audio_files
+            yield root_path, audio_files, files
 
 
 def find_artwork_candidates(
     directory: Path,
     patterns: list[str],
+    file_names: list[str] | None = None,
 ) -> list[Path]:
     """
     Find artwork files in a directory matching common patterns.
@@ -53,6 +57,8 @@ def find_artwork_candidates(
     Args:
         directory: Directory to search
         patterns: List of glob patterns (e.g., ["cover.*", "folder.*"])
+        file_names: Names of the files in directory, if already listed
+            (see walk_library); otherwise the directory is globbed
 
     Returns:
         List of paths to potential artwork files
@@ -61,8 +67,13 @@ def find_artwork_candidates(
     image_extensions = {".jpg", ".jpeg", ".png", ".gif", ".bmp", ".webp"}
 
     for pattern in patterns:
-        for match in directory.glob(pattern):
-            if match.is_file() and match.suffix.lower() in image_extensions:
+        if file_names is not None:
+            # Same matching rules as Path.glob on this platform
+            matches = [directory / name for name in fnmatch.filter(file_names, pattern)]
+        else:
+            matches = [m for m in directory.glob(pattern) if m.is_file()]
+        for match in matches:
+            if match.suffix.lower() in image_extensions:
                 candidates.append(match)
 
     # Deduplicate while preserving order
@@ -1,5 +1,7 @@
 """Reusable TUI components."""
 
+from functools import lru_cache
+
 from rich.align import Align
 from rich.box import ROUNDED
 from rich.console import Group
@@ -40,31 +42,53 @@ class Theme:
     INDIGO = "#5E5CE6"
 
 
+# Bold styles used by the components below, built once
+_STYLE_BOLD_PRIMARY = f"bold {Theme.PRIMARY}"
+_STYLE_BOLD_GREEN = f"bold {Theme.GREEN}"
+_STYLE_BOLD_ORANGE = f"bold {Theme.ORANGE}"
+_STYLE_BOLD_RED = f"bold {Theme.RED}"
+_STYLE_BOLD_BLUE = f"bold {Theme.BLUE}"
+_STYLE_BOLD_SECONDARY = f"bold {Theme.SECONDARY}"
+
+# Badge style for each (upper-case) status; others get _STYLE_BOLD_SECONDARY
+_STATUS_STYLES = {
+    "GREEN": _STYLE_BOLD_GREEN,
+    "YELLOW": _STYLE_BOLD_ORANGE,
+    "RED": _STYLE_BOLD_RED,
+    "SUCCESS": _STYLE_BOLD_GREEN,
+    "WARNING": _STYLE_BOLD_ORANGE,
+    "ERROR": _STYLE_BOLD_RED,
+    "INFO": _STYLE_BOLD_BLUE,
+}
+
+
 # ─────────────────────────────────────────────────────────────────────────────
 # Status Badge Components
 # ─────────────────────────────────────────────────────────────────────────────
 
+@lru_cache(maxsize=64)
 def status_badge(status: str) -> Text:
     """
     Create a colored status badge.
 
+    Badges are cached per status, so repeated calls return the same Text;
+    copy() it before modifying it.
+
     Args:
         status: Status text (e.g., "GREEN", "YELLOW", "RED", "SUCCESS", "ERROR")
 
     Returns:
         Rich Text with appropriate styling
     """
-    colors = {
-        "GREEN": Theme.GREEN,
-        "YELLOW": Theme.ORANGE,
-        "RED": Theme.RED,
-        "SUCCESS": Theme.GREEN,
-        "WARNING": Theme.ORANGE,
-        "ERROR": Theme.RED,
-        "INFO": Theme.BLUE,
-    }
-    color = colors.get(status.upper(), Theme.SECONDARY)
-    return Text(f" {status} ", style=f"bold {color}")
+    return Text(
+        f" {status} ", style=_STATUS_STYLES.get(status.upper(), _STYLE_BOLD_SECONDARY)
+    )
+
+
+@lru_cache(maxsize=256)
+def _bar_segments(filled: int, width: int) -> tuple[str, str]:
+    """Filled and empty parts of a progress bar, reused between redraws."""
+    return "▓" * filled, "░" * (width - filled)
 
 
 def progress_badge(value: int, total: int, width: int = 20) -> Text:
@@ -84,12 +108,11 @@ def progress_badge(value: int, total: int, width: int = 20) -> Text:
     else:
         pct = value / total
 
-    filled = int(width * pct)
-    empty = width - filled
+    filled_bar, empty_bar = _bar_segments(int(width * pct), width)
 
     bar = Text()
-    bar.append("▓" * filled, style=Theme.GREEN)
-    bar.append("░" * empty, style=Theme.TERTIARY)
+    bar.append(filled_bar, style=Theme.GREEN)
+    bar.append(empty_bar, style=Theme.TERTIARY)
     bar.append(f" {pct:.0%}", style=Theme.SECONDARY)
 
     return bar
@@ -113,7 +136,7 @@ def stat_card(title: str, value: str | int, subtitle: str = "", style: str = "")
         Panel containing the stat card
     """
     content = Group(
-        Text(str(value), style=f"bold {style or Theme.PRIMARY}"),
+        Text(str(value), style=f"bold {style}" if style else _STYLE_BOLD_PRIMARY),
         Text(subtitle, style=Theme.SECONDARY) if subtitle else Text(""),
     )
 
@@ -126,6 +149,7 @@ def stat_card(title: str, value: str | int, subtitle: str = "", style: str = "")
     )
 
 
+@lru_cache(maxsize=1)
 def completion_summary(
     succeeded: int,
     failed: int,
@@ -136,6 +160,9 @@ def completion_summary(
     """
     Create a completion summary panel.
 
+    The last panel is cached, so redisplaying the same summary (e.g. after
+    a resize) returns the same Panel instead of rebuilding it.
+
     Args:
         succeeded: Number of successful conversions
         failed: Number of failed conversions
@@ -150,10 +177,10 @@ def completion_summary(
 
     # Header
     if failed == 0:
-        header = Text("Conversion Complete!", style=f"bold {Theme.GREEN}")
+        header = Text("Conversion Complete!", style=_STYLE_BOLD_GREEN)
         icon = "✓"
     else:
-        header = Text("Completed with Errors", style=f"bold {Theme.ORANGE}")
+        header = Text("Completed with Errors", style=_STYLE_BOLD_ORANGE)
         icon = "⚠"
 
     # Stats table
@@ -254,6 +281,9 @@ def error_table(errors: list[dict], max_rows: int = 10) -> Table:
     """
     Create an error summary table.
 
+    The table is rebuilt only when the displayed rows change, so redraws
+    between new errors return the same Table.
+
     Args:
         errors: List of error dicts with album_id, error_code, error_message
         max_rows: Maximum rows to display
@@ -261,21 +291,32 @@ def error_table(errors: list[dict], max_rows: int = 10) -> Table:
     Returns:
         Rich Table with error summary
     """
+    rows = tuple(
+        (
+            err.get("album_id", "")[:16],
+            err.get("error_code", "UNKNOWN"),
+            err.get("error_message", "")[:40],
+        )
+        for err in errors[:max_rows]
+    )
+    return _error_table(rows, len(errors) - len(rows))
+
+
+@lru_cache(maxsize=1)
+def _error_table(rows: tuple[tuple[str, str, str], ...], hidden: int) -> Table:
+    """Build the error table for already-truncated rows."""
     table = Table(show_header=True, box=None, padding=(0, 1))
     table.add_column("Album", style=Theme.SECONDARY, max_width=20)
-    table.add_column("Code", style=f"bold {Theme.RED}", width=15)
+    table.add_column("Code", style=_STYLE_BOLD_RED, width=15)
     table.add_column("Message", style=Theme.SECONDARY)
 
-    for err in errors[:max_rows]:
-        album_id = err.get("album_id", "")[:16]
-        code = err.get("error_code", "UNKNOWN")
-        message = err.get("error_message", "")[:40]
+    for album_id, code, message in rows:
         table.add_row(album_id, code, message)
 
-    if len(errors) > max_rows:
+    if hidden > 0:
         table.add_row(
             "",
-            f"... +{len(errors) - max_rows} more",
+            f"... +{hidden} more",
             "",
             style=Theme.SECONDARY,
         )
@@ -791,7 +791,7 @@ class ProfessionalDashboard:
                 refresh_per_second=refresh_rate,
                 screen=True,  # Use alternate screen for clean exit
             ) as live:
-                while work_thread.is_alive() or not self.event_bus._queue.empty():
+                while work_thread.is_alive() or not self.event_bus.empty():
                     # Process all pending events
                     events = self.event_bus.poll()
                     for event in events:
@@ -876,7 +876,7 @@ class CompactDashboard:
 
         try:
             with Live(self.render(), console=self.console, refresh_per_second=refresh_rate) as live:
-                while work_thread.is_alive() or not self.event_bus._queue.empty():
+                while work_thread.is_alive() or not self.event_bus.empty():
                     for event in self.event_bus.poll():
                         self.state.update(event)
                     live.update(self.render())
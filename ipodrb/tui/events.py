@@ -1,15 +1,20 @@
 """Event system for TUI updates."""
 
+import threading
+from collections import deque
 from dataclasses import dataclass, field
 from datetime import datetime
-from queue import Empty, Queue
-from typing import Any
+from typing import Any, ClassVar
 
 
 @dataclass
 class Event:
     """Base event class."""
 
+    # Snapshot events carry complete state, so poll() may drop all but
+    # the newest pending one of each such type
+    coalesce: ClassVar[bool] = False
+
     timestamp: datetime = field(default_factory=datetime.now)
     event_type: str = "generic"
 
@@ -26,6 +31,8 @@ class ScanStartEvent(Event):
 class ScanProgressEvent(Event):
     """Scan progress update."""
 
+    coalesce: ClassVar[bool] = True
+
     current: int = 0
     total: int = 0
     current_dir: str = ""
@@ -53,6 +60,8 @@ class BuildStartEvent(Event):
 class BuildProgressEvent(Event):
     """Build progress update."""
 
+    coalesce: ClassVar[bool] = True
+
     completed: int = 0
     failed: int = 0
     cached: int = 0
@@ -115,10 +124,16 @@ class LogEvent(Event):
 
 
 class EventBus:
-    """Thread-safe event bus for TUI updates."""
+    """
+    Thread-safe event bus for TUI updates.
+
+    Events are kept in a deque behind a single condition variable: worker
+    threads append, and the TUI drains everything pending at once.
+    """
 
     def __init__(self):
-        self._queue: Queue[Event] = Queue()
+        self._events: deque[Event] = deque()
+        self._ready = threading.Condition()
         self._listeners: list[callable] = []
 
     def emit(self, event: Event) -> None:
@@ -128,26 +143,28 @@ class EventBus:
         Args:
             event: Event to emit
         """
-        self._queue.put(event)
+        with self._ready:
+            self._events.append(event)
+            self._ready.notify()
+
+    def empty(self) -> bool:
+        """Return True if no events are pending."""
+        return not self._events
 
     def poll(self, timeout: float = 0.1) -> list[Event]:
         """
         Poll for pending events.
 
+        Of each coalescing event type (progress snapshots) only the newest
+        pending event is returned; all other events are returned in order.
+
         Args:
             timeout: Max time to wait for events
 
         Returns:
             List of events (may be empty)
         """
-        events = []
-        try:
-            while True:
-                event = self._queue.get_nowait()
-                events.append(event)
-        except Empty:
-            pass
-        return events
+        return _coalesce(self._drain())
 
     def poll_one(self, timeout: float = 0.1) -> Event | None:
         """
@@ -159,15 +176,32 @@ class EventBus:
         Returns:
             Event or None
         """
-        try:
-            return self._queue.get(timeout=timeout)
-        except Empty:
+        with self._ready:
+            if self._ready.wait_for(lambda: self._events, timeout):
+                return self._events.popleft()
             return None
 
     def clear(self) -> None:
         """Clear all pending events."""
-        try:
-            while True:
-                self._queue.get_nowait()
-        except Empty:
-            pass
+        self._drain()
+
+    def _drain(self) -> list[Event]:
+        """Take every pending event under a single lock acquisition."""
+        with self._ready:
+            events = list(self._events)
+            self._events.clear()
+        return events
+
+
+def _coalesce(events: list[Event]) -> list[Event]:
+    """Drop all but the newest event of each coalescing type, keeping order."""
+    newest: dict[type, int] = {}
+    snapshots = 0
+    for i, event in enumerate(events):
+        if event.coalesce:
+            newest[type(event)] = i
+            snapshots += 1
+    if snapshots == len(newest):
+        return events
+    keep = set(newest.values())
+    return [event for i, event in enumerate(events) if not event.coalesce or i in keep]
@@ -1,7 +1,20 @@
 """Utility modules."""
 
-from ipodrb.utils.conversion_log import ConversionLog
+from typing import TYPE_CHECKING
+
 from ipodrb.utils.errors import IpodrbError
 from ipodrb.utils.logging import setup_logging
 
+if TYPE_CHECKING:
+    from ipodrb.utils.conversion_log import ConversionLog
+
 __all__ = ["ConversionLog", "IpodrbError", "setup_logging"]
+
+
+def __getattr__(name: str):
+    # ConversionLog pulls in csv and the plan models; only load it when used
+    if name == "ConversionLog":
+        from ipodrb.utils.conversion_log import ConversionLog
+
+        return ConversionLog
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
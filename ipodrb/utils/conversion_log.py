@@ -2,15 +2,17 @@
 
 import csv
 import json
+import time
+from collections import Counter
 from dataclasses import dataclass, field
 from datetime import datetime
 from pathlib import Path
-from typing import Any
+from typing import IO, Any
 
 from ipodrb.models.plan import TrackJob, TrackResult
 
 
-@dataclass
+@dataclass(slots=True)
 class ConversionLogEntry:
     """Single track conversion log entry."""
 
@@ -57,7 +59,7 @@ class ConversionLogEntry:
         }
 
 
-@dataclass
+@dataclass(slots=True)
 class ConversionSummary:
     """Summary statistics for a conversion run."""
 
@@ -104,21 +106,72 @@ class ConversionSummary:
         }
 
 
+# Encoder for JSONL records; they are freshly built plain dicts, so the
+# per-container cycle check is skipped
+_JSONL_ENCODER = json.JSONEncoder(check_circular=False)
+
+# Columns of manifest.csv, in order (see _manifest_row)
+MANIFEST_FIELDS = (
+    "album_id",
+    "source_path",
+    "output_path",
+    "action",
+    "target_codec",
+    "target_sample_rate",
+    "target_bit_depth",
+    "aac_bitrate_kbps",
+    "dither_applied",
+    "success",
+    "error_code",
+)
+
+
+def _manifest_row(entry: ConversionLogEntry) -> tuple:
+    """Project an entry onto MANIFEST_FIELDS."""
+    return (
+        entry.album_id,
+        entry.source_path,
+        entry.output_path,
+        entry.action,
+        entry.target_codec,
+        entry.target_sample_rate,
+        entry.target_bit_depth,
+        entry.aac_bitrate,
+        entry.dither_applied,
+        entry.success,
+        entry.error_code,
+    )
+
+
 @dataclass
 class ConversionLog:
-    """Tracks all conversions and writes logs to output folder."""
+    """
+    Tracks all conversions and writes logs to output folder.
+
+    Track entries are appended to the JSONL log as they are logged, so
+    only the compact manifest rows and the error list stay in memory.
+    """
 
     output_root: Path
-    entries: list[ConversionLogEntry] = field(default_factory=list)
+    manifest_rows: list[tuple] = field(default_factory=list)
     summary: ConversionSummary = field(default_factory=lambda: ConversionSummary(started_at=datetime.now()))
     errors: list[dict] = field(default_factory=list)
+    # Logged tracks per action, counted as they are logged
+    action_counts: Counter[str] = field(default_factory=Counter)
+    # (epoch second, ISO text for that second) reused by _timestamp()
+    _second_iso: tuple[int, str] = field(default=(-1, ""), init=False, repr=False)
+    _jsonl: IO[str] | None = field(default=None, init=False, repr=False)
 
     def __post_init__(self):
+        # The output folder is created by write_logs(), when it is first needed
         self.output_root = Path(self.output_root)
-        self.output_root.mkdir(parents=True, exist_ok=True)
 
     def start(self, total_tracks: int, albums_processed: int, albums_skipped: int) -> None:
-        """Mark the start of conversion run."""
+        """Mark the start of conversion run, discarding any previous run."""
+        self._close_jsonl()
+        self.manifest_rows = []
+        self.errors = []
+        self.action_counts = Counter()
         self.summary = ConversionSummary(
             started_at=datetime.now(),
             total_tracks=total_tracks,
@@ -126,46 +179,56 @@ class ConversionLog:
             albums_skipped=albums_skipped,
         )
 
+    def _timestamp(self) -> str:
+        """Current local time in ISO format, formatting the date part once per second."""
+        ns = time.time_ns()
+        sec, sub_ns = divmod(ns, 1_000_000_000)
+        if sec != self._second_iso[0]:
+            self._second_iso = (sec, datetime.fromtimestamp(sec).isoformat())
+        return f"{self._second_iso[1]}.{sub_ns // 1000:06d}"
+
     def log_track(self, job: TrackJob, result: TrackResult) -> None:
         """Log a single track conversion."""
         # Extract source format from path
         source_format = job.source_path.suffix.upper().lstrip(".")
 
         entry = ConversionLogEntry(
-            timestamp=datetime.now().isoformat(),
+            timestamp=self._timestamp(),
             album_id=job.album_id,
-            source_path=str(job.source_path),
-            output_path=str(job.output_path),
+            source_path=job.source_path_str,
+            output_path=job.output_path_str,
             action=job.action.value,
             source_format=source_format,
-            source_sample_rate=job.source_path.stat().st_size if hasattr(job, "source_sample_rate") else 0,
-            source_bit_depth=getattr(job, "source_bit_depth", None),
+            source_sample_rate=job.source_sample_rate,
+            source_bit_depth=job.source_bit_depth,
             target_codec=job.target_codec,
             target_sample_rate=job.target_sample_rate,
             target_bit_depth=job.target_bit_depth,
             aac_bitrate=job.aac_bitrate_kbps,
             dither_applied=job.apply_dither,
             success=result.success,
-            error_code=result.error_code if hasattr(result, "error_code") else None,
-            error_message=result.error_message if hasattr(result, "error_message") else None,
-            duration_seconds=result.duration_seconds if hasattr(result, "duration_seconds") else None,
-            output_size_bytes=result.output_size_bytes if hasattr(result, "output_size_bytes") else None,
+            error_code=result.error_code,
+            error_message=result.error_message,
+            duration_seconds=result.duration_seconds,
+            output_size_bytes=result.output_size_bytes,
         )
 
-        self.entries.append(entry)
+        self._write_jsonl_line("track", entry.to_dict())
+        self.manifest_rows.append(_manifest_row(entry))
+        self.action_counts[entry.action] += 1
 
         # Update summary
         if result.success:
             self.summary.succeeded += 1
-            if hasattr(result, "output_size_bytes") and result.output_size_bytes:
+            if result.output_size_bytes:
                 self.summary.total_output_bytes += result.output_size_bytes
         else:
             self.summary.failed += 1
             self.errors.append({
                 "album_id": job.album_id,
-                "source_path": str(job.source_path),
-                "error_code": getattr(result, "error_code", "UNKNOWN"),
-                "error_message": getattr(result, "error_message", "Unknown error"),
+                "source_path": job.source_path_str,
+                "error_code": result.error_code,
+                "error_message": result.error_message,
             })
 
         self.summary.total_source_bytes += job.source_size
@@ -178,17 +241,54 @@ class ConversionLog:
         """Mark conversion run as complete."""
         self.summary.completed_at = datetime.now()
 
+    @property
+    def _log_dir(self) -> Path:
+        """Folder holding this log's files."""
+        return self.output_root / ".logs"
+
+    @property
+    def _file_stamp(self) -> str:
+        """Run start time as used in log file names."""
+        return self.summary.started_at.strftime("%Y%m%d_%H%M%S")
+
+    def _jsonl_path(self) -> Path:
+        """Path of this run's JSONL log."""
+        return self._log_dir / f"conversion_log_{self._file_stamp}.jsonl"
+
+    def _write_jsonl_line(self, record_type: str, data: dict[str, Any]) -> None:
+        """Append one record to this run's JSONL log, opening it on first use."""
+        if self._jsonl is None:
+            self._log_dir.mkdir(parents=True, exist_ok=True)
+            self._jsonl = open(self._jsonl_path(), "w")
+        self._jsonl.write(_JSONL_ENCODER.encode({"type": record_type, "data": data}))
+        self._jsonl.write("\n")
+
+    def _close_jsonl(self) -> None:
+        """Close this run's JSONL log if it is open."""
+        if self._jsonl is not None:
+            self._jsonl.close()
+            self._jsonl = None
+
+    def close(self) -> None:
+        """Close this run's JSONL log, keeping the track records written so far."""
+        self._close_jsonl()
+
     def write_logs(self) -> dict[str, Path]:
         """
         Write all log files to output directory.
 
+        Log files are named after the run's start time. The JSONL log
+        already holds the track records; its summary record is appended
+        last and the file is closed.
+
         Returns dict mapping log type to path.
         """
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        log_dir = self.output_root / ".logs"
-        log_dir.mkdir(exist_ok=True)
+        timestamp = self._file_stamp
+        log_dir = self._log_dir
+        log_dir.mkdir(parents=True, exist_ok=True)
 
         paths = {}
+        summary_data = self.summary.to_dict()
 
         # Write human-readable summary
         summary_path = log_dir / f"conversion_summary_{timestamp}.txt"
@@ -200,14 +300,14 @@ class ConversionLog:
         self._write_manifest_csv(manifest_path)
         paths["manifest"] = manifest_path
 
-        # Write JSONL detailed log
-        jsonl_path = log_dir / f"conversion_log_{timestamp}.jsonl"
-        self._write_jsonl(jsonl_path)
-        paths["jsonl"] = jsonl_path
+        # Finish JSONL detailed log
+        paths["jsonl"] = self._jsonl_path()
+        self._write_jsonl_line("summary", summary_data)
+        self._close_jsonl()
 
         # Write JSON summary
         json_path = log_dir / f"conversion_summary_{timestamp}.json"
-        self._write_summary_json(json_path)
+        self._write_summary_json(json_path, summary_data)
         paths["json"] = json_path
 
         # Write errors log if any
@@ -220,109 +320,82 @@ class ConversionLog:
 
     def _write_summary_txt(self, path: Path) -> None:
         """Write human-readable summary."""
-        with open(path, "w") as f:
-            f.write("=" * 60 + "\n")
-            f.write("CONVERSION SUMMARY\n")
-            f.write("=" * 60 + "\n\n")
-
-            f.write(f"Started:    {self.summary.started_at.strftime('%Y-%m-%d %H:%M:%S')}\n")
-            if self.summary.completed_at:
-                f.write(f"Completed:  {self.summary.completed_at.strftime('%Y-%m-%d %H:%M:%S')}\n")
-                f.write(f"Duration:   {self.summary.duration_seconds:.1f} seconds\n")
-            f.write("\n")
-
-            f.write("RESULTS\n")
-            f.write("-" * 40 + "\n")
-            f.write(f"Total tracks:     {self.summary.total_tracks}\n")
-            f.write(f"Succeeded:        {self.summary.succeeded}\n")
-            f.write(f"Failed:           {self.summary.failed}\n")
-            f.write(f"Cached (skipped): {self.summary.cached}\n")
-            f.write("\n")
-
-            f.write("ALBUMS\n")
-            f.write("-" * 40 + "\n")
-            f.write(f"Processed:  {self.summary.albums_processed}\n")
-            f.write(f"Skipped:    {self.summary.albums_skipped}\n")
-            f.write("\n")
-
-            f.write("SIZE\n")
-            f.write("-" * 40 + "\n")
-            source_mb = self.summary.total_source_bytes / (1024 * 1024)
-            output_mb = self.summary.total_output_bytes / (1024 * 1024)
-            f.write(f"Source size:  {source_mb:.1f} MB\n")
-            f.write(f"Output size:  {output_mb:.1f} MB\n")
-            if self.summary.compression_ratio > 0:
-                f.write(f"Compression:  {self.summary.compression_ratio:.1%}\n")
-            f.write("\n")
-
-            if self.errors:
-                f.write("ERRORS\n")
-                f.write("-" * 40 + "\n")
-                for err in self.errors[:20]:  # Show first 20 errors
-                    f.write(f"  [{err.get('error_code', 'ERROR')}] {err.get('source_path', 'Unknown')}\n")
-                    if err.get("error_message"):
-                        f.write(f"    {err['error_message'][:80]}\n")
-                if len(self.errors) > 20:
-                    f.write(f"  ... and {len(self.errors) - 20} more errors\n")
+        parts: list[str] = []
+        write = parts.append
+        write("=" * 60 + "\n")
+        write("CONVERSION SUMMARY\n")
+        write("=" * 60 + "\n\n")
+
+        write(f"Started:    {self.summary.started_at.strftime('%Y-%m-%d %H:%M:%S')}\n")
+        if self.summary.completed_at:
+            write(f"Completed:  {self.summary.completed_at.strftime('%Y-%m-%d %H:%M:%S')}\n")
+            write(f"Duration:   {self.summary.duration_seconds:.1f} seconds\n")
+        write("\n")
+
+        write("RESULTS\n")
+        write("-" * 40 + "\n")
+        write(f"Total tracks:     {self.summary.total_tracks}\n")
+        write(f"Succeeded:        {self.summary.succeeded}\n")
+        write(f"Failed:           {self.summary.failed}\n")
+        write(f"Cached (skipped): {self.summary.cached}\n")
+        write("\n")
+
+        write("ALBUMS\n")
+        write("-" * 40 + "\n")
+        write(f"Processed:  {self.summary.albums_processed}\n")
+        write(f"Skipped:    {self.summary.albums_skipped}\n")
+        write("\n")
+
+        write("SIZE\n")
+        write("-" * 40 + "\n")
+        source_mb = self.summary.total_source_bytes / (1024 * 1024)
+        output_mb = self.summary.total_output_bytes / (1024 * 1024)
+        write(f"Source size:  {source_mb:.1f} MB\n")
+        write(f"Output size:  {output_mb:.1f} MB\n")
+        if self.summary.compression_ratio > 0:
+            write(f"Compression:  {self.summary.compression_ratio:.1%}\n")
+        write("\n")
+
+        if self.errors:
+            write("ERRORS\n")
+            write("-" * 40 + "\n")
+            for err in self.errors[:20]:  # Show first 20 errors
+                write(f"  [{err.get('error_code', 'ERROR')}] {err.get('source_path', 'Unknown')}\n")
+                if err.get("error_message"):
+                    write(f"    {err['error_message'][:80]}\n")
+            if len(self.errors) > 20:
+                write(f"  ... and {len(self.errors) - 20} more errors\n")
+
+        path.write_text("".join(parts))
 
     def _write_manifest_csv(self, path: Path) -> None:
         """Write CSV manifest of all converted tracks."""
-        fieldnames = [
-            "album_id",
-            "source_path",
-            "output_path",
-            "action",
-            "target_codec",
-            "target_sample_rate",
-            "target_bit_depth",
-            "aac_bitrate_kbps",
-            "dither_applied",
-            "success",
-            "error_code",
-        ]
-
         with open(path, "w", newline="") as f:
-            writer = csv.DictWriter(f, fieldnames=fieldnames, extrasaction="ignore")
-            writer.writeheader()
-            for entry in self.entries:
-                writer.writerow(entry.to_dict())
-
-    def _write_jsonl(self, path: Path) -> None:
-        """Write JSONL detailed log."""
-        with open(path, "w") as f:
-            # Write summary as first line
-            f.write(json.dumps({"type": "summary", "data": self.summary.to_dict()}) + "\n")
+            writer = csv.writer(f)
+            writer.writerow(MANIFEST_FIELDS)
+            writer.writerows(self.manifest_rows)
 
-            # Write each entry
-            for entry in self.entries:
-                f.write(json.dumps({"type": "track", "data": entry.to_dict()}) + "\n")
-
-    def _write_summary_json(self, path: Path) -> None:
+    def _write_summary_json(self, path: Path, summary_data: dict[str, Any]) -> None:
         """Write JSON summary."""
         data = {
-            "summary": self.summary.to_dict(),
+            "summary": summary_data,
             "errors": self.errors,
-            "action_counts": self._count_actions(),
+            "action_counts": dict(self.action_counts),
         }
         with open(path, "w") as f:
             json.dump(data, f, indent=2)
 
     def _write_errors(self, path: Path) -> None:
         """Write errors to text file."""
-        with open(path, "w") as f:
-            f.write("CONVERSION ERRORS\n")
-            f.write("=" * 60 + "\n\n")
-            for err in self.errors:
-                f.write(f"Album: {err.get('album_id', 'Unknown')}\n")
-                f.write(f"File:  {err.get('source_path', 'Unknown')}\n")
-                f.write(f"Code:  {err.get('error_code', 'UNKNOWN')}\n")
-                f.write(f"Error: {err.get('error_message', 'No message')}\n")
-                f.write("-" * 40 + "\n")
-
-    def _count_actions(self) -> dict[str, int]:
-        """Count tracks by action type."""
-        counts: dict[str, int] = {}
-        for entry in self.entries:
-            action = entry.action
-            counts[action] = counts.get(action, 0) + 1
-        return counts
+        parts: list[str] = []
+        write = parts.append
+        write("CONVERSION ERRORS\n")
+        write("=" * 60 + "\n\n")
+        for err in self.errors:
+            write(f"Album: {err.get('album_id', 'Unknown')}\n")
+            write(f"File:  {err.get('source_path', 'Unknown')}\n")
+            write(f"Code:  {err.get('error_code', 'UNKNOWN')}\n")
+            write(f"Error: {err.get('error_message', 'No message')}\n")
+            write("-" * 40 + "\n")
+
+        path.write_text("".join(parts))
@@ -3,16 +3,35 @@
 import json
 import logging
 import sys
-from datetime import datetime
+import time
 from pathlib import Path
 
+# Attributes every LogRecord has (plus those set while formatting); any
+# other attribute came from the caller's extra={...}
+_LOG_RECORD_ATTRS = frozenset(
+    logging.LogRecord("", logging.INFO, "", 0, "", None, None).__dict__
+) | {"message", "asctime", "taskName"}
+
 
 class JsonFormatter(logging.Formatter):
     """JSON Lines log formatter."""
 
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # (epoch second, UTC ISO text for that second) reused across records
+        self._second_iso: tuple[int, str] = (-1, "")
+
+    def _timestamp(self, record: logging.LogRecord) -> str:
+        """Record creation time in UTC ISO format, formatting the date part once per second."""
+        sec = int(record.created)
+        if sec != self._second_iso[0]:
+            self._second_iso = (sec, time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(sec)))
+        micros = int((record.created - sec) * 1_000_000)
+        return f"{self._second_iso[1]}.{micros:06d}Z"
+
     def format(self, record: logging.LogRecord) -> str:
         log_entry = {
-            "timestamp": datetime.utcnow().isoformat() + "Z",
+            "timestamp": self._timestamp(record),
             "level": record.levelname,
             "logger": record.name,
             "message": record.getMessage(),
@@ -21,10 +40,17 @@ class JsonFormatter(logging.Formatter):
         if record.exc_info:
             log_entry["exception"] = self.formatException(record.exc_info)
 
-        if hasattr(record, "extra"):
-            log_entry.update(record.extra)
-
-        return json.dumps(log_entry)
+        # Fields passed as extra={...} become record attributes
+        extra_keys = record.__dict__.keys() - _LOG_RECORD_ATTRS
+        if extra_keys:
+            for key in sorted(extra_keys):
+                value = record.__dict__[key]
+                if key == "extra" and isinstance(value, dict):
+                    log_entry.update(value)
+                else:
+                    log_entry[key] = value
+
+        return json.dumps(log_entry, default=str)
 
 
 def setup_logging(
@@ -1,11 +1,48 @@
 """XLSX reading and parsing."""
 
+import json
+import os
+import tempfile
+from collections.abc import Callable, Iterable, Iterator
+from datetime import date, datetime, time, timedelta
+from functools import lru_cache
 from pathlib import Path
-
-from openpyxl import load_workbook
+from typing import Any
 
 from ipodrb.models.plan import Action
 from ipodrb.xlsx.schemas import ALBUMS_COLUMNS, COLUMN_INDEX, SCHEMA_VERSION
+from ipodrb.xlsx.stream import open_workbook
+
+# Parsed workbooks are saved as JSON next to the XLSX as "<name>.xlsx.cache"
+# and reused while the workbook's mtime and size are unchanged. JSON, not
+# pickle: plan folders are often shared, and loading must not run code.
+CACHE_SUFFIX = ".cache"
+
+# Bump when the shape of cached results changes
+CACHE_VERSION = 3
+
+# Errors from a missing, truncated, outdated or malformed cache file
+_CACHE_LOAD_ERRORS = (OSError, ValueError, TypeError, KeyError)
+
+# Cell value types JSON cannot hold, stored as {tag: text} and parsed back
+_CACHE_VALUE_TAGS: dict[str, Callable[[str], Any]] = {
+    "$datetime": datetime.fromisoformat,
+    "$date": date.fromisoformat,
+    "$time": time.fromisoformat,
+    "$timedelta": lambda seconds: timedelta(seconds=float(seconds)),
+}
+
+# Summary sheet rows scanned for "key | value" pairs
+SUMMARY_ROWS = 10
+
+# Albums header row as written by the tool, in schema order
+_ALBUMS_HEADER = tuple(COLUMN_INDEX)
+
+# user_action cell values that name a valid Action
+_VALID_ACTIONS = frozenset(action.value for action in Action)
+
+# Upper-cased skip cell text that means "skip this album"
+_TRUE_STRINGS = frozenset({"TRUE", "YES", "1"})
 
 
 class XLSXSchemaError(Exception):
@@ -14,6 +51,75 @@ class XLSXSchemaError(Exception):
     pass
 
 
+# Parsed workbook: (Summary key -> value, Albums header row or None if the
+# sheet is missing, Albums data rows). Rows are value tuples padded to the
+# sheet width.
+XlsxPlan = tuple[dict[Any, Any], tuple | None, list[tuple]]
+
+
+def read_xlsx_plan(xlsx_path: Path) -> XlsxPlan:
+    """
+    Read the Summary and Albums sheets of an XLSX plan.
+
+    The workbook is parsed once per version (path, mtime and size) and
+    cached in memory and in a sidecar file, so read_xlsx and the
+    get_album_decisions / get_xlsx_* helpers can each call this without
+    re-reading an unchanged file. The returned objects are shared between
+    callers and must not be mutated.
+
+    Args:
+        xlsx_path: Path to XLSX file
+
+    Returns:
+        Tuple of (summary dict, Albums header row, list of Albums rows)
+    """
+    xlsx_path = Path(xlsx_path)
+    st = xlsx_path.stat()
+    return _read_xlsx_plan_cached(str(xlsx_path), st.st_mtime_ns, st.st_size)
+
+
+@lru_cache(maxsize=8)
+def _read_xlsx_plan_cached(path_str: str, mtime_ns: int, size: int) -> XlsxPlan:
+    """Load a plan from the sidecar or parse the workbook; mtime_ns and size key the cache."""
+    xlsx_path = Path(path_str)
+    key = (mtime_ns, size)
+
+    plan = _load_cache(xlsx_path, key)
+    if plan is None:
+        plan = _read_workbook(xlsx_path)
+        _save_cache(xlsx_path, key, plan)
+    return plan
+
+
+def _read_workbook(xlsx_path: Path) -> XlsxPlan:
+    """Parse the Summary and Albums sheets in one pass over the workbook."""
+    wb = open_workbook(xlsx_path)
+
+    summary: dict[Any, Any] = {}
+    if "Summary" in wb.sheetnames:
+        for row in wb.iter_rows("Summary", max_row=SUMMARY_ROWS):
+            if row and row[0] is not None:
+                summary.setdefault(row[0], row[1] if len(row) > 1 else None)
+
+    header = None
+    rows: list[tuple] = []
+    if "Albums" in wb.sheetnames:
+        album_rows = wb.iter_rows("Albums")
+        header = next(album_rows, None) or ()
+        rows = list(album_rows)
+
+    wb.close()
+    return summary, header, rows
+
+
+def _iter_album_rows(rows: Iterable[tuple], album_id_idx: int) -> Iterator[tuple[str, tuple]]:
+    """Yield (album_id, row) for each Albums row that has an album_id."""
+    for row in rows:
+        if not row or not row[album_id_idx]:
+            continue
+        yield str(row[album_id_idx]), row
+
+
 def read_xlsx(xlsx_path: Path) -> dict[str, dict]:
     """
     Read XLSX and extract album data keyed by album_id.
@@ -31,36 +137,31 @@ def read_xlsx(xlsx_path: Path) -> dict[str, dict]:
     if not xlsx_path.exists():
         return {}
 
-    wb = load_workbook(xlsx_path, read_only=True, data_only=True)
+    summary, header_row, rows = read_xlsx_plan(xlsx_path)
 
     # Validate schema version from Summary sheet
-    if "Summary" in wb.sheetnames:
-        summary = wb["Summary"]
-        for row in summary.iter_rows(min_row=1, max_row=10, max_col=2, values_only=True):
-            if row[0] == "schema_version":
-                version = str(row[1]) if row[1] else ""
-                if not version.startswith(SCHEMA_VERSION.split(".")[0]):
-                    raise XLSXSchemaError(
-                        f"XLSX schema version {version} is not compatible with "
-                        f"tool version {SCHEMA_VERSION}. Please recreate the sheet."
-                    )
-                break
+    if "schema_version" in summary:
+        version = str(summary["schema_version"]) if summary["schema_version"] else ""
+        if not version.startswith(SCHEMA_VERSION.split(".")[0]):
+            raise XLSXSchemaError(
+                f"XLSX schema version {version} is not compatible with "
+                f"tool version {SCHEMA_VERSION}. Please recreate the sheet."
+            )
 
     # Read Albums sheet
-    if "Albums" not in wb.sheetnames:
+    if header_row is None:
         return {}
 
-    ws = wb["Albums"]
-
-    # Validate header row
-    header_row = list(ws.iter_rows(min_row=1, max_row=1, values_only=True))[0]
-    expected_cols = [col[0] for col in ALBUMS_COLUMNS]
-
-    # Build column mapping (handle potential column reordering)
-    col_map = {}
-    for col_idx, header in enumerate(header_row):
-        if header in expected_cols:
-            col_map[header] = col_idx
+    # Build column mapping (handle potential column reordering); sheets
+    # written by the tool match the schema and reuse its index directly
+    if header_row == _ALBUMS_HEADER:
+        col_map = COLUMN_INDEX
+    else:
+        expected_cols = [col[0] for col in ALBUMS_COLUMNS]
+        col_map = {}
+        for col_idx, header in enumerate(header_row):
+            if header in expected_cols:
+                col_map[header] = col_idx
 
     # Check required columns exist
     required = {"album_id", "user_action", "aac_target_kbps", "skip", "last_built_at", "notes"}
@@ -68,31 +169,22 @@ def read_xlsx(xlsx_path: Path) -> dict[str, dict]:
     if missing:
         raise XLSXSchemaError(f"Missing required columns: {missing}")
 
+    # (column name, index) pairs, resolved once rather than per row
+    fields = list(col_map.items())
+
     # Read album rows
     result = {}
-    for row in ws.iter_rows(min_row=2, values_only=True):
-        if not row or not row[col_map.get("album_id", 0)]:
-            continue
-
-        album_id = str(row[col_map["album_id"]])
-
+    for album_id, row in _iter_album_rows(rows, col_map["album_id"]):
         # Extract user-editable and relevant columns
-        row_data = {}
-        for col_name in col_map:
-            value = row[col_map[col_name]]
-            if value is not None:
-                row_data[col_name] = value
+        row_data = {name: row[idx] for name, idx in fields if row[idx] is not None}
 
         # Normalize user_action
         if "user_action" in row_data:
             user_action = row_data["user_action"]
-            if user_action:
-                # Validate it's a valid action
-                try:
-                    Action(user_action)
-                except ValueError:
-                    row_data["user_action_error"] = f"Invalid action: {user_action}"
-                    row_data["user_action"] = ""
+            # Validate it's a valid action
+            if user_action and user_action not in _VALID_ACTIONS:
+                row_data["user_action_error"] = f"Invalid action: {user_action}"
+                row_data["user_action"] = ""
 
         # Normalize skip to boolean string
         if "skip" in row_data:
@@ -100,11 +192,10 @@ def read_xlsx(xlsx_path: Path) -> dict[str, dict]:
             if isinstance(skip_val, bool):
                 row_data["skip"] = "TRUE" if skip_val else ""
             elif isinstance(skip_val, str):
-                row_data["skip"] = "TRUE" if skip_val.upper() in ("TRUE", "YES", "1") else ""
+                row_data["skip"] = "TRUE" if skip_val.upper() in _TRUE_STRINGS else ""
 
         result[album_id] = row_data
 
-    wb.close()
     return result
 
 
@@ -123,30 +214,33 @@ def get_album_decisions(xlsx_path: Path) -> list[dict]:
     if not xlsx_path.exists():
         raise FileNotFoundError(f"XLSX not found: {xlsx_path}")
 
-    wb = load_workbook(xlsx_path, read_only=True, data_only=True)
-
-    if "Albums" not in wb.sheetnames:
+    _, header_row, rows = read_xlsx_plan(xlsx_path)
+    if header_row is None:
         return []
 
-    ws = wb["Albums"]
+    # Build column mapping, reusing the schema's index for tool-written sheets
+    if header_row == _ALBUMS_HEADER:
+        col_map = COLUMN_INDEX
+    else:
+        col_map = {}
+        for col_idx, header in enumerate(header_row):
+            col_map[header] = col_idx
 
-    # Build column mapping
-    header_row = list(ws.iter_rows(min_row=1, max_row=1, values_only=True))[0]
-    col_map = {}
-    for col_idx, header in enumerate(header_row):
-        col_map[header] = col_idx
+    # Resolve column positions once, not per row
+    album_id_idx = col_map.get("album_id", 0)
+    source_path_idx = col_map.get("source_path", 1)
+    default_action_idx = col_map.get("default_action", 9)
+    user_action_idx = col_map.get("user_action", 10)
+    aac_kbps_idx = col_map.get("aac_target_kbps", 11)
+    skip_idx = col_map.get("skip", 12)
 
     decisions = []
-    for row in ws.iter_rows(min_row=2, values_only=True):
-        if not row or not row[col_map.get("album_id", 0)]:
-            continue
-
-        album_id = str(row[col_map["album_id"]])
-        source_path = row[col_map.get("source_path", 1)] or ""
-        default_action = row[col_map.get("default_action", 9)] or ""
-        user_action = row[col_map.get("user_action", 10)] or ""
-        aac_kbps = row[col_map.get("aac_target_kbps", 11)]
-        skip_val = row[col_map.get("skip", 12)]
+    for album_id, row in _iter_album_rows(rows, album_id_idx):
+        source_path = row[source_path_idx] or ""
+        default_action = row[default_action_idx] or ""
+        user_action = row[user_action_idx] or ""
+        aac_kbps = row[aac_kbps_idx]
+        skip_val = row[skip_idx]
 
         # Determine resolved action
         resolved_action = user_action if user_action else default_action
@@ -157,7 +251,7 @@ def get_album_decisions(xlsx_path: Path) -> list[dict]:
             if isinstance(skip_val, bool):
                 skip = skip_val
             elif isinstance(skip_val, str):
-                skip = skip_val.upper() in ("TRUE", "YES", "1")
+                skip = skip_val.upper() in _TRUE_STRINGS
 
         decisions.append({
             "album_id": album_id,
@@ -169,5 +263,88 @@ def get_album_decisions(xlsx_path: Path) -> list[dict]:
             "skip": skip,
         })
 
-    wb.close()
     return decisions
+
+
+def get_xlsx_library_root(xlsx_path: Path) -> Path | None:
+    """
+    Get library root from the XLSX Summary sheet.
+
+    Args:
+        xlsx_path: Path to XLSX file
+
+    Returns:
+        Library root path or None if not found
+    """
+    summary, _, _ = read_xlsx_plan(xlsx_path)
+    library_root = summary.get("library_root")
+
+    if library_root:
+        return Path(library_root)
+
+    return None
+
+
+def _load_cache(xlsx_path: Path, key: tuple[int, int]) -> XlsxPlan | None:
+    """Load the sidecar plan for a workbook version (None on miss)."""
+    try:
+        with open(xlsx_path.parent / f"{xlsx_path.name}{CACHE_SUFFIX}", encoding="utf-8") as f:
+            data = json.load(f, object_hook=_decode_value)
+        if data["version"] != CACHE_VERSION or data["key"] != list(key):
+            return None
+        summary = dict(data["summary"])
+        header = tuple(data["header"]) if data["header"] is not None else None
+        rows = [tuple(row) for row in data["rows"]]
+    except _CACHE_LOAD_ERRORS:
+        return None
+    return summary, header, rows
+
+
+def _save_cache(xlsx_path: Path, key: tuple[int, int], plan: XlsxPlan) -> None:
+    """Atomically write the sidecar; a read-only directory just skips caching."""
+    summary, header, rows = plan
+    data = {
+        "version": CACHE_VERSION,
+        "key": key,
+        # Pairs, since Summary keys are cell values and need not be strings
+        "summary": list(summary.items()),
+        "header": header,
+        "rows": rows,
+    }
+    try:
+        # Unique temp name, so concurrent runs never write the same file
+        fd, temp_name = tempfile.mkstemp(
+            prefix=f".{xlsx_path.name}.", suffix=".tmp", dir=xlsx_path.parent
+        )
+    except OSError:
+        return
+    try:
+        with open(fd, "w", encoding="utf-8") as f:
+            json.dump(data, f, default=_encode_value)
+        os.replace(temp_name, xlsx_path.parent / f"{xlsx_path.name}{CACHE_SUFFIX}")
+    except (OSError, TypeError, ValueError):
+        Path(temp_name).unlink(missing_ok=True)
+
+
+def _encode_value(value: Any) -> dict[str, str]:
+    """Tag a date/time cell value for JSON (see _CACHE_VALUE_TAGS)."""
+    # datetime first: it is also a date
+    if isinstance(value, datetime):
+        return {"$datetime": value.isoformat()}
+    if isinstance(value, date):
+        return {"$date": value.isoformat()}
+    if isinstance(value, time):
+        return {"$time": value.isoformat()}
+    if isinstance(value, timedelta):
+        return {"$timedelta": repr(value.total_seconds())}
+    raise TypeError(f"Cannot cache cell value of type {type(value).__name__}")
+
+
+def _decode_value(obj: dict[str, Any]) -> Any:
+    """Parse a tagged date/time value back (other objects pass through)."""
+    if len(obj) == 1:
+        tag, text = next(iter(obj.items()))
+        parse = _CACHE_VALUE_TAGS.get(tag)
+        if parse is not None:
+            return parse(text)
+    return obj
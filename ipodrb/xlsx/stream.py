@@ -0,0 +1,284 @@
+"""Streaming worksheet reader for XLSX files."""
+
+import posixpath
+import zipfile
+from collections.abc import Iterator
+from functools import lru_cache
+from pathlib import Path
+from typing import Any
+from xml.etree.ElementTree import Element, ElementTree, ParseError, iterparse
+
+from openpyxl import load_workbook
+from openpyxl.styles.numbers import BUILTIN_FORMATS, is_date_format, is_timedelta_format
+from openpyxl.utils.cell import column_index_from_string
+from openpyxl.utils.datetime import (
+    CALENDAR_MAC_1904,
+    CALENDAR_WINDOWS_1900,
+    from_excel,
+    from_ISO8601,
+)
+
+# SpreadsheetML namespaces (transitional OOXML, as written by Excel,
+# LibreOffice and openpyxl)
+_MAIN_NS = "{http://schemas.openxmlformats.org/spreadsheetml/2006/main}"
+_REL_NS = "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}"
+_PKG_REL_NS = "{http://schemas.openxmlformats.org/package/2006/relationships}"
+
+_ROW = f"{_MAIN_NS}row"
+_CELL = f"{_MAIN_NS}c"
+_VALUE = f"{_MAIN_NS}v"
+_INLINE = f"{_MAIN_NS}is"
+_TEXT = f"{_MAIN_NS}t"
+_RUN = f"{_MAIN_NS}r"
+_DIMENSION = f"{_MAIN_NS}dimension"
+
+_WORKBOOK_PART = "xl/workbook.xml"
+
+# Errors that mean the file is not laid out the way StreamingWorkbook
+# expects; open_workbook falls back to openpyxl for these
+_LAYOUT_ERRORS = (KeyError, ValueError, ParseError, zipfile.BadZipFile)
+
+
+class StreamingWorkbook:
+    """
+    Read-only view of an XLSX file's cell values, parsed straight from XML.
+
+    Rows are produced from the worksheet XML with iterparse and never
+    become openpyxl Cell objects. Values match openpyxl's
+    read_only/data_only/values_only output: shared and inline strings,
+    ints and floats, booleans, and datetimes for date-formatted numbers.
+    """
+
+    def __init__(self, xlsx_path: Path):
+        """
+        Open the workbook and load its sheet list, shared strings and date styles.
+
+        Args:
+            xlsx_path: Path to XLSX file
+
+        Raises:
+            KeyError, ValueError, ParseError, BadZipFile: If the file is not
+                a transitional-OOXML workbook with the usual part layout
+        """
+        self._zip = zipfile.ZipFile(xlsx_path)
+        try:
+            self._load_workbook_parts()
+        except BaseException:
+            self._zip.close()
+            raise
+
+    def _load_workbook_parts(self) -> None:
+        """Read workbook.xml, its relationships, shared strings and styles."""
+        with self._zip.open(_WORKBOOK_PART) as f:
+            workbook = _parse(f)
+        if workbook.tag != f"{_MAIN_NS}workbook":
+            raise ValueError(f"Unexpected workbook root: {workbook.tag}")
+
+        pr = workbook.find(f"{_MAIN_NS}workbookPr")
+        date1904 = pr is not None and pr.get("date1904") in ("1", "true")
+        self._epoch = CALENDAR_MAC_1904 if date1904 else CALENDAR_WINDOWS_1900
+
+        rels_part = "xl/_rels/workbook.xml.rels"
+        with self._zip.open(rels_part) as f:
+            targets = {
+                rel.get("Id"): rel.get("Target")
+                for rel in _parse(f).iter(f"{_PKG_REL_NS}Relationship")
+            }
+
+        # Sheet name -> worksheet part
+        self._parts: dict[str, str] = {}
+        for sheet in workbook.iter(f"{_MAIN_NS}sheet"):
+            target = targets[sheet.get(f"{_REL_NS}id")]
+            if target.startswith("/"):
+                part = target.lstrip("/")
+            else:
+                part = posixpath.normpath(posixpath.join("xl", target))
+            self._parts[sheet.get("name")] = part
+        self.sheetnames = list(self._parts)
+
+        self._shared_strings = self._load_shared_strings()
+        self._date_styles = self._load_date_styles()
+
+    def _load_shared_strings(self) -> list[str]:
+        """Load the shared string table (plain text of each entry)."""
+        try:
+            f = self._zip.open("xl/sharedStrings.xml")
+        except KeyError:
+            return []
+        with f:
+            return [_string_item_text(si) for si in _parse(f).iter(f"{_MAIN_NS}si")]
+
+    def _load_date_styles(self) -> dict[int, bool]:
+        """Map each date-formatted cell style index to whether it is a duration."""
+        try:
+            f = self._zip.open("xl/styles.xml")
+        except KeyError:
+            return {}
+        with f:
+            styles = _parse(f)
+
+        formats = dict(BUILTIN_FORMATS)
+        for fmt in styles.iter(f"{_MAIN_NS}numFmt"):
+            formats[int(fmt.get("numFmtId"))] = fmt.get("formatCode", "")
+
+        cell_xfs = styles.find(f"{_MAIN_NS}cellXfs")
+        if cell_xfs is None:
+            return {}
+        date_styles = {}
+        for i, xf in enumerate(cell_xfs.iterfind(f"{_MAIN_NS}xf")):
+            code = formats.get(int(xf.get("numFmtId", 0)), "")
+            if is_date_format(code):
+                date_styles[i] = is_timedelta_format(code)
+        return date_styles
+
+    def iter_rows(self, name: str, max_row: int | None = None) -> Iterator[tuple]:
+        """
+        Yield the value tuple of each row of a sheet, starting at row 1.
+
+        Rows are padded with None to the sheet's width, and missing rows
+        are yielded as all-None rows, as openpyxl does.
+
+        Args:
+            name: Sheet name
+            max_row: Last row to read, or None for all rows
+        """
+        width = 0
+        next_row = 1
+        with self._zip.open(self._parts[name]) as f:
+            # Only "end" events: a row is complete when it is reported
+            for _, elem in iterparse(f):
+                if elem.tag == _DIMENSION:
+                    width = _dimension_width(elem.get("ref", ""))
+                if elem.tag != _ROW:
+                    continue
+
+                row_idx = int(elem.get("r", next_row))
+                if max_row is not None and row_idx > max_row:
+                    break
+                while next_row < row_idx:
+                    yield (None,) * width
+                    next_row += 1
+
+                values = self._row_values(elem)
+                width = max(width, len(values))
+                if len(values) < width:
+                    values.extend([None] * (width - len(values)))
+                yield tuple(values)
+                next_row = row_idx + 1
+
+                # Drop the parsed cells; only an empty <row> shell stays
+                # attached to sheetData, so memory stays flat on large sheets
+                elem.clear()
+
+    def _row_values(self, row: Element) -> list[Any]:
+        """Convert a <row> element's cells to a list of values by column."""
+        values: list[Any] = []
+        for cell in row.iterfind(_CELL):
+            ref = cell.get("r")
+            if ref:
+                col = _column_of(ref.rstrip("0123456789"))
+            else:
+                col = len(values)
+            if col > len(values):
+                values.extend([None] * (col - len(values)))
+            value = self._cell_value(cell)
+            if col == len(values):
+                values.append(value)
+            else:
+                values[col] = value
+        return values
+
+    def _cell_value(self, cell: Element) -> Any:
+        """Convert a <c> element to its Python value."""
+        data_type = cell.get("t", "n")
+        if data_type == "inlineStr":
+            inline = cell.find(_INLINE)
+            return _string_item_text(inline) if inline is not None else None
+
+        value = cell.findtext(_VALUE) or None
+        if value is None:
+            return None
+        if data_type == "s":
+            return self._shared_strings[int(value)]
+        if data_type == "n":
+            if "." in value or "E" in value or "e" in value:
+                number = float(value)
+            else:
+                number = int(value)
+            duration = self._date_styles.get(int(cell.get("s", 0)))
+            if duration is not None:
+                return from_excel(number, self._epoch, timedelta=duration)
+            return number
+        if data_type == "b":
+            return value == "1"
+        if data_type == "d":
+            return from_ISO8601(value)
+        # "str" (formula result) and "e" (error) are kept as text
+        return value
+
+    def close(self) -> None:
+        """Close the underlying zip file."""
+        self._zip.close()
+
+
+class _OpenpyxlWorkbook:
+    """StreamingWorkbook-compatible wrapper around an openpyxl read-only workbook."""
+
+    def __init__(self, xlsx_path: Path):
+        self._wb = load_workbook(xlsx_path, read_only=True, data_only=True)
+        self.sheetnames = self._wb.sheetnames
+
+    def iter_rows(self, name: str, max_row: int | None = None) -> Iterator[tuple]:
+        return self._wb[name].iter_rows(min_row=1, max_row=max_row, values_only=True)
+
+    def close(self) -> None:
+        self._wb.close()
+
+
+def open_workbook(xlsx_path: Path) -> StreamingWorkbook | _OpenpyxlWorkbook:
+    """
+    Open an XLSX file for reading cell values.
+
+    Uses StreamingWorkbook, or openpyxl if the file's layout is not one
+    StreamingWorkbook understands.
+
+    Args:
+        xlsx_path: Path to XLSX file
+
+    Returns:
+        Workbook with sheetnames, iter_rows(name, max_row) and close()
+    """
+    try:
+        return StreamingWorkbook(xlsx_path)
+    except _LAYOUT_ERRORS:
+        return _OpenpyxlWorkbook(xlsx_path)
+
+
+def _parse(f) -> Element:
+    """Parse a small XML part fully and return its root element."""
+    return ElementTree(file=f).getroot()
+
+
+def _string_item_text(item: Element) -> str:
+    """Plain text of a shared/inline string item, skipping phonetic runs."""
+    # Plain (not rich) text is a single <t> child
+    if len(item) == 1 and item[0].tag == _TEXT:
+        return item[0].text or ""
+    parts = [item.findtext(_TEXT) or ""]
+    parts.extend(run.findtext(_TEXT) or "" for run in item.iterfind(_RUN))
+    return "".join(parts)
+
+
+@lru_cache(maxsize=1024)
+def _column_of(letters: str) -> int:
+    """Zero-based column index of column letters like "A" or "AB"."""
+    return column_index_from_string(letters) - 1
+
+
+def _dimension_width(ref: str) -> int:
+    """Number of columns covered by a dimension ref like "A1:T120"."""
+    last = ref.rpartition(":")[2].rstrip("0123456789")
+    try:
+        return column_index_from_string(last) if last else 0
+    except ValueError:
+        return 0
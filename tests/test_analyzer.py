@@ -0,0 +1,74 @@
+"""Tests for track analysis."""
+
+import gc
+import struct
+import weakref
+from pathlib import Path
+
+from mutagen.ogg import OggPage
+
+from ipodrb.scanner import analyzer
+from ipodrb.scanner.analyzer import OPUS_SAMPLE_RATE, analyze_tracks
+
+
+def _ogg_page(sequence: int, position: int, packet: bytes, **flags) -> bytes:
+    """Serialize a single-packet Ogg page."""
+    page = OggPage()
+    page.serial = 1
+    page.sequence = sequence
+    page.position = position
+    page.packets = [packet]
+    page.first = flags.get("first", False)
+    page.last = flags.get("last", False)
+    return page.write()
+
+
+def write_opus(path: Path) -> None:
+    """Write a minimal one-second Ogg Opus stream (input rate 44.1 kHz)."""
+    head = b"OpusHead" + struct.pack("<BBHIhB", 1, 2, 312, 44100, 0, 0)
+    tags = b"OpusTags" + struct.pack("<II", 0, 0)
+    path.write_bytes(
+        _ogg_page(0, 0, head, first=True)
+        + _ogg_page(1, 0, tags)
+        + _ogg_page(2, 48_000 + 312, b"\x00", last=True)
+    )
+
+
+class TestAnalyzeTracks:
+    """Tests for probing tracks in-process."""
+
+    def test_opus_track_is_probed(self, tmp_path):
+        """Opus files should be analyzed at 48 kHz instead of failing."""
+        path = tmp_path / "track.opus"
+        write_opus(path)
+
+        [track] = analyze_tracks([path])
+
+        assert track.sample_rate == OPUS_SAMPLE_RATE
+        assert track.channels == 2
+        assert track.duration_seconds == 1.0
+
+    def test_files_are_released_one_at_a_time(self, tmp_path, monkeypatch):
+        """Only one parsed file (with its embedded art) should be alive at a time."""
+        paths = [tmp_path / f"{n}.opus" for n in range(3)]
+        for path in paths:
+            write_opus(path)
+        real_open_audio = analyzer.open_audio
+        opened: list[weakref.ref] = []
+        max_alive = 0
+
+        def tracking_open_audio(path):
+            nonlocal max_alive
+            gc.collect()
+            audio = real_open_audio(path)
+            opened.append(weakref.ref(audio))
+            max_alive = max(max_alive, sum(ref() is not None for ref in opened))
+            return audio
+
+        monkeypatch.setattr(analyzer, "open_audio", tracking_open_audio)
+
+        tracks = analyze_tracks(paths)
+
+        assert len(opened) == 3
+        assert max_alive == 1
+        assert all(track.sample_rate == OPUS_SAMPLE_RATE for track in tracks)
@@ -0,0 +1,139 @@
+"""Tests for the SQLite conversion cache."""
+
+from dataclasses import replace
+from pathlib import Path
+
+import pytest
+
+from ipodrb.cache.manager import CacheManager
+from ipodrb.models.plan import Action, TrackJob, TrackResult
+
+
+def make_job(
+    name: str = "track",
+    source_mtime: float = 1234567890.0,
+    source_size: int = 50_000_000,
+    settings_hash: str = "abc123",
+) -> TrackJob:
+    """Create a test TrackJob for the given track name."""
+    return TrackJob(
+        album_id="test123",
+        source_path=Path(f"/input/{name}.flac"),
+        output_path=Path(f"/output/{name}.m4a"),
+        source_sample_rate=44100,
+        source_bit_depth=16,
+        action=Action.ALAC_PRESERVE,
+        target_codec="alac",
+        target_sample_rate=44100,
+        target_bit_depth=16,
+        source_mtime=source_mtime,
+        source_size=source_size,
+        settings_hash=settings_hash,
+    )
+
+
+def make_result(job: TrackJob, success: bool = True) -> TrackResult:
+    """Create a test TrackResult for a job."""
+    return TrackResult(
+        source_path=job.source_path,
+        output_path=job.output_path,
+        success=success,
+        output_codec="alac",
+        output_sample_rate=44100,
+        output_bit_depth=16,
+        output_size_bytes=30_000_000,
+        duration_seconds=180.0,
+    )
+
+
+@pytest.fixture
+def cache(tmp_path: Path):
+    """Create a cache manager backed by a temporary database."""
+    manager = CacheManager(tmp_path / "cache.db")
+    yield manager
+    manager.close()
+
+
+class TestStoreAndLookup:
+    """Tests for storing and looking up cache entries."""
+
+    def test_store_then_lookup_hits(self, cache):
+        """A stored successful result should be returned by lookup."""
+        job = make_job()
+        cache.store(job, make_result(job))
+
+        cached = cache.lookup(job)
+        assert cached is not None
+        assert cached["output_codec"] == "alac"
+        assert cached["output_size_bytes"] == 30_000_000
+
+    def test_failed_result_not_stored(self, cache):
+        """Failed results should never be cached."""
+        job = make_job()
+        cache.store(job, make_result(job, success=False))
+        assert cache.lookup(job) is None
+
+    def test_changed_source_misses(self, cache):
+        """A change in source size, mtime or settings should invalidate."""
+        job = make_job()
+        cache.store(job, make_result(job))
+
+        assert cache.lookup(make_job(source_size=1)) is None
+        assert cache.lookup(make_job(source_mtime=1.0)) is None
+        assert cache.lookup(make_job(settings_hash="other")) is None
+
+    def test_store_many_single_batch(self, cache):
+        """store_many should persist every successful pair."""
+        jobs = [make_job(f"track{i}") for i in range(5)]
+        pairs = [(job, make_result(job, success=i != 2)) for i, job in enumerate(jobs)]
+        cache.store_many(pairs)
+
+        assert cache.get_stats()["entry_count"] == 4
+        assert cache.lookup(jobs[2]) is None
+
+    def test_reopens_after_close(self, cache):
+        """Operations after close() should transparently reconnect."""
+        job = make_job()
+        cache.store(job, make_result(job))
+        cache.close()
+        assert cache.lookup(job) is not None
+
+    def test_entries_persist_across_instances(self, cache):
+        """Queued writes should reach SQLite and reload into a new index."""
+        jobs = [make_job(f"track{i}") for i in range(200)]
+        cache.store_many([(job, make_result(job)) for job in jobs])
+        cache.close()
+
+        reopened = CacheManager(cache.db_path)
+        try:
+            assert reopened.get_stats()["entry_count"] == 200
+            assert reopened.lookup(jobs[-1]) is not None
+        finally:
+            reopened.close()
+
+    def test_lookup_many_returns_only_valid(self, cache):
+        """lookup_many should key valid entries by source path string."""
+        jobs = [make_job(f"track{i}") for i in range(3)]
+        cache.store_many([(job, make_result(job)) for job in jobs[:2]])
+
+        stale = make_job("track1", source_size=1)
+        entries = cache.lookup_many([jobs[0], stale, jobs[2]])
+
+        assert set(entries) == {str(jobs[0].source_path)}
+
+
+class TestPruneMissing:
+    """Tests for pruning entries whose outputs are gone."""
+
+    def test_prune_removes_only_missing_outputs(self, cache, tmp_path):
+        """Entries with existing output files should survive pruning."""
+        kept = make_job("kept")
+        kept = replace(kept, output_path=tmp_path / "kept.m4a")
+        kept.output_path.write_bytes(b"data")
+        gone = [make_job(f"gone{i}") for i in range(3)]
+
+        cache.store_many([(job, make_result(job)) for job in [kept, *gone]])
+
+        assert cache.prune_missing() == 3
+        assert cache.get_stats()["entry_count"] == 1
+        assert cache.lookup(kept) is not None
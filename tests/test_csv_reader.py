@@ -0,0 +1,190 @@
+"""Tests for reading CSV/TSV plan files."""
+
+import csv
+import io
+import os
+from pathlib import Path
+
+import pytest
+
+from ipodrb.csv_io import reader
+
+PLAN_HEADER = [
+    "# iPod Audio Converter - Conversion Plan (TSV)",
+    "# Schema: 1.0",
+    "# Library: /music",
+    "# Albums: 3",
+    "# Tracks: 30",
+    "# Size: 12.5 MB",
+]
+
+ALBUM_ROWS = [
+    ["album_id", "user_action", "aac_bitrate_kbps", "skip", "default_action", "tag_status"],
+    ["a1", "AAC", "256", "", "ALAC_PRESERVE", "GREEN"],
+    ["a2", "", "not a number", "TRUE", "ALAC_16_44", "RED"],
+    ["", "AAC", "", "", "", ""],  # No album_id: ignored
+    ["a3", "", "", "yes"],  # Short row
+]
+
+
+def write_plan(
+    path: Path,
+    rows: list[list[str]],
+    delimiter: str = "\t",
+    comments: list[str] = PLAN_HEADER,
+) -> Path:
+    """Write a plan file with comment lines followed by delimited rows."""
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        for line in comments:
+            f.write(line + "\n")
+        csv.writer(f, delimiter=delimiter, lineterminator="\n").writerows(rows)
+    return path
+
+
+def dictreader_decisions(path: Path, delimiter: str) -> list[dict]:
+    """Decisions as the DictReader-based reader used to build them."""
+    with open(path, newline="", encoding="utf-8") as f:
+        lines = [line for line in f if not line.startswith("#")]
+    decisions = []
+    for album in csv.DictReader(io.StringIO("".join(lines)), delimiter=delimiter):
+        if not album.get("album_id"):
+            continue
+        try:
+            bitrate = int(album["aac_bitrate_kbps"]) if album.get("aac_bitrate_kbps") else None
+        except ValueError:
+            bitrate = None
+        decisions.append({
+            "album_id": album.get("album_id", ""),
+            "user_action": album.get("user_action") or None,
+            "aac_target_kbps": bitrate,
+            "skip": album.get("skip", "").lower() in ("true", "yes", "1"),
+        })
+    return decisions
+
+
+@pytest.fixture(autouse=True)
+def clear_plan_cache():
+    """Start every test with an empty parsed-plan cache."""
+    reader._read_csv_plan_cached.cache_clear()
+
+
+class TestReadCsvPlan:
+    """Tests for parsing plan files."""
+
+    def test_metadata_columns_and_rows(self, tmp_path):
+        """Comments become metadata; rows without an album_id are dropped and short rows padded."""
+        path = write_plan(tmp_path / "plan.tsv", ALBUM_ROWS)
+
+        metadata, columns, rows = reader.read_csv_plan(path)
+
+        assert metadata == {
+            "schema_version": "1.0",
+            "library_root": "/music",
+            "total_albums": 3,
+            "total_tracks": 30,
+            "total_size_mb": 12.5,
+        }
+        assert columns == {name: i for i, name in enumerate(ALBUM_ROWS[0])}
+        assert [row[columns["album_id"]] for row in rows] == ["a1", "a2", "a3"]
+        assert rows[2][columns["tag_status"]] == ""
+
+    def test_reordered_columns(self, tmp_path):
+        """Values should be read by column name, whatever the column order."""
+        order = [5, 3, 0, 2, 4, 1]
+        rows = [[row[i] if i < len(row) else "" for i in order] for row in ALBUM_ROWS]
+        path = write_plan(tmp_path / "plan.tsv", rows)
+
+        decisions = reader.get_csv_decisions(path)
+
+        assert decisions == reader.get_csv_decisions(
+            write_plan(tmp_path / "original.tsv", ALBUM_ROWS)
+        )
+        assert decisions[0] == {
+            "album_id": "a1",
+            "user_action": "AAC",
+            "aac_target_kbps": 256,
+            "skip": False,
+        }
+
+    def test_missing_album_id_column_has_no_albums(self, tmp_path):
+        """A plan without an album_id column yields no album rows."""
+        path = write_plan(tmp_path / "plan.tsv", [["user_action", "skip"], ["AAC", ""]])
+
+        _, columns, rows = reader.read_csv_plan(path)
+
+        assert columns == {"user_action": 0, "skip": 1}
+        assert rows == []
+
+    def test_missing_file_raises(self, tmp_path):
+        """A missing plan file should raise FileNotFoundError."""
+        with pytest.raises(FileNotFoundError, match="Plan file not found"):
+            reader.read_csv_plan(tmp_path / "missing.tsv")
+
+
+class TestDetectDelimiter:
+    """Tests for choosing the delimiter of plan files."""
+
+    @pytest.mark.parametrize("delimiter", [",", "\t"])
+    def test_sniffed_past_long_comment_line(self, tmp_path, delimiter):
+        """Comment lines longer than any read buffer must not hide the first data line."""
+        comments = ["# Library: /" + "x" * 20_000, *PLAN_HEADER]
+        path = write_plan(tmp_path / "plan.txt", ALBUM_ROWS, delimiter, comments)
+
+        assert reader.detect_delimiter(path) == delimiter
+        assert reader.get_csv_decisions(path) == dictreader_decisions(path, delimiter)
+
+    def test_extension_wins(self, tmp_path):
+        """The .csv and .tsv extensions decide without reading the file."""
+        assert reader.detect_delimiter(tmp_path / "missing.csv") == ","
+        assert reader.detect_delimiter(tmp_path / "missing.tsv") == "\t"
+
+
+class TestPlanCache:
+    """Tests for reusing parsed plans of unchanged files."""
+
+    def test_unchanged_file_is_parsed_once(self, tmp_path):
+        """Repeated reads of an unchanged file should share one parse."""
+        path = write_plan(tmp_path / "plan.tsv", ALBUM_ROWS)
+
+        assert reader.read_csv_plan(path) is reader.read_csv_plan(path)
+        assert reader._read_csv_plan_cached.cache_info().misses == 1
+
+    def test_rewritten_file_is_reparsed(self, tmp_path):
+        """Rewriting the file, even at the same size, should invalidate the cache."""
+        path = write_plan(tmp_path / "plan.tsv", ALBUM_ROWS)
+        assert reader.get_csv_decisions(path)[0]["user_action"] == "AAC"
+
+        edited = [row.copy() for row in ALBUM_ROWS]
+        edited[1][1] = "ALAC"  # One byte longer than "AAC"
+        write_plan(path, edited)
+        assert reader.get_csv_decisions(path)[0]["user_action"] == "ALAC"
+
+        size = path.stat().st_size
+        edited[1][1] = "SKIP"  # Same size as the previous version
+        write_plan(path, edited)
+        st = path.stat()
+        assert st.st_size == size
+        os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+        assert reader.get_csv_decisions(path)[0]["user_action"] == "SKIP"
+
+
+class TestGetCsvDecisions:
+    """Tests for building album decisions."""
+
+    @pytest.mark.parametrize("delimiter, suffix", [("\t", ".tsv"), (",", ".csv")])
+    def test_matches_dictreader(self, tmp_path, delimiter, suffix):
+        """Decisions should equal those the DictReader-based parser produced."""
+        path = write_plan(tmp_path / f"plan{suffix}", ALBUM_ROWS, delimiter)
+
+        assert reader.get_csv_decisions(path) == dictreader_decisions(path, delimiter)
+
+    def test_library_root_and_summary(self, tmp_path):
+        """Summary counts should honour user actions and skip flags."""
+        path = write_plan(tmp_path / "plan.tsv", ALBUM_ROWS)
+
+        summary = reader.get_csv_summary(path)
+
+        assert reader.get_csv_library_root(path) == Path("/music")
+        assert summary["total_albums"] == 3
+        assert summary["action_counts"] == {"AAC": 1, "SKIP": 2}
+        assert summary["tag_status_counts"] == {"GREEN": 1, "RED": 1, "": 1}
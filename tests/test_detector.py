@@ -0,0 +1,47 @@
+"""Tests for album detection."""
+
+import os
+from pathlib import Path
+
+from ipodrb.models.config import ScanConfig
+from ipodrb.scanner import detector
+from ipodrb.scanner.detector import PROCESS_MIN_ALBUMS, detect_albums
+
+
+def crash_on_bad_album(
+    library_root: Path,
+    album_path: Path,
+    audio_files: list[Path],
+    file_names: list[str],
+    **kwargs,
+) -> None:
+    """Record each analysis attempt; kill the worker process for the "bad" album."""
+    with open(library_root / "attempts.log", "a") as log:
+        log.write(f"{album_path.name}\n")
+    if album_path.name == "bad":
+        os._exit(1)
+    return None
+
+
+class TestDetectAlbums:
+    """Tests for scanning albums in worker processes."""
+
+    def test_crashed_pool_retries_albums_once(self, tmp_path, monkeypatch):
+        """Albums failed by another album's crash are retried, not all isolated."""
+        names = ["bad"] + [f"album{n:03d}" for n in range(PROCESS_MIN_ALBUMS)]
+        for name in names:
+            (tmp_path / name).mkdir()
+            (tmp_path / name / "01.flac").write_bytes(b"")
+        scan_config = ScanConfig(
+            library_root=tmp_path,
+            xlsx_path=tmp_path / "plan.xlsx",
+            threads=2,
+            cache_db_name=None,
+        )
+        monkeypatch.setattr(detector, "_analyze_album_safe", crash_on_bad_album)
+
+        detect_albums(tmp_path, scan_config)
+
+        attempts = (tmp_path / "attempts.log").read_text().split()
+        assert attempts.count("bad") == 3  # First run, retry, then isolated
+        assert set(attempts) == set(names)
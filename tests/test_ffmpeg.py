@@ -1,12 +1,16 @@
 """Tests for FFmpeg command building."""
 
 import pytest
+from dataclasses import replace
 from pathlib import Path
 
 from ipodrb.models.plan import Action, TrackJob
+from ipodrb.converter import ffmpeg
 from ipodrb.converter.ffmpeg import (
     build_alac_command,
     build_aac_command,
+    build_batch_command,
+    build_ffmpeg_command,
     build_passthrough_command,
 )
 
@@ -20,6 +24,7 @@ def make_job(
     action: Action = Action.ALAC_PRESERVE,
     apply_dither: bool = False,
     aac_bitrate_kbps: int | None = None,
+    source_codec: str | None = "flac",
 ) -> TrackJob:
     """Create a test TrackJob with specified parameters."""
     return TrackJob(
@@ -29,6 +34,7 @@ def make_job(
         source_sample_rate=source_sample_rate,
         source_bit_depth=source_bit_depth,
         source_channels=source_channels,
+        source_codec=source_codec,
         action=action,
         target_codec="alac" if action != Action.AAC else "aac",
         target_sample_rate=target_sample_rate,
@@ -54,9 +60,10 @@ class TestBuildAlacCommand:
         )
         cmd = build_alac_command(job, Path("/tmp/out.m4a"))
 
-        # Should not have aresample filter (no conversion needed)
+        # Should not have any filter stage (no conversion needed)
         cmd_str = " ".join(cmd)
         assert "aresample" not in cmd_str
+        assert "-af" not in cmd
         assert "-c:a alac" in cmd_str
         assert "-ar 44100" in cmd_str
         assert "-sample_fmt s16p" in cmd_str
@@ -76,6 +83,8 @@ class TestBuildAlacCommand:
         assert "aresample=48000" in cmd_str
         assert "resampler=soxr" in cmd_str
         assert "precision=28" in cmd_str
+        # Resampler sets the output rate; no redundant -ar stage
+        assert "-ar" not in cmd
 
     def test_bit_depth_reduction_applies_dither(self):
         """Bit depth reduction should apply triangular HP dither."""
@@ -122,6 +131,17 @@ class TestBuildAlacCommand:
         assert "volume=-3dB" in cmd_str
         assert "-ac 2" in cmd_str
 
+    def test_48khz_target_same_rate_skips_resample(self):
+        """Same-rate 48kHz jobs should not be resampled."""
+        job = make_job(
+            source_sample_rate=48000,
+            target_sample_rate=48000,
+        )
+        cmd = build_alac_command(job, Path("/tmp/out.m4a"))
+
+        assert "-af" not in cmd
+        assert "-ar 48000" in " ".join(cmd)
+
     def test_stereo_no_headroom(self):
         """Stereo sources should not apply headroom reduction."""
         job = make_job(
@@ -134,6 +154,34 @@ class TestBuildAlacCommand:
 
         assert "volume=-3dB" not in cmd_str
 
+    def test_matching_alac_source_is_copied(self):
+        """ALAC already at the target rate/depth should be remuxed, not re-encoded."""
+        job = make_job(source_codec="alac")
+        cmd = build_alac_command(job, Path("/tmp/out.m4a"))
+        cmd_str = " ".join(cmd)
+
+        assert "-c:a copy" in cmd_str
+        assert "-af" not in cmd
+
+    def test_alac_source_needing_conversion_is_encoded(self):
+        """ALAC sources that need resampling must still go through the encoder."""
+        job = make_job(
+            source_codec="alac",
+            source_sample_rate=96000,
+            source_bit_depth=24,
+        )
+        cmd = build_alac_command(job, Path("/tmp/out.m4a"))
+        cmd_str = " ".join(cmd)
+
+        assert "-c:a alac" in cmd_str
+        assert "aresample=44100" in cmd_str
+
+    def test_faststart_for_mp4_output(self):
+        """ALAC output should put the moov atom first for iPod playback."""
+        for job in (make_job(), make_job(source_codec="alac")):
+            cmd = build_alac_command(job, Path("/tmp/out.m4a"))
+            assert cmd[-3:] == ["-movflags", "+faststart", "/tmp/out.m4a"]
+
     def test_24bit_output_uses_s32p(self):
         """24-bit ALAC should use s32p sample format."""
         job = make_job(
@@ -163,6 +211,8 @@ class TestBuildAacCommand:
         assert "-c:a aac" in cmd_str
         assert "-profile:a aac_low" in cmd_str
         assert "-b:a 256k" in cmd_str
+        # Worker pool controls parallelism, not FFmpeg
+        assert "-threads 1" in cmd_str
 
     def test_aac_resampling(self):
         """AAC should resample hi-res sources."""
@@ -177,6 +227,8 @@ class TestBuildAacCommand:
 
         assert "aresample=48000" in cmd_str
         assert "resampler=soxr" in cmd_str
+        assert "precision=20" in cmd_str
+        assert "-ar" not in cmd
 
     def test_aac_multichannel_headroom(self):
         """AAC should apply headroom for multichannel downmix."""
@@ -215,3 +267,97 @@ class TestBuildPassthroughCommand:
 
         assert "-c:a copy" in cmd_str
         assert "-vn" in cmd_str
+
+
+class TestBuildFfmpegCommand:
+    """Tests for action dispatch and command template reuse."""
+
+    def test_matches_direct_builder(self):
+        """Dispatched commands should equal the per-action builder output."""
+        job = make_job(source_sample_rate=96000, target_sample_rate=48000)
+        out = Path("/tmp/out.m4a")
+        assert build_ffmpeg_command(job, out) == build_alac_command(job, out)
+
+    def test_template_fills_paths_per_job(self):
+        """Jobs sharing settings should get their own input/output paths."""
+        job_a = make_job()
+        job_b = replace(job_a, source_path=Path("/input/other.flac"))
+
+        cmd_a = build_ffmpeg_command(job_a, Path("/tmp/a.m4a"))
+        cmd_b = build_ffmpeg_command(job_b, Path("/tmp/b.m4a"))
+
+        assert "/input/track.flac" in cmd_a and "/tmp/a.m4a" in cmd_a
+        assert "/input/other.flac" in cmd_b and "/tmp/b.m4a" in cmd_b
+
+    def test_skip_action_rejected(self):
+        """Actions without a command builder should raise ValueError."""
+        job = make_job(action=Action.SKIP)
+        with pytest.raises(ValueError):
+            build_ffmpeg_command(job, Path("/tmp/out.m4a"))
+
+
+class TestBuildBatchCommand:
+    """Tests for multi-track FFmpeg commands."""
+
+    def test_each_output_keeps_its_own_options(self):
+        """Every track should map its own input with its single-track options."""
+        job_a = make_job()
+        job_b = replace(
+            make_job(source_sample_rate=96000), source_path=Path("/input/other.flac")
+        )
+        outs = [Path("/tmp/a.m4a"), Path("/tmp/b.m4a")]
+
+        cmd = build_batch_command([job_a, job_b], outs)
+        single_b = build_ffmpeg_command(job_b, outs[1])
+
+        assert cmd.count("-i") == 2
+        assert cmd[cmd.index("1:a:0") + 1 :] == single_b[single_b.index("-vn") + 1 :]
+        assert "aresample" not in " ".join(cmd[: cmd.index("/tmp/a.m4a")])
+
+    def test_each_output_takes_its_own_metadata(self):
+        """Each output should copy tags and chapters from its own input, not the first."""
+        jobs = [
+            replace(make_job(), source_path=Path(f"/input/{n}.flac")) for n in range(3)
+        ]
+        outs = [Path(f"/tmp/{n}.m4a") for n in range(3)]
+
+        cmd = build_batch_command(jobs, outs)
+
+        start = 0
+        for i, out in enumerate(outs):
+            end = cmd.index(str(out))
+            block = cmd[start:end]
+            assert block[block.index("-map_metadata") + 1] == str(i)
+            assert block[block.index("-map_chapters") + 1] == str(i)
+            assert block[block.index("-map") + 1] == f"{i}:a:0"
+            start = end + 1
+
+    def test_mixed_remux_and_reencode(self):
+        """A stream-copied ALAC track and a re-encode should each keep their own options."""
+        remux = replace(make_job(source_codec="alac"), source_path=Path("/input/a.m4a"))
+        reencode = make_job(source_sample_rate=96000)
+        outs = [Path("/tmp/a.m4a"), Path("/tmp/b.m4a")]
+
+        cmd = build_batch_command([remux, reencode], outs)
+
+        for i, (job, out) in enumerate(zip([remux, reencode], outs, strict=True)):
+            single = build_ffmpeg_command(job, out)
+            start = cmd.index(f"{i}:a:0") + 1
+            end = cmd.index(str(out)) + 1
+            assert cmd[start:end] == single[single.index("-vn") + 1 :]
+
+    def test_mismatched_global_options_rejected(self, monkeypatch):
+        """Jobs whose commands differ before -i cannot share one FFmpeg run."""
+        real = ffmpeg.build_ffmpeg_command
+
+        def build(job, temp_output, ffmpeg_path="ffmpeg"):
+            cmd = real(job, temp_output, ffmpeg_path)
+            if job.source_codec == "alac":
+                cmd.insert(1, "-xerror")
+            return cmd
+
+        monkeypatch.setattr(ffmpeg, "build_ffmpeg_command", build)
+        jobs = [make_job(), make_job(source_codec="alac")]
+
+        with pytest.raises(ValueError):
+            build_batch_command(jobs, [Path("/tmp/a.m4a"), Path("/tmp/b.m4a")])
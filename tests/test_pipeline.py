@@ -0,0 +1,105 @@
+"""Tests for the conversion pipeline."""
+
+import json
+from dataclasses import replace
+from pathlib import Path
+
+import pytest
+
+from ipodrb.cache.manager import CacheManager
+from ipodrb.converter.pipeline import ConversionPipeline
+from ipodrb.models.config import ApplyConfig
+from ipodrb.models.plan import Action, BuildPlan, TrackJob, TrackResult
+
+
+def make_job(tmp_path: Path) -> TrackJob:
+    """Create a test TrackJob under a temporary output root."""
+    return TrackJob(
+        album_id="test123",
+        source_path=tmp_path / "input" / "track.flac",
+        output_path=tmp_path / "output" / "track.m4a",
+        source_sample_rate=44100,
+        source_bit_depth=16,
+        action=Action.ALAC_PRESERVE,
+        target_codec="alac",
+        target_sample_rate=44100,
+        target_bit_depth=16,
+        source_mtime=1234567890.0,
+        source_size=50_000_000,
+    )
+
+
+class TestExecute:
+    """Tests for running a build plan."""
+
+    def test_interrupted_build_keeps_cached_results(self, tmp_path, monkeypatch):
+        """Results stored before an interruption should be flushed to the cache."""
+        job = make_job(tmp_path)
+        config = ApplyConfig(xlsx_path=tmp_path / "plan.xlsx", output_root=tmp_path / "output")
+        pipeline = ConversionPipeline(config)
+
+        def interrupted_run(jobs: list[TrackJob]) -> list[TrackResult]:
+            result = TrackResult(
+                source_path=job.source_path, output_path=job.output_path, success=True
+            )
+            pipeline.cache.store_many([(job, result)])
+            raise KeyboardInterrupt
+
+        monkeypatch.setattr(pipeline, "_run_parallel", interrupted_run)
+
+        with pytest.raises(KeyboardInterrupt):
+            pipeline.execute(BuildPlan(jobs=[job]))
+
+        cache = CacheManager(config.output_root / config.cache_db_name)
+        try:
+            assert cache.lookup(job) is not None
+        finally:
+            cache.close()
+
+    def test_interrupted_build_closes_conversion_log(self, tmp_path, monkeypatch):
+        """Track records logged before an interruption should be flushed to the JSONL log."""
+        job = make_job(tmp_path)
+        config = ApplyConfig(xlsx_path=tmp_path / "plan.xlsx", output_root=tmp_path / "output")
+        pipeline = ConversionPipeline(config)
+
+        def interrupted_run(jobs: list[TrackJob]) -> list[TrackResult]:
+            result = TrackResult(
+                source_path=job.source_path, output_path=job.output_path, success=True
+            )
+            pipeline.conversion_log.log_track(job, result)
+            raise KeyboardInterrupt
+
+        monkeypatch.setattr(pipeline, "_run_parallel", interrupted_run)
+
+        with pytest.raises(KeyboardInterrupt):
+            pipeline.execute(BuildPlan(jobs=[job]))
+
+        assert pipeline.conversion_log._jsonl is None
+        [log_path] = (config.output_root / ".logs").glob("conversion_log_*.jsonl")
+        records = [json.loads(line) for line in log_path.read_text().splitlines()]
+        assert [r["type"] for r in records] == ["track"]
+        assert records[0]["data"]["source_path"] == str(job.source_path)
+
+
+class TestRunParallel:
+    """Tests for splitting jobs across the worker pool."""
+
+    def test_single_album_spreads_across_pool(self, tmp_path, monkeypatch):
+        """An album with fewer batches than workers should be split, not run on one core."""
+        job = make_job(tmp_path)
+        jobs = [replace(job, source_path=tmp_path / "input" / f"{n}.flac") for n in range(16)]
+        config = ApplyConfig(
+            xlsx_path=tmp_path / "plan.xlsx", output_root=tmp_path / "output", threads=8
+        )
+        pipeline = ConversionPipeline(config)
+        calls = []
+        monkeypatch.setattr(
+            pipeline, "_run_pool", lambda batches, workers: calls.append((batches, workers))
+        )
+
+        pipeline._run_parallel(jobs)
+
+        [(batches, workers)] = calls
+        assert workers == 8
+        assert [len(b) for b in batches] == [2] * 8
+        assert [j for b in batches for j in b] == jobs
@@ -0,0 +1,74 @@
+"""Tests for the scan cache."""
+
+import pickle
+from pathlib import Path
+
+import pytest
+
+from ipodrb.models.album import Album, AlbumMetadata, AudioFormat
+from ipodrb.scanner.cache import ScanCache
+
+
+@pytest.fixture
+def cache(tmp_path: Path):
+    """Create a scan cache backed by a temporary database."""
+    scan_cache = ScanCache(tmp_path / "scan.db")
+    yield scan_cache
+    scan_cache.close()
+
+
+class TestScanCache:
+    """Tests for storing and looking up scan results."""
+
+    def test_put_then_get_hits(self, cache):
+        """Stored data should be returned while mtime and size match."""
+        data = {"probe": {"codec": "flac"}, "metadata": {"title": "Song"}}
+        cache.put("/music/a.flac", 1_000, 2_000, data)
+
+        assert cache.get("/music/a.flac", 1_000, 2_000) == data
+
+    def test_changed_file_misses(self, cache):
+        """A different mtime or size should invalidate the entry."""
+        cache.put("/music/a.flac", 1_000, 2_000, {"probe": {}})
+
+        assert cache.get("/music/a.flac", 1_001, 2_000) is None
+        assert cache.get("/music/a.flac", 1_000, 2_001) is None
+
+    def test_pickled_cache_shares_database(self, cache):
+        """An unpickled copy (as in a worker process) should see stored entries."""
+        cache.put("/music/a.flac", 1_000, 2_000, {"probe": {"codec": "flac"}})
+
+        copy = pickle.loads(pickle.dumps(cache))
+        try:
+            assert copy.get("/music/a.flac", 1_000, 2_000) == {"probe": {"codec": "flac"}}
+        finally:
+            copy.close()
+
+    def test_album_round_trip(self, cache):
+        """A stored album should come back only while its fingerprint matches."""
+        album = Album(
+            album_id="abc123",
+            source_path=Path("/music/Artist/Album"),
+            tracks=[],
+            metadata=AlbumMetadata(artist="Artist", album="Album"),
+            source_formats={AudioFormat.FLAC},
+        )
+        cache.put_album("/music/Artist/Album", "fp1", album)
+
+        assert cache.get_album("/music/Artist/Album", "fp1") == album
+        assert cache.get_album("/music/Artist/Album", "fp2") is None
+
+    def test_album_rewrite_replaces_entry(self, cache):
+        """Re-analyzing an album should replace its row, not add another."""
+        album = Album(
+            album_id="abc123",
+            source_path=Path("/music/Artist/Album"),
+            tracks=[],
+            metadata=AlbumMetadata(artist="Artist", album="Album"),
+        )
+        cache.put_album("/music/Artist/Album", "fp1", album)
+        cache.put_album("/music/Artist/Album", "fp2", album)
+
+        assert cache.get_album("/music/Artist/Album", "fp1") is None
+        count = cache._get_conn().execute("SELECT COUNT(*) FROM album_scans").fetchone()
+        assert count == (1,)
@@ -0,0 +1,131 @@
+"""Tests for single track conversion."""
+
+import os
+import time
+from dataclasses import replace
+from pathlib import Path
+
+import pytest
+
+from ipodrb.converter import transcoder
+from ipodrb.converter.transcoder import (
+    STALE_TEMP_AGE,
+    TEMP_PREFIX,
+    convert_album_batch,
+    convert_track,
+)
+from ipodrb.models.plan import Action, TrackJob
+
+# One silent MPEG-1 Layer III frame (128 kbps, 44.1 kHz)
+MP3_FRAME = b"\xff\xfb\x90\x64" + b"\x00" * 413
+
+
+@pytest.fixture
+def mp3_job(tmp_path: Path) -> TrackJob:
+    """Create a passthrough job for a small MP3 source file."""
+    source = tmp_path / "source.mp3"
+    source.write_bytes(MP3_FRAME * 40)
+    return TrackJob(
+        album_id="test123",
+        source_path=source,
+        output_path=tmp_path / "out" / "track.mp3",
+        source_sample_rate=44100,
+        source_bit_depth=None,
+        source_codec="mp3",
+        action=Action.PASS_MP3,
+        target_codec="copy",
+        target_sample_rate=44100,
+        target_bit_depth=None,
+        source_mtime=0.0,
+        source_size=source.stat().st_size,
+    )
+
+
+class TestPassthrough:
+    """Tests for MP3 passthrough."""
+
+    @pytest.mark.parametrize("use_tempfile", [True, False])
+    def test_reconvert_leaves_source_untouched(self, mp3_job, use_tempfile):
+        """Converting twice (untagged, then tagged) must not modify the source."""
+        original = mp3_job.source_path.read_bytes()
+
+        first = convert_track(mp3_job, use_tempfile=use_tempfile)
+        second = convert_track(replace(mp3_job, tags={"title": "Song"}), use_tempfile=use_tempfile)
+
+        assert first.success and second.success
+        assert mp3_job.source_path.read_bytes() == original
+        assert mp3_job.source_path.stat().st_nlink == 1
+
+    def test_untagged_output_is_copied_by_default(self, mp3_job):
+        """Without opting in, an untagged output must not share the source's inode."""
+        result = convert_track(mp3_job)
+
+        assert result.success
+        assert mp3_job.source_path.stat().st_nlink == 1
+        assert mp3_job.output_path.read_bytes() == mp3_job.source_path.read_bytes()
+
+    def test_untagged_output_hardlinked_when_enabled(self, mp3_job):
+        """With hardlinking enabled, an untagged output shares the source's inode."""
+        result = convert_track(mp3_job, hardlink_passthrough=True)
+
+        assert result.success
+        assert mp3_job.output_path.samefile(mp3_job.source_path)
+
+    def test_failed_rebuild_keeps_existing_output(self, mp3_job):
+        """Without temp files, a failed rebuild must not delete the previous output."""
+        mp3_job.output_dir.mkdir(parents=True)
+        mp3_job.output_path.write_bytes(b"previous output")
+        mp3_job.source_path.write_bytes(b"not audio")
+
+        result = convert_track(mp3_job, use_tempfile=False)
+
+        assert not result.success
+        assert mp3_job.output_path.read_bytes() == b"previous output"
+
+
+class TestTempFiles:
+    """Tests for temp output handling."""
+
+    def test_stale_temps_removed_from_output_dir(self, mp3_job):
+        """Old temp files from a crashed run are deleted; recent ones are kept."""
+        mp3_job.output_dir.mkdir(parents=True)
+        stale = mp3_job.output_dir / f"{TEMP_PREFIX}crashed.mp3"
+        recent = mp3_job.output_dir / f"{TEMP_PREFIX}running.mp3"
+        stale.write_bytes(b"partial")
+        recent.write_bytes(b"partial")
+        old = time.time() - STALE_TEMP_AGE - 60
+        os.utime(stale, (old, old))
+
+        result = convert_track(mp3_job)
+
+        assert result.success
+        assert not stale.exists()
+        assert recent.exists()
+
+    def test_batch_cleans_up_temps_when_creation_fails(self, mp3_job, monkeypatch):
+        """Temp files created before a failing mkstemp must not be left behind."""
+        jobs = [
+            replace(
+                mp3_job,
+                action=Action.ALAC_PRESERVE,
+                output_path=mp3_job.output_dir / f"{n}.m4a",
+            )
+            for n in range(3)
+        ]
+        real = transcoder._temp_path_for
+        created = []
+
+        def failing_temp_path(job, use_tempfile):
+            if created:
+                raise OSError(28, "No space left on device")
+            created.append(real(job, use_tempfile))
+            return created[-1]
+
+        monkeypatch.setattr(transcoder, "_temp_path_for", failing_temp_path)
+        monkeypatch.setattr(
+            transcoder, "convert_track", lambda job, config, use_tempfile: None
+        )
+
+        convert_album_batch(jobs)
+
+        assert created and not created[0].exists()
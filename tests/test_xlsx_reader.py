@@ -0,0 +1,75 @@
+"""Tests for reading plan XLSX files."""
+
+import json
+import os
+import pickle
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pytest
+
+from ipodrb.models.album import Album, AlbumMetadata, AudioFormat
+from ipodrb.xlsx import reader
+from ipodrb.xlsx.writer import write_xlsx
+
+
+@pytest.fixture
+def xlsx_path(tmp_path: Path) -> Path:
+    """Write a plan XLSX for a single album."""
+    path = tmp_path / "plan.xlsx"
+    album = Album(
+        album_id="abc123",
+        source_path=tmp_path / "Artist" / "Album",
+        tracks=[],
+        metadata=AlbumMetadata(artist="Artist", album="Album"),
+        source_formats={AudioFormat.FLAC},
+    )
+    write_xlsx([album], path, tmp_path)
+    reader._read_xlsx_plan_cached.cache_clear()
+    return path
+
+
+def _fail_parse(xlsx_path: Path):
+    raise AssertionError("workbook was parsed")
+
+
+class TestReadCache:
+    """Tests for reusing parsed results of unchanged workbooks."""
+
+    def test_unchanged_workbook_uses_sidecar(self, xlsx_path, monkeypatch):
+        """A second run should load results from the sidecar without parsing."""
+        decisions = reader.get_album_decisions(xlsx_path)
+        assert (xlsx_path.parent / "plan.xlsx.cache").exists()
+
+        reader._read_xlsx_plan_cached.cache_clear()
+        monkeypatch.setattr(reader, "_read_workbook", _fail_parse)
+
+        assert reader.get_album_decisions(xlsx_path) == decisions
+
+    def test_modified_workbook_is_reparsed(self, xlsx_path, monkeypatch):
+        """A changed mtime should invalidate the cached results."""
+        reader.read_xlsx(xlsx_path)
+        st = xlsx_path.stat()
+        os.utime(xlsx_path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+        monkeypatch.setattr(reader, "_read_workbook", _fail_parse)
+
+        with pytest.raises(AssertionError, match="parsed"):
+            reader.read_xlsx(xlsx_path)
+
+    def test_sidecar_round_trips_dates(self, xlsx_path):
+        """Date and duration cells should come back from the JSON sidecar as-is."""
+        plan = ({"schema_version": "1.0"}, ("album_id", "last_built_at"), [
+            ("abc123", datetime(2024, 5, 1, 12, 30)),
+            ("def456", timedelta(minutes=3)),
+        ])
+        reader._save_cache(xlsx_path, (1, 2), plan)
+
+        assert reader._load_cache(xlsx_path, (1, 2)) == plan
+
+    def test_pickled_sidecar_is_not_loaded(self, xlsx_path):
+        """A non-JSON sidecar should be ignored and replaced by a fresh parse."""
+        sidecar = xlsx_path.parent / "plan.xlsx.cache"
+        sidecar.write_bytes(pickle.dumps((2, (0, 0), ({}, None, []))))
+
+        assert "abc123" in reader.read_xlsx(xlsx_path)
+        assert json.loads(sidecar.read_text())["version"] == reader.CACHE_VERSION
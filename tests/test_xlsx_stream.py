@@ -0,0 +1,53 @@
+"""Tests for the streaming XLSX reader."""
+
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+from openpyxl import Workbook, load_workbook
+
+from ipodrb.xlsx.stream import StreamingWorkbook
+
+
+@pytest.fixture
+def xlsx_path(tmp_path: Path) -> Path:
+    """Write a workbook with mixed value types, sparse cells and a gap row."""
+    path = tmp_path / "plan.xlsx"
+    wb = Workbook()
+    ws = wb.active
+    ws.title = "Albums"
+    ws.append(["album_id", "source_path", "year", "skip", "last_built_at"])
+    ws.append(["abc123", "/music/Artist/Album", 1999, True, datetime(2024, 5, 1, 12, 30)])
+    ws.append(["def456", None, 2.5, "yes", None])
+    ws.cell(row=5, column=7, value="far")
+    wb.create_sheet("Summary").append(["schema_version", "1.0"])
+    wb.save(path)
+    return path
+
+
+class TestStreamingWorkbook:
+    """Tests for reading cell values without openpyxl cells."""
+
+    def test_rows_match_openpyxl(self, xlsx_path):
+        """Every sheet's rows should equal openpyxl's values_only output."""
+        expected = load_workbook(xlsx_path, read_only=True, data_only=True)
+        book = StreamingWorkbook(xlsx_path)
+        try:
+            assert book.sheetnames == expected.sheetnames
+            for name in book.sheetnames:
+                assert list(book.iter_rows(name)) == list(
+                    expected[name].iter_rows(values_only=True)
+                )
+        finally:
+            book.close()
+            expected.close()
+
+    def test_max_row_stops_early(self, xlsx_path):
+        """Only rows up to max_row should be returned."""
+        book = StreamingWorkbook(xlsx_path)
+        try:
+            rows = list(book.iter_rows("Albums", max_row=2))
+        finally:
+            book.close()
+
+        assert [row[0] for row in rows] == ["album_id", "abc123"]